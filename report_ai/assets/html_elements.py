@@ -107,9 +107,6 @@ executive_summary_html_elements_begin = '''
             }
           }
        </style>
-        <script type="module">
-            import mermaid from "https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs";
-        </script>
     </head>
     <body>
 '''
@@ -252,9 +249,6 @@ report_html_elements_begin = '''
                 }
             }
         </style>
-        <script type="module">
-            import mermaid from "https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs";
-        </script>
     </head>
     <body>
 '''
@@ -0,0 +1,58 @@
+import time
+import asyncio
+import argparse
+from typing import Dict, List, Tuple
+
+from report_ai.report import run_generation_async, run_generation_many_async
+from report_ai.components.renderer import PdfRenderer
+from report_ai.components.functions import get_module_path
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation, isolate_benchmark
+from report_ai.benchmarks.suite import BENCHMARK_TITLE
+
+
+def batch_jobs(num_reports: int, num_messages: int) -> List[Tuple[List[Dict], Dict[str, str], str, str]]:
+    return [(synthetic_conversation(num_messages, seed=f"batch-{idx}"), BENCHMARK_TITLE, "Benchmark", f"batch-{idx}")
+            for idx in range(num_reports)]
+
+
+async def time_sequential(jobs: List[Tuple], llm: FakeChatModel, args) -> float:
+    start = time.perf_counter()
+    for conversation, title_dict, user_name, request_id in jobs:
+        await run_generation_async(conversation, title_dict, user_name, request_id, llm, args.dedup,
+                                   parallel_sections=args.parallel, render_pdf=args.pdf)
+    return time.perf_counter() - start
+
+
+async def time_batch(jobs: List[Tuple], llm: FakeChatModel, args) -> (float, int):
+    start, failures = time.perf_counter(), 0
+    async for outcome in run_generation_many_async(jobs, llm, args.dedup, parallel_sections=args.parallel,
+                                                   max_concurrency=args.concurrency, render_pdf=args.pdf):
+        failures += outcome["error"] is not None
+    return time.perf_counter() - start, failures
+
+
+async def main(args):
+    isolate_benchmark()
+    jobs = batch_jobs(args.reports, args.messages)
+    sequential = await time_sequential(jobs, FakeChatModel(latency=args.latency), args)
+    batch, failures = await time_batch(jobs, FakeChatModel(latency=args.latency), args)
+    await PdfRenderer().close()
+
+    print(f"{'mode':>10} {'wall (s)':>9} {'reports/min':>12}")
+    print(f"{'sequential':>10} {sequential:>9.2f} {len(jobs) * 60 / sequential:>12.1f}")
+    print(f"{'batch':>10} {batch:>9.2f} {len(jobs) * 60 / batch:>12.1f}")
+    print(f"speedup {sequential / batch:.1f}x with concurrency {args.concurrency}, {failures} failed reports")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare batch and sequential report generation throughput")
+    parser.add_argument('--reports', type=int, default=8)
+    parser.add_argument('--messages', type=int, default=5, help="Messages per synthetic conversation")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.2, help="Simulated seconds per LLM call")
+    parser.add_argument('--parallel', action=argparse.BooleanOptionalAction, default=None,
+                        help="Parallel section generation, defaults to the configured value")
+    parser.add_argument('--dedup', action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument('--pdf', action=argparse.BooleanOptionalAction, default=get_module_path("chromium") is not None,
+                        help="Render the PDFs, on by default when chromium is installed")
+    asyncio.run(main(parser.parse_args()))
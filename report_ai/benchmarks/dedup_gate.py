@@ -0,0 +1,57 @@
+import re
+import time
+import argparse
+
+from report_ai.main import conversation
+from report_ai.common.utils import configs
+from report_ai.components.similarity import OverlapDetector
+from report_ai.components.functions import extract_content_and_references_from_message_dict
+
+
+def markdown_to_html(markdown: str) -> str:
+    """ Just enough markdown conversion to turn the sample answers into section-like HTML """
+    html = []
+    for block in re.split(r'\n\s*\n', markdown):
+        block = block.strip()
+        if block.startswith('```mermaid'):
+            html.append(f"<div class='mermaid'>{block.strip('`').removeprefix('mermaid')}</div>")
+        elif block.startswith('|'):
+            rows = [line.strip('|').split('|') for line in block.splitlines() if not re.match(r'^\|[\s\-|:]+\|$', line)]
+            html.append('<table>' + ''.join(
+                '<tr>' + ''.join(f'<td>{cell.strip()}</td>' for cell in row) + '</tr>' for row in rows
+            ) + '</table>')
+        elif block.startswith('#'):
+            html.append(f"<h3>{block.lstrip('#').strip()}</h3>")
+        elif block:
+            html.append(f"<p>{block}</p>")
+    return ''.join(html)
+
+
+def main(args):
+    # Every assistant answer of the sample conversation stands in for one generated section
+    sections = [markdown_to_html(extract_content_and_references_from_message_dict(message['content'])[0])
+                for message in conversation if message['role'] == 'assistant']
+    overlap_detector = OverlapDetector(unit_threshold=args.unit_similarity)
+    elapsed = 0.0
+    print(f"{'section':>7} {'score':>6} {'max sim':>8} {'units':>9}  decision")
+    for idx, section_html in enumerate(sections):
+        start = time.perf_counter()
+        overlap = overlap_detector.compare(section_html)
+        needs_dedup = overlap["score"] >= args.threshold
+        overlap_detector.record(idx, needs_dedup)
+        overlap_detector.add(section_html)
+        elapsed += time.perf_counter() - start
+        print(f"{idx:>7} {overlap['score']:>6.2f} {overlap['max_similarity']:>8.2f} "
+              f"{overlap['overlapping_units']:>4}/{overlap['total_units']:<4}  {'dedup' if needs_dedup else 'skip'}")
+
+    dedup_calls = overlap_detector.checked - overlap_detector.skipped
+    print(f"\nDedup LLM calls: {dedup_calls} with the similarity gate vs {len(sections)} without "
+          f"({overlap_detector.skipped} saved, skip rate {overlap_detector.skip_rate:.0%})")
+    print(f"Local overlap detection took {elapsed * 1000:.1f} ms for {len(sections)} sections")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Count dedup LLM calls saved by the similarity gate on main.py")
+    parser.add_argument('--threshold', type=float, default=configs.report.dedup_overlap_threshold)
+    parser.add_argument('--unit-similarity', type=float, default=configs.report.dedup_unit_similarity)
+    main(parser.parse_args())
@@ -0,0 +1,31 @@
+import asyncio
+import argparse
+
+from report_ai.report import generate_report_sections
+from report_ai.benchmarks.fake_llm import FakeChatModel, isolate_benchmark
+
+
+async def count_input_tokens(num_sections: int, use_digest: bool, apply_section_dedup: bool) -> (int, int):
+    llm = FakeChatModel(latency=0)
+    report_skeleton = [{"heading": f"Section {idx}", "sub_headings": ["Overview", "Mechanisms", "Evidence"]}
+                       for idx in range(num_sections)]
+    await generate_report_sections("User: question\nAI: answer\n", report_skeleton, llm, apply_section_dedup,
+                                   use_digest=use_digest)
+    return llm.calls, llm.prompt_tokens
+
+
+async def main(args):
+    isolate_benchmark()
+    print(f"{'sections':>8} {'full text tokens':>17} {'digest tokens':>14} {'saved':>7}")
+    for num_sections in args.sections:
+        _, full_text_tokens = await count_input_tokens(num_sections, False, args.dedup)
+        _, digest_tokens = await count_input_tokens(num_sections, True, args.dedup)
+        print(f"{num_sections:>8} {full_text_tokens:>17} {digest_tokens:>14} "
+              f"{1 - digest_tokens / full_text_tokens:>7.1%}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare section input tokens with and without the report digest")
+    parser.add_argument('--sections', type=int, nargs='+', default=[4, 8, 12, 16])
+    parser.add_argument('--no-dedup', dest='dedup', action='store_false')
+    asyncio.run(main(parser.parse_args()))
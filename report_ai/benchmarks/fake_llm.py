@@ -0,0 +1,282 @@
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Literal, Optional
+
+from langchain_core.messages import AIMessage
+from langchain_core.messages.base import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from report_ai.common.utils import configs
+from report_ai.components.cache import LLMCache
+from report_ai.components.tokens import estimate_tokens
+from report_ai.components.structured import repair_json
+from report_ai.components.checkpoint import CheckpointStore
+
+VOCABULARY = (
+    "receptor agonist insulin secretion glucose incretin hepatic lipid metabolism trial cohort efficacy safety "
+    "dosage biomarker pathway signaling expression pancreatic satiety obesity fibrosis steatosis endpoint placebo "
+    "randomized outcome tolerability pharmacokinetics clearance exposure response inflammation mitochondrial "
+    "adipose hormone appetite weight hyperphagia syndrome genetic mutation therapy regimen monitoring"
+).split()
+
+EXECUTIVE_SUMMARY_HEADINGS = ["Introduction", "Positive Insights", "Areas of Concern", "Key Findings", "Conclusion"]
+
+# Maximum number of sections between Introduction and Conclusion in a fake skeleton
+MAX_SKELETON_SECTIONS = 6
+
+# Defects of skeleton JSON answered without native structured output, as seen from real models
+JSON_DEFECTS = ['code_fence', 'trailing_text', 'single_quotes']
+
+# Question words left out of the section headings derived from user questions
+QUESTION_WORDS = {"what", "does", "with", "that", "this", "which", "when", "where", "from", "into", "about", "have"}
+
+
+def generate_sentences(seed: str, count: int) -> List[str]:
+    # Deterministic pseudo-random sentences so every run of a benchmark sees the exact same content
+    rng = random.Random(hashlib.md5(seed.encode()).hexdigest())
+    return [
+        ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(12, 24))).capitalize() + '.'
+        for _ in range(count)
+    ]
+
+
+def synthetic_conversation(num_messages: int, seed: str = 'synthetic') -> List[Dict]:
+    """ User/assistant conversation shaped like the research threads reports are generated from """
+    conversation = []
+    for idx in range(0, num_messages, 2):
+        topic = ' '.join(generate_sentences(f"{seed}/{idx}/topic", 1)[0].split()[:4]).rstrip('.')
+        conversation.append({"role": "user", "content": f"How does {topic.lower()} affect treatment outcomes?"})
+        if idx + 1 >= num_messages:
+            break
+        sentences = generate_sentences(f"{seed}/{idx}/answer", 18)
+        rows = '\n'.join(f"| {' '.join(sentence.split()[:2])} | {sentence} |" for sentence in sentences[12:16])
+        nodes = [' '.join(sentence.split()[:3]) for sentence in sentences[:4]]
+        edges = '\n'.join(f'{chr(65 + i)}["{nodes[i]}"] --> {chr(66 + i)}["{nodes[i + 1]}"]' for i in range(3))
+        conversation.append({"role": "assistant", "content": (
+            f"### {topic.title()}\n\n#### Overview\n{' '.join(sentences[:4])}\n\n#### Mechanism\n"
+            f"{' '.join(sentences[4:8])}\n\n| Factor | Observation |\n|---|---|\n{rows}\n\n"
+            f"```mermaid\ngraph TB\n{edges}\n```\n\n#### Clinical Evidence\n{' '.join(sentences[8:12])}\n\n"
+            f" --- \n\n  \nReferences  \n[https://example.org/{seed}/{idx}](https://example.org/{seed}/{idx})"
+        )})
+    return conversation
+
+
+def isolate_benchmark():
+    """
+    Make every call of a benchmark reach the fake model: cached responses and checkpoints of earlier runs would skew
+    the measurements, and profiles of benchmark runs are not worth writing
+    """
+    LLMCache().enabled = False
+    CheckpointStore().enabled = False
+    configs.tracing.write_profile = False
+
+
+class FakeProviderError(Exception):
+    """ Injected failure, standing in for the server errors and dropped connections of real providers """
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Offline chat model standing in for the `openai` / `anthropic` clients. It answers every pipeline prompt with
+    canned but realistic content after a simulated latency and reports token usage like the real providers.
+    """
+    model_name: str = 'fake-chat-model'
+    # Provider the model reports (first part of its `_llm_type`), e.g. to fail over between two fake providers
+    provider: str = 'fake'
+    temperature: float = 0.7
+    # Median seconds per call and how the latency of individual calls is spread around it
+    latency: float = 0.5
+    latency_distribution: Literal['constant', 'uniform', 'lognormal'] = 'constant'
+    latency_spread: float = 0.5
+    # Extra seconds per generated token, longer answers take longer like with real providers
+    seconds_per_output_token: float = 0.0
+    # Extra seconds per prompt token, the time providers take to read long prompts
+    seconds_per_prompt_token: float = 0.0
+    # Share of calls failing with `FakeProviderError` and of calls stalling for `stall_latency` seconds
+    error_rate: float = 0.0
+    stall_rate: float = 0.0
+    stall_latency: float = 30.0
+    # Share of skeleton answers with a JSON defect, unless they are requested through native structured output
+    json_defect_rate: float = 0.0
+    seed: int = 0
+    # Running totals over every call made to this instance
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    max_prompt_tokens: int = 0
+    total_latency: float = 0.0
+    errors: int = 0
+    stalls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return f'{self.provider}-chat-model'
+
+    def respond(self, messages: List[BaseMessage]) -> str:
+        system_prompt, user_prompt = messages[0].content, messages[-1].content
+        if 'structured skeleton for a report' in system_prompt:
+            return json.dumps({"skeleton": self.skeleton(user_prompt)})
+        if 'the Completion did not satisfy the constraints' in system_prompt:
+            # OutputFixingParser prompt, answered with the completion's JSON without its defects
+            completion = system_prompt.split('Completion:\n--------------\n', 1)[-1].split('\n--------------', 1)[0]
+            return repair_json(completion) or completion
+        if 'streamline TEXT2' in system_prompt:
+            # Return TEXT2 unchanged, which is what the dedup prompt asks for when nothing overlaps
+            return user_prompt.split('### TEXT2 ###\n', 1)[-1]
+        if 'You condense an excerpt' in system_prompt:
+            return self.notes(user_prompt, 3)
+        if 'You merge consecutive notes' in system_prompt:
+            return self.notes(user_prompt, 2)
+        if 'expert in summarizing' in system_prompt:
+            return ' '.join(generate_sentences(user_prompt, 8))
+        if 'executive summaries' in system_prompt:
+            return self.executive_summary_html(user_prompt)
+        heading_match = re.search(r'develop the (.+?) portion', system_prompt)
+        heading = heading_match.group(1) if heading_match else 'Section'
+        sub_headings_match = re.search(r'following sub headings: (.+?)\. Strictly', system_prompt)
+        sub_headings = sub_headings_match.group(1).split('; ') if sub_headings_match else ['Overview', 'Details']
+        return self.section_html(heading, sub_headings, with_figures=heading not in ['Introduction', 'Conclusion'])
+
+    @staticmethod
+    def skeleton(serialized_conversation: str) -> List[Dict]:
+        # One section per exchange, headed by the start of the user question and sub headed by the answer's headings
+        sections = []
+        for exchange in serialized_conversation.split('-' * 60)[:MAX_SKELETON_SECTIONS]:
+            question = re.search(r'User: (.+)', exchange)
+            if question is None:
+                continue
+            words = [word for word in re.findall(r'[A-Za-z0-9-]+', question.group(1))
+                     if len(word) > 3 and word.lower() not in QUESTION_WORDS]
+            sub_headings = [heading.strip('* ') for heading in re.findall(r'^#{3,4} (.+)$', exchange, re.MULTILINE)]
+            sections.append({"heading": ' '.join(words[:4]).title() or f"Topic {len(sections) + 1}",
+                             "sub_headings": sub_headings[1:4] or ["Overview", "Details"]})
+        return ([{"heading": "Introduction", "sub_headings": ["Aim of the Report", "Scope"]}] + sections +
+                [{"heading": "Conclusion", "sub_headings": ["Key Findings", "Outlook"]}])
+
+    @staticmethod
+    def notes(serialized_conversation: str, sentences_per_question: int) -> str:
+        # Condensed notes keep every user question, so a skeleton designed from them still has a section per topic
+        questions = re.findall(r'^User: .+$', serialized_conversation, re.MULTILINE)
+        return f"\n{'-' * 60}\n".join(
+            f"{question}\nAI: {' '.join(generate_sentences(question, sentences_per_question))}" for question in questions
+        )
+
+    @staticmethod
+    def executive_summary_html(conversation_summary: str) -> str:
+        html = "<body><h2>Executive Summary</h2>"
+        for heading in EXECUTIVE_SUMMARY_HEADINGS:
+            items = ''.join(f"<li>{sentence}</li>"
+                            for sentence in generate_sentences(f"{conversation_summary}/{heading}", 3))
+            html += f"<h3>{heading}</h3><ul>{items}</ul>"
+        return html + "</body>"
+
+    @staticmethod
+    def section_html(heading: str, sub_headings: List[str], with_figures: bool = True) -> str:
+        html = f"<body><h2>{heading}</h2>"
+        for sub_heading in sub_headings:
+            sentences = generate_sentences(f"{heading}/{sub_heading}", 9)
+            html += f"<h3>{sub_heading}</h3>" + ''.join(
+                f"<p>{' '.join(sentences[idx:idx + 3])}</p>" for idx in range(0, len(sentences), 3)
+            )
+        if with_figures:
+            rows = ''.join(f"<tr><td>{cell}</td><td>{sentence}</td></tr>"
+                           for cell, sentence in zip(sub_headings, generate_sentences(f"{heading}/table", 4)))
+            html += f"<table><caption>{heading} at a glance</caption><tr><th>Topic</th><th>Finding</th></tr>{rows}</table>"
+            nodes = [' '.join(sentence.split()[:3]) for sentence in generate_sentences(f"{heading}/diagram", 4)]
+            edges = '\n'.join(f'N{idx}["{nodes[idx]}"] --> N{idx + 1}["{nodes[idx + 1]}"]' for idx in range(len(nodes) - 1))
+            html += f"<div class='mermaid'>\ngraph TB\n{edges}\n</div>"
+        return html + "</body>"
+
+    def sample_latency(self, prompt_tokens: int, output_tokens: int) -> float:
+        rng = random.Random(f"{self.seed}/{self.calls}")
+        match self.latency_distribution:
+            case 'uniform':
+                latency = rng.uniform(self.latency * (1 - self.latency_spread), self.latency * (1 + self.latency_spread))
+            case 'lognormal':
+                latency = rng.lognormvariate(0, self.latency_spread) * self.latency
+            case _:
+                latency = self.latency
+        return latency + prompt_tokens * self.seconds_per_prompt_token + output_tokens * self.seconds_per_output_token
+
+    def inject_json_defect(self, content: str) -> str:
+        rng = random.Random(f"{self.seed}/{self.calls}/json")
+        if rng.random() >= self.json_defect_rate:
+            return content
+        match rng.choice(JSON_DEFECTS):
+            case 'code_fence':
+                return f"```json\n{content}\n```"
+            case 'trailing_text':
+                return f"{content}\nEach section covers a distinct topic of the conversation."
+            case _:
+                return content.replace('"', "'")
+
+    def bind_tools(self, tools: List[Any], tool_choice: str | None = None, **kwargs: Any):
+        # Tools are formatted like OpenAI's, the fake model always answers with a call of the first one
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], tool_choice=tool_choice, **kwargs)
+
+    def inject_fault(self) -> float | None:
+        """ Raise an injected error or return the latency of an injected stall, None for a regular call """
+        draw = random.Random(f"{self.seed}/{self.calls}/{self.errors}/fault").random()
+        if draw < self.error_rate:
+            self.errors += 1
+            raise FakeProviderError(f"Injected failure of {self.provider}/{self.model_name}")
+        if draw < self.error_rate + self.stall_rate:
+            self.stalls += 1
+            return self.stall_latency
+        return None
+
+    def prepare_response(self, messages: List[BaseMessage], tools: List[Dict] | None = None) -> (ChatResult, float):
+        stall_latency = self.inject_fault()
+        content = self.respond(messages)
+        prompt_tokens = sum(estimate_tokens(message.content) for message in messages)
+        completion_tokens = estimate_tokens(content)
+        tool_calls = []
+        if tools:
+            # Native structured output, the JSON answer becomes the arguments of a call of the forced tool
+            tool_name = tools[0]["function"]["name"]
+            tool_calls = [{"name": tool_name, "args": json.loads(content), "id": f"call_{self.calls}"}]
+            content = ''
+        elif 'structured skeleton for a report' in messages[0].content:
+            content = self.inject_json_defect(content)
+        latency = stall_latency or self.sample_latency(prompt_tokens, completion_tokens)
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.max_prompt_tokens = max(self.max_prompt_tokens, prompt_tokens)
+        self.total_latency += latency
+        token_usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                       "total_tokens": prompt_tokens + completion_tokens}
+        message = AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            response_metadata={"token_usage": token_usage, "model_name": self.model_name},
+            usage_metadata={"input_tokens": prompt_tokens, "output_tokens": completion_tokens,
+                            "total_tokens": prompt_tokens + completion_tokens}
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)]), latency
+
+    def stats(self) -> Dict[str, float]:
+        return {"calls": self.calls, "prompt_tokens": self.prompt_tokens, "completion_tokens": self.completion_tokens,
+                "max_prompt_tokens": self.max_prompt_tokens, "llm_time": round(self.total_latency, 4),
+                "errors": self.errors, "stalls": self.stalls}
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None,
+                  **kwargs: Any) -> ChatResult:
+        result, latency = self.prepare_response(messages, kwargs.get('tools'))
+        time.sleep(latency)
+        return result
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None,
+                         **kwargs: Any) -> ChatResult:
+        result, latency = self.prepare_response(messages, kwargs.get('tools'))
+        await asyncio.sleep(latency)
+        return result
+
+
+__all__ = ['FakeChatModel', 'FakeProviderError', 'generate_sentences', 'synthetic_conversation', 'isolate_benchmark']
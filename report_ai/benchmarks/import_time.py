@@ -0,0 +1,48 @@
+import re
+import sys
+import argparse
+import subprocess
+from typing import Dict, List
+
+# `python -X importtime` reports one line per module: "import time: <self us> | <cumulative us> | <indented name>"
+IMPORT_TIME_PATTERN = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def measure_import(module: str | None) -> List[Dict]:
+    """ Import `module` in a fresh interpreter, returning the self and cumulative time of every module it imported """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}" if module else "pass"],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+    imports = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append({"module": name, "depth": len(indent) // 2, "self": int(self_us) / 1e6,
+                            "cumulative": int(cumulative_us) / 1e6})
+    return imports
+
+
+def main(args) -> int:
+    exceeded = False
+    # Modules the interpreter imports on startup are not part of the package's cold start
+    startup_modules = {entry["module"] for entry in measure_import(None)}
+    for module in args.modules:
+        imports = [entry for entry in measure_import(module) if entry["module"] not in startup_modules]
+        total = sum(entry["cumulative"] for entry in imports if entry["depth"] == 0)
+        exceeded |= args.budget is not None and total > args.budget
+        print(f"{module}: {total:.3f}s cold import, {len(imports)} modules")
+        for entry in sorted(imports, key=lambda entry: entry["cumulative"], reverse=True)[:args.top]:
+            print(f"  {entry['cumulative']:>8.3f}s cumulative {entry['self']:>8.3f}s self  {entry['module']}")
+    if exceeded:
+        print(f"Cold import exceeded the budget of {args.budget}s", file=sys.stderr)
+    return int(exceeded)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure the cold import time of the package and CLI")
+    parser.add_argument('--modules', nargs='+', default=["report_ai.report", "report_ai.main"])
+    parser.add_argument('--top', type=int, default=15, help="Number of slowest imports to list per module")
+    parser.add_argument('--budget', type=float, help="Exit with status 1 when a cold import takes longer (seconds)")
+    sys.exit(main(parser.parse_args()))
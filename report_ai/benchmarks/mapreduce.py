@@ -0,0 +1,59 @@
+import time
+import asyncio
+import argparse
+import tracemalloc
+from typing import Dict
+
+from report_ai.common.utils import configs
+from report_ai.skeleton import design_report_skeleton
+from report_ai.summary import design_executive_summary
+from report_ai.components.tokens import estimate_tokens
+from report_ai.components.functions import serialize_conversation
+from report_ai.components.mapreduce import condense_conversation
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation, isolate_benchmark
+
+
+async def run_input_stages(serialized_conversation: str, use_mapreduce: bool, args) -> Dict:
+    """ Skeleton and executive summary of a conversation, as the report pipeline runs them """
+    configs.mapreduce.enabled = use_mapreduce
+    llm = FakeChatModel(latency=args.latency, seconds_per_prompt_token=args.seconds_per_prompt_token)
+    tracemalloc.start()
+    start = time.perf_counter()
+    condensed = await condense_conversation(serialized_conversation, llm)
+    report_skeleton, _ = await asyncio.gather(design_report_skeleton(condensed, llm),
+                                              design_executive_summary(condensed, llm))
+    wall_time = time.perf_counter() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"wall_time": wall_time, "peak_memory": peak_memory / 2 ** 20, "sections": len(report_skeleton),
+            **llm.stats()}
+
+
+async def main(args):
+    isolate_benchmark()
+    configs.mapreduce.threshold_tokens = args.threshold
+    if args.chunk_tokens:
+        configs.mapreduce.chunk_tokens = args.chunk_tokens
+
+    print(f"{'messages':>8} {'tokens':>8} {'mode':>10} {'wall (s)':>9} {'calls':>6} {'max prompt':>11} "
+          f"{'peak MiB':>9} {'sections':>9}")
+    for num_messages in args.messages:
+        serialized_conversation, _, _ = await serialize_conversation(synthetic_conversation(num_messages))
+        tokens = estimate_tokens(serialized_conversation)
+        for mode, use_mapreduce in [("direct", False), ("mapreduce", True)]:
+            result = await run_input_stages(serialized_conversation, use_mapreduce, args)
+            print(f"{num_messages:>8} {tokens:>8} {mode:>10} {result['wall_time']:>9.2f} {result['calls']:>6} "
+                  f"{result['max_prompt_tokens']:>11} {result['peak_memory']:>9.1f} {result['sections']:>9}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare direct and map-reduce skeleton and executive summary "
+                                                 "generation as conversations grow")
+    parser.add_argument('--messages', type=int, nargs='+', default=[10, 50, 100, 200, 400])
+    parser.add_argument('--threshold', type=int, default=5000,
+                        help="Map-reduce threshold in tokens, lower than the configured one to suit synthetic threads")
+    parser.add_argument('--chunk-tokens', type=int, help="Map chunk size, defaults to the configured value")
+    parser.add_argument('--latency', type=float, default=0.5, help="Simulated seconds per LLM call")
+    parser.add_argument('--seconds-per-prompt-token', type=float, default=0.00002,
+                        help="Simulated seconds the model takes to read every prompt token")
+    asyncio.run(main(parser.parse_args()))
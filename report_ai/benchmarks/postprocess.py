@@ -0,0 +1,71 @@
+import time
+import argparse
+from typing import List
+from bs4 import BeautifulSoup
+
+from report_ai.components.postprocess import BACKENDS, ParsedSection, get_backend
+
+
+def synthetic_section(idx: int, num_paragraphs: int, num_rows: int, num_diagrams: int) -> str:
+    paragraphs = ''.join(f"<p>Paragraph {p} of section {idx} explains one point. It adds a second sentence.</p>"
+                         for p in range(num_paragraphs))
+    rows = ''.join(f"<tr><td>Item {r}</td><td>{r * idx}</td><td>Note on item {r}</td></tr>" for r in range(num_rows))
+    table = f"<table><caption>Table {idx}</caption><tr><th>Item</th><th>Value</th><th>Note</th></tr>{rows}</table>"
+    diagrams = ''.join(f"<div class='mermaid'>graph TD\n  A{d}[\"Start {d}\"] --> B{d}[\"End {d}\"]\n</div>"
+                       for d in range(num_diagrams))
+    return (f"<html><head><title>Section {idx}</title></head><body><h2>Section {idx}</h2><h3>Overview</h3>"
+            f"{paragraphs}{table}<h3>Flow</h3>{diagrams}<ul><li>First point.</li><li>Second point.</li></ul>"
+            f"</body></html>")
+
+
+def legacy_postprocess(section_html: str):
+    # What the pipeline did before sections were parsed once: body extraction, digest, overlap units and structural
+    # dedup each parsed the section on their own
+    soup = BeautifulSoup(section_html, 'html.parser')
+    body = soup.body or soup
+    extracted = [''.join(map(str, body.contents)), body.get_text('\n', strip=True)]
+    for _ in range(3):
+        soup = BeautifulSoup(section_html, 'html.parser')
+        for diagram in soup.select('.mermaid'):
+            extracted.append(diagram.get_text())
+            diagram.decompose()
+        for row in soup.find_all('tr'):
+            extracted += [cell.get_text(' ', strip=True) for cell in row.find_all(['td', 'th'])]
+        extracted += [element.get_text(' ', strip=True) for element in soup.find_all(['p', 'li'])]
+        extracted.append(soup.get_text('\n', strip=True))
+    return extracted
+
+
+def time_per_section(func, sections: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for section_html in sections:
+            func(section_html)
+    return (time.perf_counter() - start) * 1000 / (repeat * len(sections))
+
+
+def main(args):
+    sections = [synthetic_section(idx, args.paragraphs, args.rows, args.diagrams) for idx in range(args.sections)]
+    print(f"{len(sections)} sections of {sum(map(len, sections)) // len(sections)} characters on average")
+    legacy = time_per_section(legacy_postprocess, sections, args.repeat)
+    print(f"{'backend':>16} {'ms/section':>11} {'speedup':>8}")
+    print(f"{'legacy (4x bs4)':>16} {legacy:>11.2f} {1:>7.1f}x")
+    for name in BACKENDS:
+        try:
+            backend = get_backend(name)
+        except ImportError:
+            print(f"{name:>16} {'not installed':>11}")
+            continue
+        # Parses bypass the cache, every iteration measures a full parse
+        elapsed = time_per_section(lambda section_html: ParsedSection(section_html, backend), sections, args.repeat)
+        print(f"{name:>16} {elapsed:>11.2f} {legacy / elapsed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare single-parse section post-processing per HTML backend")
+    parser.add_argument('--sections', type=int, default=20)
+    parser.add_argument('--paragraphs', type=int, default=200, help="Paragraphs per section")
+    parser.add_argument('--rows', type=int, default=100, help="Table rows per section")
+    parser.add_argument('--diagrams', type=int, default=3, help="Mermaid diagrams per section")
+    parser.add_argument('--repeat', type=int, default=3)
+    main(parser.parse_args())
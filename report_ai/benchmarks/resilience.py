@@ -0,0 +1,114 @@
+import time
+import asyncio
+import argparse
+from typing import Dict, List
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from report_ai.common.utils import configs
+from report_ai.components.llms import LLMRegistry, get_llm, invoke_llm
+from report_ai.components.resilience import circuit_breakers, latency_trackers
+from report_ai.benchmarks.fake_llm import FakeChatModel, generate_sentences, isolate_benchmark
+
+
+def register_fake_providers(args):
+    # Two fake providers failing over to each other like `openai` and `anthropic`, the primary one with an outage
+    for provider, error_rate in [("primary", args.outage_error_rate), ("backup", 0.0)]:
+        configs.llms[provider] = {"default_model": f"{provider}-model", "models": {f"{provider}-model": {}}}
+        LLMRegistry.builders[provider] = (
+            lambda model, provider=provider, error_rate=error_rate, **settings: FakeChatModel(
+                model_name=model, provider=provider, latency=args.latency, error_rate=error_rate, **settings
+            )
+        )
+    configs.resilience.failover = {"primary": "backup", "backup": "primary"}
+
+
+def percentile(latencies: List[float], share: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+async def run_calls(llm: BaseChatModel, num_calls: int, concurrency: int) -> Dict:
+    """ `num_calls` LLM calls, at most `concurrency` at a time, with the latency and outcome of each """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, providers, failures = [], [], 0
+
+    async def call(idx: int):
+        nonlocal failures
+        messages = [SystemMessage(content="You are an expert in summarizing research conversations."),
+                    HumanMessage(content=' '.join(generate_sentences(f"resilience/{idx}", 4)))]
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await invoke_llm(messages, llm=llm)
+                providers.append(response.response_metadata.get("model_name", "").split('-')[0])
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(idx) for idx in range(num_calls)))
+    return {"wall_time": time.perf_counter() - start, "latencies": latencies, "providers": providers,
+            "failures": failures}
+
+
+async def compare_hedging(args):
+    print(f"{'mode':>10} {'p50 (s)':>8} {'p95 (s)':>8} {'p99 (s)':>8} {'max (s)':>8} {'failed':>7} {'sent':>6} "
+          f"{'hedges':>7}")
+    for mode, use_hedging in [("unhedged", False), ("hedged", True)]:
+        latency_trackers.clear()
+        circuit_breakers.clear()
+        configs.resilience.hedging.enabled = use_hedging
+        llm = FakeChatModel(latency=args.latency, latency_distribution='lognormal', latency_spread=args.spread,
+                            stall_rate=args.stall_rate, stall_latency=args.stall_latency, seed=args.seed)
+        result = await run_calls(llm, args.calls, args.concurrency)
+        latencies = result["latencies"]
+        hedges = sum(tracker.hedges for tracker in latency_trackers.values())
+        print(f"{mode:>10} {percentile(latencies, 0.5):>8.2f} {percentile(latencies, 0.95):>8.2f} "
+              f"{percentile(latencies, 0.99):>8.2f} {max(latencies):>8.2f} {result['failures']:>7} "
+              f"{llm.calls:>6} {hedges:>7}")
+
+
+async def compare_failover(args):
+    register_fake_providers(args)
+    print(f"{'mode':>10} {'wall (s)':>9} {'failed':>7} {'primary':>8} {'backup':>7}")
+    for mode, failure_threshold in [("no breaker", args.calls + 1), ("breaker", args.failure_threshold)]:
+        latency_trackers.clear()
+        circuit_breakers.clear()
+        configs.resilience.hedging.enabled = False
+        configs.resilience.circuit_breaker.failure_threshold = failure_threshold
+        llm = get_llm("primary")
+        result = await run_calls(llm, args.calls, args.concurrency)
+        served = result["providers"]
+        print(f"{mode:>10} {result['wall_time']:>9.2f} {result['failures']:>7} {served.count('primary'):>8} "
+              f"{served.count('backup'):>7}")
+
+
+async def main(args):
+    isolate_benchmark()
+    configs.resilience.timeout = args.timeout
+    configs.resilience.hedging.percentile = args.percentile
+    configs.resilience.hedging.min_samples = args.min_samples
+    await compare_hedging(args)
+    print()
+    await compare_failover(args)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare call latency with and without hedging, and failed calls "
+                                                 "during a provider outage with and without the circuit breaker")
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.2, help="Median simulated seconds per LLM call")
+    parser.add_argument('--spread', type=float, default=0.3, help="Lognormal spread of the simulated latency")
+    parser.add_argument('--stall-rate', type=float, default=0.03, help="Share of calls that hang")
+    parser.add_argument('--stall-latency', type=float, default=5.0, help="Seconds a hanging call takes")
+    parser.add_argument('--timeout', type=float, default=3.0, help="Seconds before a call is abandoned")
+    parser.add_argument('--percentile', type=float, default=95, help="Latency percentile after which calls are hedged")
+    parser.add_argument('--min-samples', type=int, default=20)
+    parser.add_argument('--outage-error-rate', type=float, default=1.0,
+                        help="Share of failing calls of the primary provider during its outage")
+    parser.add_argument('--failure-threshold', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,73 @@
+import time
+import asyncio
+import argparse
+from typing import Dict, List
+
+from report_ai.common.utils import configs
+from report_ai.report import run_generation_async
+from report_ai.components.llms import LLMRegistry, get_llm
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation, isolate_benchmark
+from report_ai.benchmarks.suite import BENCHMARK_TITLE
+
+
+def register_fake_provider(args):
+    # A `fake` provider with a slow, expensive model and a fast, cheap one, routed like the real providers
+    configs.llms.fake = {"default_model": "fake-large", "models": {
+        "fake-large": {"latency": args.large_latency, "seconds_per_output_token": args.large_seconds_per_token},
+        "fake-small": {"latency": args.small_latency, "seconds_per_output_token": args.small_seconds_per_token}
+    }}
+    LLMRegistry.builders["fake"] = lambda model, **settings: FakeChatModel(model_name=model, **settings)
+    for routes in configs.routing.stages.values():
+        routes.fake = "fake-small"
+
+
+def cost(tokens: Dict, prices: Dict[str, List[float]]) -> float:
+    """ Dollars spent according to the run's token ledger, with prices per million prompt and completion tokens """
+    return sum(usage["prompt_tokens"] * prices[model][0] / 1e6 + usage["completion_tokens"] * prices[model][1] / 1e6
+               for models in tokens["stages"].values() for model, usage in models.items())
+
+
+async def run_report(conversation: List[Dict], use_routing: bool, args) -> Dict:
+    configs.routing.enabled = use_routing
+    llm = get_llm("fake", "fake-large")
+    start = time.perf_counter()
+    # No request id, so neither run resumes from the checkpoints of the other
+    result = await run_generation_async(conversation, BENCHMARK_TITLE, "Benchmark", None, llm, args.dedup,
+                                        parallel_sections=args.parallel, render_pdf=False)
+    return {"wall_time": time.perf_counter() - start, "tokens": result["tokens"]}
+
+
+async def main(args):
+    isolate_benchmark()
+    register_fake_provider(args)
+    prices = {"fake-large": args.large_price, "fake-small": args.small_price}
+
+    print(f"{'messages':>8} {'mode':>12} {'wall (s)':>9} {'calls':>6} {'tokens':>8} {'small share':>12} {'cost ($)':>9}")
+    for num_messages in args.messages:
+        conversation = synthetic_conversation(num_messages, seed=f"routing-{num_messages}")
+        for mode, use_routing in [("single-model", False), ("routed", True)]:
+            result = await run_report(conversation, use_routing, args)
+            tokens = result["tokens"]
+            small_tokens = sum(usage["prompt_tokens"] + usage["completion_tokens"]
+                               for models in tokens["stages"].values() for model, usage in models.items()
+                               if model == "fake-small")
+            print(f"{num_messages:>8} {mode:>12} {result['wall_time']:>9.2f} {tokens['calls']:>6} "
+                  f"{tokens['total_tokens']:>8} {small_tokens / tokens['total_tokens']:>12.1%} "
+                  f"{cost(tokens, prices):>9.4f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare end-to-end latency and token cost of per-stage model routing "
+                                                 "against single-model runs")
+    parser.add_argument('--messages', type=int, nargs='+', default=[5, 20, 50])
+    parser.add_argument('--large-latency', type=float, default=1.0, help="Seconds per call of the large model")
+    parser.add_argument('--small-latency', type=float, default=0.3, help="Seconds per call of the small model")
+    parser.add_argument('--large-seconds-per-token', type=float, default=0.01)
+    parser.add_argument('--small-seconds-per-token', type=float, default=0.002)
+    parser.add_argument('--large-price', type=float, nargs=2, default=[10.0, 30.0],
+                        help="Dollars per million prompt and completion tokens of the large model")
+    parser.add_argument('--small-price', type=float, nargs=2, default=[0.5, 1.5])
+    parser.add_argument('--parallel', action=argparse.BooleanOptionalAction, default=None,
+                        help="Parallel section generation, defaults to the configured value")
+    parser.add_argument('--dedup', action=argparse.BooleanOptionalAction, default=True)
+    asyncio.run(main(parser.parse_args()))
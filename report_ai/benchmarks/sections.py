@@ -0,0 +1,35 @@
+import time
+import asyncio
+import argparse
+
+from report_ai.report import generate_report
+from report_ai.benchmarks.fake_llm import FakeChatModel, isolate_benchmark
+
+
+async def time_generate_report(num_sections: int, latency: float, parallel_sections: bool, max_concurrency: int,
+                               apply_section_dedup: bool) -> float:
+    llm = FakeChatModel(latency=latency)
+    report_skeleton = [{"heading": f"Section {idx}", "sub_headings": ["Overview", "Details"]}
+                       for idx in range(num_sections)]
+    start = time.perf_counter()
+    await generate_report("User: question\nAI: answer\n", report_skeleton, [], llm, apply_section_dedup,
+                          parallel_sections=parallel_sections, max_concurrency=max_concurrency)
+    return time.perf_counter() - start
+
+
+async def main(args):
+    isolate_benchmark()
+    print(f"{'sections':>8} {'sequential (s)':>15} {'parallel (s)':>13} {'speedup':>8}")
+    for num_sections in args.sections:
+        sequential = await time_generate_report(num_sections, args.latency, False, args.concurrency, args.dedup)
+        parallel = await time_generate_report(num_sections, args.latency, True, args.concurrency, args.dedup)
+        print(f"{num_sections:>8} {sequential:>15.2f} {parallel:>13.2f} {sequential / parallel:>7.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare sequential and parallel section generation wall time")
+    parser.add_argument('--sections', type=int, nargs='+', default=[4, 6, 8])
+    parser.add_argument('--latency', type=float, default=0.5, help="Simulated seconds per LLM call")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--no-dedup', dest='dedup', action='store_false')
+    asyncio.run(main(parser.parse_args()))
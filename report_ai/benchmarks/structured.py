@@ -0,0 +1,50 @@
+import time
+import asyncio
+import argparse
+from typing import Dict
+
+from report_ai.common.utils import configs
+from report_ai.skeleton import design_report_skeleton
+from report_ai.components.structured import parse_path_stats, parse_paths
+from report_ai.components.functions import serialize_conversation
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation, isolate_benchmark
+
+# Skeleton generation modes: prompt format instructions with the OutputFixingParser as the only fix, with local JSON
+# repair first, and native structured output
+MODES = {"fixer": (False, False), "repair": (False, True), "native": (True, True)}
+
+
+async def run_skeletons(mode: str, args) -> Dict:
+    configs.structured_output.native, configs.structured_output.local_repair = MODES[mode]
+    parse_paths.clear()
+    llm = FakeChatModel(latency=args.latency, json_defect_rate=args.defect_rate, seed=args.seed)
+    start = time.perf_counter()
+    for idx in range(args.skeletons):
+        serialized_conversation, _, _ = await serialize_conversation(
+            synthetic_conversation(args.messages, seed=f"structured-{idx}")
+        )
+        await design_report_skeleton(serialized_conversation, llm)
+    return {"wall_time": time.perf_counter() - start, "calls": llm.calls, "paths": parse_path_stats()}
+
+
+async def main(args):
+    isolate_benchmark()
+    configs.structured_output.providers = list(configs.structured_output.providers) + ["fake"]
+
+    print(f"{'mode':>7} {'wall (s)':>9} {'calls':>6} {'calls/skeleton':>15}  parse paths")
+    for mode in MODES:
+        result = await run_skeletons(mode, args)
+        print(f"{mode:>7} {result['wall_time']:>9.2f} {result['calls']:>6} {result['calls'] / args.skeletons:>15.2f}  "
+              f"{result['paths']}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare LLM calls and wall time of skeleton generation with the "
+                                                 "OutputFixingParser, local JSON repair and native structured output")
+    parser.add_argument('--skeletons', type=int, default=50)
+    parser.add_argument('--messages', type=int, default=10, help="Messages of each synthetic conversation")
+    parser.add_argument('--defect-rate', type=float, default=0.3,
+                        help="Share of skeleton answers with a code fence, trailing text or single quotes")
+    parser.add_argument('--latency', type=float, default=0.2, help="Simulated seconds per LLM call")
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,101 @@
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import resource
+import subprocess
+from typing import Dict, List
+from datetime import datetime, timezone
+
+from report_ai.main import conversation as sample_conversation
+from report_ai.report import run_generation_async
+from report_ai.components.functions import get_module_path
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation, isolate_benchmark
+
+BENCHMARK_TITLE = {"title": "Benchmark Report", "sub_title": "Generated offline with a fake chat model"}
+
+SYNTHETIC_SIZES = [5, 20, 50]
+
+
+def peak_rss_mb() -> float:
+    # Peak resident set size of this process so far (ru_maxrss is reported in kilobytes on Linux)
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def workloads(names: List[str]) -> Dict[str, List[Dict]]:
+    available = {"main": sample_conversation}
+    available |= {f"synthetic-{size}": synthetic_conversation(size, seed=f"synthetic-{size}") for size in SYNTHETIC_SIZES}
+    return {name: available[name] for name in names}
+
+
+async def run_workload(name: str, conversation: List[Dict], args) -> Dict:
+    llm = FakeChatModel(latency=args.latency, latency_distribution=args.latency_distribution,
+                        latency_spread=args.latency_spread, seconds_per_output_token=args.seconds_per_output_token,
+                        seed=args.seed)
+    start = time.perf_counter()
+    result = await run_generation_async(conversation, BENCHMARK_TITLE, "Benchmark", f"benchmark-{name}", llm,
+                                        args.dedup, parallel_sections=args.parallel, render_pdf=args.pdf)
+    wall_time = time.perf_counter() - start
+    stages = {entry["stage"]: entry["duration"] for entry in result["timeline"]}
+    return {
+        "workload": name,
+        "messages": len(conversation),
+        "wall_time": round(wall_time, 4),
+        "llm_time": llm.stats()["llm_time"],
+        "pdf_render_time": stages.get("pdf"),
+        "peak_rss_mb": peak_rss_mb(),
+        "llm": llm.stats(),
+        "stages": stages,
+        "critical_path": result["critical_path"]
+    }
+
+
+async def main(args):
+    isolate_benchmark()
+    results = []
+    for name, conversation in workloads(args.workloads).items():
+        for repeat in range(args.repeats):
+            results.append(await run_workload(name, conversation, args) | {"repeat": repeat})
+            print(f"{name:>14} #{repeat}: wall {results[-1]['wall_time']:.2f}s, llm {results[-1]['llm_time']:.2f}s, "
+                  f"{results[-1]['llm']['calls']} calls, {results[-1]['llm']['prompt_tokens']} prompt tokens, "
+                  f"peak RSS {results[-1]['peak_rss_mb']} MB", file=sys.stderr)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "settings": vars(args),
+        "results": results
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the report pipeline end to end against the offline fake model")
+    parser.add_argument('--workloads', nargs='+', default=["main"] + [f"synthetic-{size}" for size in SYNTHETIC_SIZES])
+    parser.add_argument('--repeats', type=int, default=1)
+    parser.add_argument('--latency', type=float, default=0.5, help="Median simulated seconds per LLM call")
+    parser.add_argument('--latency-distribution', choices=['constant', 'uniform', 'lognormal'], default='lognormal')
+    parser.add_argument('--latency-spread', type=float, default=0.5)
+    parser.add_argument('--seconds-per-output-token', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--parallel', action=argparse.BooleanOptionalAction, default=None,
+                        help="Parallel section generation, defaults to the configured value")
+    parser.add_argument('--dedup', action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument('--pdf', action=argparse.BooleanOptionalAction, default=get_module_path("chromium") is not None,
+                        help="Render the PDF, on by default when chromium is installed")
+    parser.add_argument('--output', help="Write the JSON results to this file instead of stdout")
+    asyncio.run(main(parser.parse_args()))
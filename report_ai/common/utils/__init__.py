@@ -7,16 +7,11 @@ from report_ai.common.utils.helpers import load_yaml_file
 
 root_dir = Path(__file__).parent.absolute().parent.parent
 base_dir = os.path.join(root_dir, "common")
-print("root_dir: ", root_dir)
 
+# Directories are created by whatever writes into them, so importing the package leaves the disk untouched
 log_dir = os.path.join(root_dir, "logs")
-os.makedirs(log_dir, exist_ok=True)
-
 assets_dir = os.path.join(root_dir, "assets")
-os.makedirs(log_dir, exist_ok=True)
-
 reports_dir = os.path.join(root_dir, "reports")
-os.makedirs(reports_dir, exist_ok=True)
 
 load_dotenv()
 
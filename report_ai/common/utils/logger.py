@@ -7,6 +7,19 @@ from logging.handlers import RotatingFileHandler
 from logging.handlers import TimedRotatingFileHandler
 
 
+class DeferredTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """
+    Opens the log file, creating its directory, on the first record instead of on construction
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, delay=True, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
 class Logger:
     def __init__(self, log_file_name: str, log_path: str):
         self.__log_file_path = os.path.join(log_path, log_file_name)
@@ -45,10 +58,10 @@ class Logger:
         logger.handlers.clear()
         logger.addHandler(sh)
 
-        handler = TimedRotatingFileHandler(path,
-                                           when=when,
-                                           interval=interval,
-                                           backupCount=backup_count)
+        handler = DeferredTimedRotatingFileHandler(path,
+                                                   when=when,
+                                                   interval=interval,
+                                                   backupCount=backup_count)
         handler.setFormatter(formatter)
         logger.addHandler(handler)
 
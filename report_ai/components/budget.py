@@ -0,0 +1,125 @@
+from contextvars import ContextVar
+from collections import defaultdict
+from typing import Dict, List
+
+from report_ai.common.utils import configs
+
+logger = configs.logger
+
+# Degradation steps in the order they are taken as a report approaches its token budget
+DEGRADATION_STEPS = ['skip_dedup', 'shrink_context', 'cheaper_model']
+
+_current_ledger: ContextVar['TokenLedger | None'] = ContextVar('current_ledger', default=None)
+_current_stage: ContextVar[str] = ContextVar('current_stage', default='other')
+
+
+class TokenBudgetExceeded(Exception):
+    pass
+
+
+class TokenLedger:
+    """
+    Prompt and completion tokens of one report per stage and model. With a budget, every call is projected before it is
+    sent (tokens spent, tokens of calls in flight and the estimate of the call) and the report degrades step by step
+    as the projection crosses `budget.degrade_at`. A call that would exceed the budget itself is refused.
+    """
+
+    def __init__(self, budget: int | None = None):
+        self.budget = budget
+        self.usage: Dict[str, Dict[str, Dict[str, int]]] = defaultdict(
+            lambda: defaultdict(lambda: {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+        )
+        self.spent, self.in_flight = 0, 0
+        self.degradations: List[str] = []
+        self._token = None
+
+    def __enter__(self) -> 'TokenLedger':
+        self._token = _current_ledger.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_ledger.reset(self._token)
+        return False
+
+    def projected(self, estimated_tokens: int = 0) -> int:
+        return self.spent + self.in_flight + estimated_tokens
+
+    def reserve(self, estimated_tokens: int):
+        """ Account for a call about to be sent, refusing it when the report cannot afford it """
+        projected = self.projected(estimated_tokens)
+        if self.budget:
+            if projected > self.budget:
+                raise TokenBudgetExceeded(f"Call of ~{estimated_tokens} tokens would take the report to {projected} "
+                                          f"tokens, over its budget of {self.budget}")
+            for step, share in zip(DEGRADATION_STEPS, configs.budget.degrade_at):
+                if step not in self.degradations and projected >= share * self.budget:
+                    self.degradations.append(step)
+                    logger.warning(f"Report at {projected} of {self.budget} budgeted tokens, degrading: {step}")
+        self.in_flight += estimated_tokens
+
+    def settle(self, estimated_tokens: int, model: str, prompt_tokens: int | None, completion_tokens: int | None):
+        """ Replace the reservation of a finished (or failed, without usage) call by the tokens it actually used """
+        self.in_flight -= estimated_tokens
+        if prompt_tokens is None:
+            return
+        usage = self.usage[_current_stage.get()][model]
+        usage["calls"] += 1
+        usage["prompt_tokens"] += prompt_tokens
+        usage["completion_tokens"] += completion_tokens
+        self.spent += prompt_tokens + completion_tokens
+
+    def is_degraded(self, step: str) -> bool:
+        return step in self.degradations
+
+    def totals(self) -> Dict:
+        stages = {stage: {model: dict(usage) for model, usage in models.items()} for stage, models in self.usage.items()}
+        usages = [usage for models in stages.values() for usage in models.values()]
+        prompt_tokens = sum(usage["prompt_tokens"] for usage in usages)
+        completion_tokens = sum(usage["completion_tokens"] for usage in usages)
+        return {"calls": sum(usage["calls"] for usage in usages), "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens,
+                "budget": self.budget, "degradations": list(self.degradations), "stages": stages}
+
+
+class ChargeTo:
+    """ Attribute the LLM calls made inside the block to `stage`, which also selects their model in `routing` """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_stage.set(self.stage)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_stage.reset(self._token)
+        return False
+
+
+def current_stage() -> str:
+    return _current_stage.get()
+
+
+def current_ledger() -> TokenLedger | None:
+    return _current_ledger.get()
+
+
+def is_degraded(step: str) -> bool:
+    """ Whether the running report took degradation `step`, always False outside a report or without a budget """
+    ledger = _current_ledger.get()
+    return ledger is not None and ledger.is_degraded(step)
+
+
+def context_budget(token_budget: int) -> int:
+    # Context sent with a call (retrieved excerpt, digest of earlier sections) once the report shrinks its context
+    return int(token_budget * configs.budget.shrink_factor) if is_degraded('shrink_context') else token_budget
+
+
+def cheaper_model(provider: str) -> str | None:
+    """ Model to switch to once the report takes the `cheaper_model` step, None to keep the current one """
+    return configs.budget.cheaper_models.get(provider) if is_degraded('cheaper_model') else None
+
+
+__all__ = ['TokenLedger', 'TokenBudgetExceeded', 'ChargeTo', 'current_stage', 'current_ledger', 'is_degraded',
+           'context_budget', 'cheaper_model']
@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+from typing import Dict, List
+from contextlib import contextmanager
+
+from langchain_core.messages import AIMessage
+from langchain_core.messages.base import BaseMessage
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from report_ai.common.utils import configs
+from report_ai.common.utils.helpers import Singleton, serializer
+
+logger = configs.logger
+
+
+class LLMCache(metaclass=Singleton):
+    """
+    Content-addressed LLM response cache stored in SQLite, so it is shared safely by every process on the host.
+    Entries expire after `ttl_seconds` and the least recently used ones are evicted above `max_size_mb`.
+    """
+
+    def __init__(self, path: str | None = None, max_size_mb: float | None = None, ttl_seconds: int | None = None,
+                 enabled: bool | None = None):
+        self.enabled = configs.cache.enabled if enabled is None else enabled
+        self.path = path or configs.cache.path or os.path.join(configs.root_dir, "cache", "llm_cache.sqlite")
+        self.max_size_bytes = int((max_size_mb or configs.cache.max_size_mb) * 1024 * 1024)
+        self.ttl_seconds = ttl_seconds or configs.cache.ttl_seconds
+        self.hits, self.misses = 0, 0
+        if self.enabled:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self._connect() as connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                    "size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation keeps the cache usable from worker threads and other processes
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def make_key(llm: BaseChatModel, messages: List[BaseMessage], tools: List | None = None) -> str:
+        payload = {
+            "provider": type(llm).__name__,
+            "model": getattr(llm, 'model_name', None) or getattr(llm, 'model', None),
+            "temperature": getattr(llm, 'temperature', None),
+            "messages": [[message.type, message.content] for message in messages]
+        }
+        # Answers through native structured output are cached apart from plain answers to the same messages
+        if tools:
+            payload["tools"] = [tool.__name__ for tool in tools]
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> AIMessage | None:
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute("SELECT value FROM responses WHERE key = ? AND created_at >= ?",
+                                     (key, now - self.ttl_seconds)).fetchone()
+            if row is not None:
+                connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return AIMessage(**serializer.deserialize(row[0], serializer='msgpack'))
+
+    def set(self, key: str, message: BaseMessage):
+        value = serializer.serialize({
+            "content": message.content,
+            # Round trip through JSON so provider specific metadata is reduced to msgpack friendly types
+            "response_metadata": json.loads(json.dumps(message.response_metadata, default=str)),
+            "usage_metadata": getattr(message, 'usage_metadata', None)
+        }, serializer='msgpack')
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                               (key, value, len(value), now, now))
+            self._evict(connection, now)
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        connection.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        # Drop the least recently used entries that no longer fit into the size budget
+        connection.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM (SELECT key, SUM(size) OVER "
+            "(ORDER BY accessed_at DESC) AS running_size FROM responses) WHERE running_size > ?)",
+            (self.max_size_bytes,)
+        )
+
+    async def aget(self, key: str) -> AIMessage | None:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, message: BaseMessage):
+        try:
+            await asyncio.to_thread(self.set, key, message)
+        except sqlite3.Error:
+            # A failing cache write must never fail the report itself
+            logger.exception("Failed to write LLM response to cache")
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM responses")
+
+
+__all__ = ['LLMCache']
@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+from typing import Any, Dict, List
+from contextlib import contextmanager
+
+from report_ai.common.utils import configs
+from report_ai.common.utils.helpers import Singleton, serializer
+
+logger = configs.logger
+
+# Stage holding the fingerprint of the inputs the other checkpoints of a request were generated from
+FINGERPRINT_STAGE = "fingerprint"
+
+# Stages of a completed report `run_incremental_generation` builds on, besides its `section:<idx>` stages
+REPORT_ARTIFACT_STAGES = {"conversation", "serialize", "skeleton"}
+
+
+def make_fingerprint(**inputs) -> str:
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class CheckpointStore(metaclass=Singleton):
+    """
+    Completed pipeline stages stored in SQLite per request id, so a failed report resumes after its last finished
+    stage. Requests without a new checkpoint for `ttl_seconds` are deleted as a whole.
+    """
+
+    def __init__(self, path: str | None = None, ttl_seconds: int | None = None, enabled: bool | None = None):
+        self.enabled = configs.checkpoint.enabled if enabled is None else enabled
+        self.path = path or configs.checkpoint.path or os.path.join(configs.root_dir, "cache", "checkpoints.sqlite")
+        self.ttl_seconds = ttl_seconds or configs.checkpoint.ttl_seconds
+        if self.enabled:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self._connect() as connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS checkpoints (request_id TEXT NOT NULL, stage TEXT NOT NULL, "
+                    "value BLOB NOT NULL, created_at REAL NOT NULL, PRIMARY KEY (request_id, stage))"
+                )
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def load(self, request_id: int | str) -> Dict[str, Any]:
+        with self._connect() as connection:
+            rows = connection.execute("SELECT stage, value FROM checkpoints WHERE request_id = ?",
+                                      (str(request_id),)).fetchall()
+        return {stage: serializer.deserialize(value, serializer='msgpack') for stage, value in rows}
+
+    def save(self, request_id: int | str, stage: str, value: Any):
+        with self._connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)",
+                               (str(request_id), stage, serializer.serialize(value, serializer='msgpack'), time.time()))
+
+    def delete(self, request_id: int | str):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM checkpoints WHERE request_id = ?", (str(request_id),))
+
+    def retain(self, request_id: int | str, stages: List[str]):
+        """ Delete every checkpoint of the request but those of `stages` """
+        with self._connect() as connection:
+            connection.execute(f"DELETE FROM checkpoints WHERE request_id = ? AND stage NOT IN "
+                               f"({', '.join('?' * len(stages))})", (str(request_id), *stages))
+
+    def expire(self) -> int:
+        """ Delete every request whose newest checkpoint is older than the TTL, returning the number of checkpoints deleted """
+        with self._connect() as connection:
+            return connection.execute(
+                "DELETE FROM checkpoints WHERE request_id IN (SELECT request_id FROM checkpoints GROUP BY request_id "
+                "HAVING MAX(created_at) < ?)", (time.time() - self.ttl_seconds,)
+            ).rowcount
+
+    def request_ids(self) -> List[str]:
+        with self._connect() as connection:
+            return [row[0] for row in connection.execute("SELECT DISTINCT request_id FROM checkpoints")]
+
+
+class RunCheckpoints:
+    """ Checkpoints of a single report, loaded once and written through to the store as stages complete """
+
+    def __init__(self, store: CheckpointStore, request_id: int | str, fingerprint: str):
+        self.store, self.request_id = store, request_id
+        self.stages = store.load(request_id)
+        if self.stages and self.stages.get(FINGERPRINT_STAGE) != fingerprint:
+            # Stages generated from other inputs (conversation, model or settings) cannot be reused, neither can the
+            # artifacts left of a completed report, which have no fingerprint
+            logger.info(f"Checkpoints of request {request_id} do not match its inputs, discarding them")
+            store.delete(request_id)
+            self.stages = {}
+        self.resumed = sorted(stage for stage in self.stages if stage != FINGERPRINT_STAGE)
+        if self.resumed:
+            logger.info(f"Resuming request {request_id} from checkpoints: {self.resumed}")
+        elif not self.stages:
+            store.save(request_id, FINGERPRINT_STAGE, fingerprint)
+            self.stages[FINGERPRINT_STAGE] = fingerprint
+
+    def get(self, stage: str) -> Any | None:
+        return self.stages.get(stage)
+
+    async def save(self, stage: str, value: Any):
+        self.stages[stage] = value
+        try:
+            await asyncio.to_thread(self.store.save, self.request_id, stage, value)
+        except sqlite3.Error:
+            # Losing a checkpoint only costs a rerun the stage, it must never fail the report itself
+            logger.exception(f"Failed to checkpoint stage '{stage}' of request {self.request_id}")
+
+    async def run(self, stage: str, func, *args, **kwargs) -> Any:
+        """ Return the checkpointed output of `stage`, or run `func` and checkpoint its output """
+        if stage in self.stages:
+            return self.stages[stage]
+        value = await func(*args, **kwargs)
+        await self.save(stage, value)
+        return value
+
+    def clear(self):
+        self.store.delete(self.request_id)
+
+    def complete(self):
+        """
+        Delete the checkpoints of a completed report but its conversation, skeleton and sections, so a later
+        `run_incremental_generation` can build on them while a rerun of the request id generates the report again
+        """
+        self.store.retain(self.request_id, [stage for stage in self.stages
+                                            if stage in REPORT_ARTIFACT_STAGES or stage.startswith("section:")])
+
+
+def open_checkpoints(request_id: int | str | None, fingerprint: str) -> RunCheckpoints | None:
+    """ Checkpoints of `request_id`, or None when checkpointing is disabled or the request has no id """
+    store = CheckpointStore()
+    if request_id is None or not store.enabled:
+        return None
+    expired = store.expire()
+    if expired:
+        logger.info(f"Deleted {expired} expired checkpoints")
+    return RunCheckpoints(store, request_id, fingerprint)
+
+
+__all__ = ['CheckpointStore', 'RunCheckpoints', 'make_fingerprint', 'open_checkpoints']
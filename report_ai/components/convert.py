@@ -1,10 +1,31 @@
+import io
 import os
+import re
+import base64
 import asyncio
+import mimetypes
+from functools import lru_cache
 from pypdf import PdfWriter
-from pyppeteer import launch
+from pyppeteer.errors import TimeoutError as PageTimeoutError
 
 from report_ai.common.utils import configs
-from report_ai.components.functions import get_module_path
+from report_ai.components.renderer import PdfRenderer
+from report_ai.components.tracing import span
+from report_ai.components.diagrams import DiagramRenderer, mermaid_script_html
+
+logger = configs.logger
+
+# Milliseconds to wait for stylesheets, images and mermaid diagrams of in-memory HTML to finish loading
+PAGE_READY_TIMEOUT = 30000
+
+# Resolves once the document and all its subresources loaded and every mermaid diagram has been processed, either
+# prerendered to SVG or by the mermaid script when the page has one
+PAGE_READY_FUNCTION = """() => document.readyState === 'complete' && (typeof mermaid === 'undefined' ||
+    Array.from(document.querySelectorAll('.mermaid')).every(el => el.getAttribute('data-processed')))"""
+
+# Stylesheet `url(...)` and `src="..."` references, the candidates for inlining from the assets directory
+ASSET_URL_PATTERN = re.compile(r"""(url\(|\bsrc=)(['"]?)([^'"()\s>]+)\2""", flags=re.IGNORECASE)
+ABSOLUTE_URL_PATTERN = re.compile(r'^([a-zA-Z][\w+.-]*:|/|#)')
 
 
 async def html_to_docx():
@@ -24,23 +45,63 @@ async def html_to_docx():
     pass
 
 
-async def generate_pdf_from_html(page, html_file_path, pdf_options, css_to_inject=None):
-    """ Generate a PDF file from HTML content and return the temporary PDF path """
-    await page.goto(f"file://{html_file_path}", {'waitUntil': 'networkidle0'})
-    if css_to_inject:
-        await page.evaluate(f"""() => {{
-                document.head.insertAdjacentHTML("beforeend", `{css_to_inject}`);
-        }}""")
-    pdf = await page.pdf(pdf_options)
-    temp_pdf_path = f"{html_file_path.split('.')[0]}_temp.pdf"
-    with open(temp_pdf_path, 'wb') as outfile:
-        outfile.write(pdf)
-    return temp_pdf_path
+def load_asset_html(filename: str) -> str:
+    with open(os.path.join(configs.assets_dir, filename), 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+@lru_cache(maxsize=32)
+def asset_data_uri(path: str) -> str:
+    mime_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    with open(path, 'rb') as file:
+        return f"data:{mime_type};base64,{base64.b64encode(file.read()).decode('ascii')}"
+
+
+def inline_assets(html: str, assets_dir: str | None = None) -> str:
+    """
+    Replace relative URLs of files in the assets directory, like the title page background, by data URIs. The HTML is
+    loaded with `setContent` into about:blank, from where Chromium does not reliably fetch file:// resources.
+    """
+    assets_dir = assets_dir or configs.assets_dir
+
+    def replace(match: re.Match) -> str:
+        attribute, quote, url = match.groups()
+        path = os.path.join(assets_dir, url)
+        if ABSOLUTE_URL_PATTERN.match(url) or not os.path.isfile(path):
+            return match.group(0)
+        if attribute == 'url(':
+            return f"url({quote}{asset_data_uri(path)}{quote})"
+        return f"{attribute}{quote}{asset_data_uri(path)}{quote}"
+
+    return ASSET_URL_PATTERN.sub(replace, html)
 
 
-async def html_to_pdf(html_file_executive_summary, html_file_content, html_file_title, html_file_disclaimer,
-                      html_file_end, output_path):
-    """ Convert multiple HTML files to a single PDF document """
+def prepare_html(html: str, base_url: str, head_html: str = '') -> str:
+    """
+    Inline the assets the HTML refers to and add a <base> tag for any other relative URL, so the HTML does not have to
+    live in the assets directory
+    """
+    html = inline_assets(html)
+    head_html = f'<base href="{base_url}">' + head_html
+    if re.search(r'<head[^>]*>', html, flags=re.IGNORECASE):
+        return re.sub(r'(<head[^>]*>)', lambda match: match.group(1) + head_html, html, count=1, flags=re.IGNORECASE)
+    return head_html + html
+
+
+async def generate_pdf_from_html(page, html, pdf_options, css_to_inject=None, base_url=None) -> bytes:
+    """ Generate a PDF from an in-memory HTML string and return the PDF bytes """
+    base_url = base_url or f"file://{configs.assets_dir}/"
+    await page.setContent(prepare_html(html, base_url, css_to_inject or ''))
+    try:
+        await page.waitForFunction(PAGE_READY_FUNCTION, {'timeout': PAGE_READY_TIMEOUT})
+    except PageTimeoutError:
+        logger.warning("Timed out waiting for the page to finish loading, rendering it as is")
+    return await page.pdf(pdf_options)
+
+
+async def html_to_pdf(html_executive_summary, html_content, html_title, output_path, html_disclaimer=None,
+                      html_end=None, renderer: PdfRenderer | None = None):
+    """ Convert multiple in-memory HTML documents to a single PDF document """
     header_template = """<div style='display: None'></div>"""
 
     footer_template = """
@@ -88,54 +149,52 @@ async def html_to_pdf(html_file_executive_summary, html_file_content, html_file_
        </style>
     """
 
-    # Launch the browser
-    browser = await launch(
-        executablePath=get_module_path("chromium"),
-        headless=True,
-        args=['--no-sandbox'],
-        handleSIGINT=False,
-        handleSIGTERM=False,
-        handleSIGHUP=False
-    )
+    # Borrow pages from the shared, already running browser instead of launching one per report
+    renderer = renderer or PdfRenderer()
 
-    # Initialize pypdf PdfWriter object
-    writer = PdfWriter()
+    # The disclaimer and end pages are static, so they come straight from the assets unless overridden
+    html_disclaimer = html_disclaimer or load_asset_html('disclaimer.html')
+    html_end = html_end or load_asset_html('end.html')
+
+    async def prepare_diagrams(html) -> (str, str):
+        # Diagrams are rendered to inline SVG up front, the mermaid script is only added for any left unrendered
+        if not configs.mermaid.prerender:
+            return html, css_to_inject + (mermaid_script_html() if 'mermaid' in html else '')
+        with span("prerender_diagrams", kind='render') as render_span:
+            html, unrendered = await DiagramRenderer().prerender(html, renderer)
+            render_span.set(unrendered=unrendered)
+        return html, css_to_inject + (mermaid_script_html() if unrendered else '')
 
-    temp_pdf_paths = []
+    (html_executive_summary, executive_summary_injection), (html_content, content_injection) = await asyncio.gather(
+        prepare_diagrams(html_executive_summary), prepare_diagrams(html_content)
+    )
 
-    for html_file_path, pdf_options, css_injection in zip(
-            [html_file_title, html_file_disclaimer, html_file_executive_summary, html_file_content, html_file_end],
+    async def render(part, html, pdf_options, css_injection) -> bytes:
+        # Borrow a page from the pool and generate the PDF bytes for one part of the report
+        with span(part, kind='render'):
+            async with renderer.page() as page:
+                return await generate_pdf_from_html(page, html, pdf_options, css_injection)
+
+    # Render all parts concurrently, `gather` keeps them in document order
+    pdf_parts = await asyncio.gather(*(
+        render(part, html, pdf_options, css_injection)
+        for part, html, pdf_options, css_injection in zip(
+            ["title", "disclaimer", "executive_summary", "content", "end"],
+            [html_title, html_disclaimer, html_executive_summary, html_content, html_end],
             [pdf_options_without_footer, pdf_options_without_footer, pdf_options_without_footer | margin_properties,
              pdf_options_with_footer | margin_properties, pdf_options_without_footer],
-            [None, None, css_to_inject, css_to_inject, None]
-    ):
-        # Create a new browser page
-        page = await browser.newPage()
-        # Generate a PDF and return the temp path
-        temp_pdf_path = await generate_pdf_from_html(page, html_file_path, pdf_options, css_injection)
-        # Append the page to the writer
-        writer.append(temp_pdf_path)
-        temp_pdf_paths.append(temp_pdf_path)
+            [None, None, executive_summary_injection, content_injection, None]
+        )
+    ))
+
+    # Initialize pypdf PdfWriter object and merge the parts straight from memory
+    writer = PdfWriter()
+    for pdf_part in pdf_parts:
+        writer.append(io.BytesIO(pdf_part))
 
     # After merging all PDFs, write to the output file
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
     with open(output_path, 'wb') as output_file:
         writer.write(output_file)
 
-    for path in temp_pdf_paths:
-        os.remove(path)
-
     writer.close()
-    await browser.close()
-
-
-if __name__ == '__main__':
-    html_executive_summary_content = os.path.join(configs.assets_dir, 'executive_summary.html')
-    html_file_content = os.path.join(configs.assets_dir, 'index.html')
-    html_file_title = os.path.join(configs.assets_dir, 'temp_title.html')
-    html_file_disclaimer = os.path.join(configs.assets_dir, 'disclaimer.html')
-    html_file_end = os.path.join(configs.assets_dir, 'end.html')
-    output_path = os.path.join(configs.reports_dir, 'Sample.pdf')
-
-    # Run the adjusted async function
-    asyncio.run(html_to_pdf(html_executive_summary_content, html_file_content, html_file_title, html_file_disclaimer,
-                            html_file_end, output_path))
@@ -1,4 +1,13 @@
+import re
+import hashlib
+from typing import FrozenSet, List, Tuple
+from bs4 import BeautifulSoup
+
 from report_ai.components.llms import invoke_llm
+from report_ai.components.mermaid import canonicalize_diagram
+from report_ai.components.postprocess import parse_section
+from report_ai.components.budget import ChargeTo
+from report_ai.components.tracing import span
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.language_models.chat_models import BaseChatModel
 
@@ -30,6 +39,85 @@ SYSTEM_PROMPT = (
 )
 USER_PROMPT_TEMPLATE = "### TEXT1 ###\n{__TEXT1__}\n\n---------------\n\n ### TEXT2 ###\n{__TEXT2__}"
 
+CROSS_REFERENCE_TEMPLATE = "<p class='cross-reference'><em>See the {__KIND__} in the {__HEADING__} section.</em></p>"
+
+
+def canonicalize_table(rows: List[List[str]]) -> FrozenSet[str]:
+    # Rows of normalized cell texts, so formatting, attributes and row order do not matter
+    return frozenset(' | '.join(re.sub(r'\s+', ' ', cell).lower() for cell in row) for row in rows)
+
+
+def hash_structure(items: FrozenSet[str]) -> str:
+    return hashlib.sha256('\n'.join(sorted(items)).encode('utf-8')).hexdigest()
+
+
+class StructuralDeduplicator:
+    """
+    Deterministic removal of tables and mermaid diagrams repeating ones from earlier sections. Structures are compared
+    on a canonical form, exact repeats by hash and near-exact ones by the Jaccard similarity of their rows or edges.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.8):
+        self.similarity_threshold = similarity_threshold
+        # (kind, hash, canonical items, heading of the section the structure first appeared in)
+        self.structures: List[Tuple[str, str, FrozenSet[str], str]] = []
+        self.removed = 0
+
+    def find_duplicate(self, kind: str, items: FrozenSet[str]) -> Tuple[str, str, FrozenSet[str], str] | None:
+        digest = hash_structure(items)
+        for structure in self.structures:
+            if structure[0] != kind:
+                continue
+            if structure[1] == digest or len(items & structure[2]) / len(items | structure[2]) >= self.similarity_threshold:
+                return structure
+        return None
+
+    def remove_duplicates(self, section_html: str) -> (str, List[Tuple[str, str, FrozenSet[str], str]], int):
+        """
+        Drop repeated structures from a section, returning the new HTML, the structures it introduces and how many
+        repeats were dropped. Nothing is counted until the section is accepted with `register`.
+        """
+        section = parse_section(section_html)
+        elements = [('table', idx, canonicalize_table(table["rows"])) for idx, table in enumerate(section.tables)]
+        elements += [('diagram', idx, canonicalize_diagram(diagram)) for idx, diagram in enumerate(section.diagrams)]
+
+        new_structures, duplicates = [], []
+        for kind, idx, items in elements:
+            if not items:
+                continue
+            duplicate = self.find_duplicate(kind, items)
+            if duplicate is None:
+                new_structures.append((kind, hash_structure(items), items, section.heading))
+            else:
+                duplicates.append((kind, idx, duplicate))
+        if not duplicates:
+            return section_html, new_structures, 0
+
+        # Only sections with repeats are parsed again, into a tree that can be edited
+        soup = BeautifulSoup(section_html, 'html.parser')
+        nodes = {'table': soup.find_all('table'), 'diagram': soup.select('.mermaid')}
+        removed = 0
+        for kind, idx, duplicate in duplicates:
+            if idx >= len(nodes[kind]):
+                continue
+            # Point readers to the original instead of repeating it when the section it appeared in is known
+            if duplicate[3] and duplicate[3] != section.heading:
+                nodes[kind][idx].replace_with(BeautifulSoup(CROSS_REFERENCE_TEMPLATE.format_map({
+                    "__KIND__": kind, "__HEADING__": f'"{duplicate[3]}"'
+                }), 'html.parser'))
+            else:
+                nodes[kind][idx].decompose()
+            removed += 1
+        return (str(soup) if removed else section_html), new_structures, removed
+
+    def register(self, structures: List[Tuple[str, str, FrozenSet[str], str]], removed: int = 0):
+        """
+        Remember the structures of an accepted section, so later sections cannot repeat them, and count the repeats
+        dropped from its final content. Retried attempts and restored sections are thereby counted once or not at all
+        """
+        self.structures.extend(structures)
+        self.removed += removed
+
 
 async def deduplicate_section(section_content: str, serialized_report: str, llm: BaseChatModel | None = None):
     USER_PROMPT = USER_PROMPT_TEMPLATE.format_map({
@@ -45,5 +133,6 @@ async def deduplicate_section(section_content: str, serialized_report: str, llm:
             content=USER_PROMPT
         ),
     ]
-    response = await invoke_llm(messages, llm=llm)
+    with span("deduplicate_section", kind='dedup'), ChargeTo("dedup"):
+        response = await invoke_llm(messages, llm=llm)
     return response.content
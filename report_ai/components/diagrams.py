@@ -0,0 +1,134 @@
+import os
+import hashlib
+from pathlib import Path
+from typing import Dict, List
+from pyppeteer.errors import TimeoutError as PageTimeoutError
+
+from report_ai.common.utils import configs
+from report_ai.common.utils.helpers import Singleton
+from report_ai.components.renderer import PdfRenderer
+from report_ai.components.mermaid import normalize_diagram_source
+from report_ai.components.postprocess import get_backend, get_text
+
+logger = configs.logger
+
+# Milliseconds the diagram rendering page gets to load the mermaid script
+MERMAID_LOAD_TIMEOUT = 30000
+
+
+def vendored_mermaid_path() -> str:
+    return os.path.join(configs.assets_dir, configs.mermaid.script_path)
+
+
+class MermaidNotFound(FileNotFoundError):
+    pass
+
+
+def mermaid_script_url() -> str:
+    """ URL of the vendored mermaid build, or of `mermaid.cdn_url` when the build is missing and a CDN is configured """
+    if os.path.exists(vendored_mermaid_path()):
+        return Path(vendored_mermaid_path()).as_uri()
+    if configs.mermaid.cdn_url:
+        logger.info(f"No mermaid build at {vendored_mermaid_path()}, loading it from {configs.mermaid.cdn_url}")
+        return configs.mermaid.cdn_url
+    raise MermaidNotFound(f"No mermaid build at {vendored_mermaid_path()} and no `mermaid.cdn_url` configured, add "
+                          f"mermaid.min.js (mermaid 10) there to render diagrams")
+
+
+def mermaid_script_html(start_on_load: bool = True) -> str:
+    script_url = mermaid_script_url()
+    return (f'<script src="{script_url}"></script><script>mermaid.initialize({{startOnLoad: '
+            f'{str(start_on_load).lower()}, theme: "{configs.mermaid.theme}"}});</script>')
+
+
+class DiagramRenderer(metaclass=Singleton):
+    """
+    Renders mermaid diagrams to SVG once, in the shared PDF renderer browser, and caches them on disk by a hash of the
+    normalized diagram source. Prerendered reports are static HTML, so their pages render without running any script.
+    """
+
+    def __init__(self, cache_dir: str | None = None):
+        self.cache_dir = cache_dir or configs.mermaid.cache_dir or os.path.join(configs.root_dir, "cache", "diagrams")
+        self.svgs: Dict[str, str] = {}
+        self.hits, self.misses, self.failures = 0, 0, 0
+
+    @staticmethod
+    def make_key(diagram_source: str) -> str:
+        payload = f"{configs.mermaid.theme}\n{normalize_diagram_source(diagram_source)}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.svg")
+
+    def get(self, key: str) -> str | None:
+        if key not in self.svgs and os.path.exists(self._cache_path(key)):
+            with open(self._cache_path(key), 'r', encoding='utf-8') as file:
+                self.svgs[key] = file.read()
+        return self.svgs.get(key)
+
+    def set(self, key: str, svg: str):
+        self.svgs[key] = svg
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temporary file first, so a concurrent reader never sees a partial SVG
+            temporary_path = f"{self._cache_path(key)}.{os.getpid()}.tmp"
+            with open(temporary_path, 'w', encoding='utf-8') as file:
+                file.write(svg)
+            os.replace(temporary_path, self._cache_path(key))
+        except OSError:
+            logger.exception("Failed to write rendered diagram to cache")
+
+    async def render(self, sources: Dict[str, str], renderer: PdfRenderer) -> Dict[str, str]:
+        """ Render `{key: diagram source}` to `{key: svg}` on one pooled page, leaving out diagrams mermaid rejects """
+        script_html = mermaid_script_html(start_on_load=False)
+        svgs = {}
+        async with renderer.page() as page:
+            try:
+                await page.setContent(f"<html><head>{script_html}</head><body></body></html>")
+                await page.waitForFunction("() => typeof mermaid !== 'undefined'", {'timeout': MERMAID_LOAD_TIMEOUT})
+            except PageTimeoutError:
+                logger.warning("Timed out loading mermaid, diagrams are left unrendered")
+                return {}
+            for key, source in sources.items():
+                try:
+                    svgs[key] = await page.evaluate(
+                        "async (id, source) => (await mermaid.render(id, source)).svg", f"mermaid-{key[:12]}", source
+                    )
+                except Exception:
+                    # The diagram keeps its source, the page renders it client side (as an error box if invalid)
+                    self.failures += 1
+                    logger.warning(f"Failed to prerender mermaid diagram:\n{source}")
+        return svgs
+
+    async def prerender(self, html: str, renderer: PdfRenderer | None = None) -> (str, int):
+        """ Replace every mermaid diagram of `html` by its SVG, returning the HTML and the number left unrendered """
+        backend = get_backend()
+        document = backend.parse_document(html)
+        diagrams = backend.select_class(document, 'mermaid')
+        if not diagrams:
+            return html, 0
+
+        sources = [get_text(backend, diagram) for diagram in diagrams]
+        keys: List[str] = [self.make_key(source) for source in sources]
+        missing = {key: source for key, source in zip(keys, sources) if self.get(key) is None}
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            for key, svg in (await self.render(missing, renderer or PdfRenderer())).items():
+                self.set(key, svg)
+
+        unrendered = 0
+        for key, diagram in zip(keys, diagrams):
+            svg = self.get(key)
+            if svg is None:
+                unrendered += 1
+                continue
+            backend.set_inner_html(diagram, svg)
+            backend.set_attribute(diagram, 'data-processed', 'true')
+        return backend.serialize(document), unrendered
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "failures": self.failures}
+
+
+__all__ = ['DiagramRenderer', 'MermaidNotFound', 'mermaid_script_html', 'mermaid_script_url']
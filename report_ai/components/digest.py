@@ -0,0 +1,75 @@
+import re
+from typing import Dict, List
+
+from report_ai.components.tokens import estimate_tokens
+from report_ai.components.postprocess import parse_section
+from report_ai.components.mermaid import extract_node_labels
+
+# Maximum characters kept for a single claim or diagram signature
+MAX_ITEM_LENGTH = 200
+
+# Lines with a lower value are kept first when the digest has to fit into a token budget
+HEADING_PRIORITY, TABLE_PRIORITY, DIAGRAM_PRIORITY, CLAIM_PRIORITY = 0, 1, 2, 3
+
+
+def first_sentence(text: str) -> str:
+    sentence = re.split(r'(?<=[.!?])\s', text.strip(), maxsplit=1)[0]
+    return sentence[:MAX_ITEM_LENGTH]
+
+
+def diagram_signature(diagram_source: str) -> str:
+    # Summarize a mermaid diagram by its node labels in order of appearance
+    return ' | '.join(extract_node_labels(diagram_source))[:MAX_ITEM_LENGTH]
+
+
+class ReportDigest:
+    """
+    Compact, incrementally maintained description of what the report already covers. It is sent to section and dedup
+    prompts instead of the full text of every previous section, so their input no longer grows quadratically.
+    """
+
+    def __init__(self, token_budget: int | None = None):
+        self.token_budget = token_budget
+        self.sections: List[Dict] = []
+
+    def update(self, section_html: str):
+        section = parse_section(section_html)
+        tables = [table["caption"] or ', '.join(table["header"]) for table in section.tables]
+        signatures = [diagram_signature(diagram) for diagram in section.diagrams]
+        self.sections.append({
+            "heading": section.heading,
+            "sub_headings": list(section.sub_headings),
+            "tables": [table for table in tables if table],
+            "diagrams": [signature for signature in signatures if signature],
+            "claims": [first_sentence(claim) for claim in section.claims]
+        })
+
+    def _lines(self) -> List[tuple]:
+        # (priority, section index, position in section, line)
+        lines = []
+        for idx, section in enumerate(self.sections):
+            entries = [(HEADING_PRIORITY, f"## {section['heading']}")]
+            entries += [(HEADING_PRIORITY, f"### {sub_heading}") for sub_heading in section['sub_headings']]
+            entries += [(TABLE_PRIORITY, f"- Table: {table}") for table in section['tables']]
+            entries += [(DIAGRAM_PRIORITY, f"- Diagram: {diagram}") for diagram in section['diagrams']]
+            entries += [(CLAIM_PRIORITY, f"- {claim}") for claim in section['claims']]
+            lines += [(priority, idx, position, line) for position, (priority, line) in enumerate(entries)]
+        return lines
+
+    def render(self, token_budget: int | None = None) -> str:
+        token_budget = token_budget or self.token_budget
+        lines = self._lines()
+        if token_budget:
+            # Keep headings first, then tables, diagrams and claims, earlier sections winning ties
+            kept, used = [], 0
+            for line in sorted(lines, key=lambda line: (line[0], line[1], line[2])):
+                tokens = estimate_tokens(line[3]) + 1
+                if used + tokens > token_budget:
+                    continue
+                kept.append(line)
+                used += tokens
+            lines = sorted(kept, key=lambda line: (line[1], line[2]))
+        return '\n'.join(line[3] for line in lines)
+
+
+__all__ = ['ReportDigest']
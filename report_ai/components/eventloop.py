@@ -0,0 +1,32 @@
+import asyncio
+import threading
+from typing import Coroutine, TypeVar
+
+from report_ai.common.utils.helpers import Singleton
+
+T = TypeVar('T')
+
+
+class BackgroundLoop(metaclass=Singleton):
+    """
+    Long-lived event loop on a daemon thread that runs the coroutines of the synchronous entry points. The PDF
+    renderer's browser and the rate limiters' locks are bound to the loop they were first used on, on this loop they
+    are reused from one report to the next instead of being rebuilt for the new loop of every `asyncio.run`.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="report-ai-event-loop", daemon=True)
+        self.thread.start()
+
+    def run(self, coroutine: Coroutine[None, None, T]) -> T:
+        """ Run `coroutine` on the loop and wait for its result, safe to call from several threads at once """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result()
+        finally:
+            # Only has an effect when the caller was interrupted, e.g. by a KeyboardInterrupt, while waiting
+            future.cancel()
+
+
+__all__ = ['BackgroundLoop']
@@ -1,8 +1,10 @@
 import re
 import subprocess
-from bs4 import BeautifulSoup
 from typing import List, Dict
 from report_ai.assets.html_elements import *
+from report_ai.common.utils import configs
+from report_ai.components.retrieval import ConversationIndex
+from report_ai.components.postprocess import parse_section
 
 # Define the start and end markers
 ANSWER_START_MARKER = ''
@@ -28,7 +30,8 @@ def extract_content_and_references_from_message_dict(message: str):
     return content or message, references
 
 
-async def serialize_conversation(conversation: List[Dict]) -> (str, List[str]):
+async def serialize_conversation(conversation: List[Dict],
+                                 chunk_tokens: int | None = None) -> (str, List[str], ConversationIndex):
     # Define a dictionary mapping roles in the conversation to their human-readable forms
     role_mappings = {"user": "User", "assistant": "AI"}
     # Initialize a list to hold serialized messages
@@ -45,8 +48,14 @@ async def serialize_conversation(conversation: List[Dict]) -> (str, List[str]):
         )
         # Extend the all_references list with any new references found in the current message
         all_references.extend(references)
-    # Concatenate all messages into a single string and eliminate duplicate references, returning both
-    return "\n".join(messages) + "\n", list(set(all_references))
+    # Concatenate all messages into a single string
+    serialized_conversation = "\n".join(messages) + "\n"
+    # Index the conversation once so every section can retrieve just the chunks relevant to it
+    conversation_index = ConversationIndex.from_serialized_conversation(
+        serialized_conversation, chunk_tokens or configs.retrieval.chunk_tokens
+    )
+    # Eliminate duplicate references and return them along with the conversation and its index
+    return serialized_conversation, list(set(all_references)), conversation_index
 
 
 # Regex pattern for sanitizing filename
@@ -73,19 +82,13 @@ def get_module_path(module_name: str):
 
 
 def extract_html_body_content(section_html: str):
-    # Use BeautifulSoup to parse the given HTML string using the 'html.parser' as parser
-    soup = BeautifulSoup(section_html, 'html.parser')
-    # Extract the contents of the <body> tag as a list, convert each element to a string,
-    # and then join them together without any separator to form a single string
-    body_content = ''.join(map(str, soup.find('body').contents))
-    # Extract the text from the <body> tag, using '\n' as a separator between tags
-    # and stripping leading and trailing spaces from each text block
-    body_text = soup.body.get_text(separator='\n', strip=True)
+    # Parse the section once, the digest, dedup and overlap detection reuse the same parse through the parse cache
+    parsed_section = parse_section(section_html)
     # Return both the HTML content and the plain text of the body tag as a tuple
-    return body_content, body_text
+    return parsed_section.html, parsed_section.text
 
 
-async def add_title_to_html(title_info: Dict, user_name: str, html_title_path: str, output_path: str):
+async def add_title_to_html(title_info: Dict, user_name: str, html_title_path: str, output_path: str | None = None) -> str:
     # Open and read the HTML template file
     with open(html_title_path, 'r') as file:
         template_content = file.read()
@@ -94,9 +97,11 @@ async def add_title_to_html(title_info: Dict, user_name: str, html_title_path: s
         "{__TITLE__}", title_info["title"]).replace(
         "{__SUB_TITLE__}", title_info["sub_title"]).replace(
         "{__USER_NAME__}", user_name)
-    # Open the output file in write mode and write the updated content
-    with open(output_path, 'w') as file:
-        file.write(updated_content)
+    # Write the updated content only when an output file is requested, the renderer consumes the string directly
+    if output_path:
+        with open(output_path, 'w') as file:
+            file.write(updated_content)
+    return updated_content
 
 
 async def compile_full_html(html_content: Dict[str, str], references: List[str]) -> (str, str):
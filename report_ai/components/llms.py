@@ -1,45 +1,321 @@
 import os
-from typing import List
+import time
+import asyncio
+import threading
 from json.decoder import JSONDecodeError
+from typing import Dict, Iterator, List, Mapping, Type
 from tenacity import retry, wait_fixed, stop_after_attempt, retry_if_exception_type
 
 from report_ai.common.utils import configs  # Needed to initialize ENV variables
-from langchain_openai.chat_models import ChatOpenAI
-from langchain_anthropic.chat_models import ChatAnthropic
 from langchain_core.messages.base import BaseMessage
-from langchain.pydantic_v1 import ValidationError
-from langchain.output_parsers import OutputFixingParser
+from langchain.pydantic_v1 import BaseModel, ValidationError
+from langchain.output_parsers.prompts import NAIVE_FIX_PROMPT
 from langchain_core.exceptions import OutputParserException
 from langchain_core.language_models.chat_models import BaseChatModel
 
-openai = {
-    'gpt-3.5-turbo': ChatOpenAI(model_name='gpt-3.5-turbo', temperature=0.7),
-    'gpt-4-turbo': ChatOpenAI(model_name='gpt-4-turbo', temperature=0.7),
-    'gpt-4o': ChatOpenAI(model_name='gpt-4o', temperature=0.7)
-}
+from report_ai.common.utils.helpers import Singleton
+from report_ai.components.cache import LLMCache
+from report_ai.components.ratelimit import get_rate_limiter
+from report_ai.components.tokens import estimate_messages_tokens, estimate_tokens, get_token_usage
+from report_ai.components.budget import ChargeTo, TokenBudgetExceeded, cheaper_model, current_ledger, current_stage
+from report_ai.components.resilience import (
+    CircuitOpenError, get_circuit_breaker, get_latency_tracker, hedge_delay, hedged
+)
+from report_ai.components.structured import parse_locally, record_parse_path, tool_call_message
+from report_ai.components.tracing import current_span, record_attempt, span
 
-anthropic = {
-    'claude-3-haiku': ChatAnthropic(model='claude-3-haiku-20240307', temperature=0.7),
-    'claude-3-opus': ChatAnthropic(model='claude-3-opus-20240229', temperature=0.7)
-}
+# Environment variables selecting the model of a provider, they take precedence over `default_model`
+MODEL_ENVIRONMENT_VARIABLES = {"openai": "GPT_MODEL", "anthropic": "CLAUDE_MODEL"}
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_fixed(0.2),
-       retry=(retry_if_exception_type((JSONDecodeError, ValidationError))))
-async def invoke_parser_llm(prompt, output_parser, llm: BaseChatModel | None):
-    llm = llm or openai[os.getenv('GPT_MODEL', 'gpt-4o')]
-    output = await llm.ainvoke(prompt.to_messages())
+def build_openai_client(model: str, temperature: float, timeout: float, max_retries: int,
+                        max_connections: int) -> BaseChatModel:
+    # Provider SDKs are imported on first use, they dominate the import time of the package
+    import httpx
+    from langchain_openai.chat_models import ChatOpenAI
+    limits = httpx.Limits(max_connections=max_connections)
+    return ChatOpenAI(model_name=model, temperature=temperature, timeout=timeout, max_retries=max_retries,
+                      http_client=httpx.Client(limits=limits, timeout=timeout),
+                      http_async_client=httpx.AsyncClient(limits=limits, timeout=timeout))
+
+
+def build_anthropic_client(model: str, temperature: float, timeout: float, max_retries: int) -> BaseChatModel:
+    from langchain_anthropic.chat_models import ChatAnthropic
+    return ChatAnthropic(model=model, temperature=temperature, default_request_timeout=timeout,
+                         max_retries=max_retries)
+
+
+class LLMRegistry(metaclass=Singleton):
+    """
+    Chat model clients built on first use from `configs.llms` and cached by provider, model and parameters, so a run
+    only pays for (and needs the API key of) the clients it actually uses.
+    """
+    builders = {"openai": build_openai_client, "anthropic": build_anthropic_client}
+
+    def __init__(self):
+        self.clients: Dict[tuple, BaseChatModel] = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def default_model(provider: str) -> str:
+        variable = MODEL_ENVIRONMENT_VARIABLES.get(provider)
+        return (variable and os.getenv(variable)) or configs.llms[provider].default_model
+
+    @staticmethod
+    def settings(provider: str, model: str, **overrides) -> Dict:
+        provider_configs = configs.llms[provider]
+        if model not in provider_configs.models:
+            raise KeyError(f"Unknown {provider} model '{model}', add it to `llms.{provider}.models` in configs.yaml")
+        settings = {key: value for key, value in provider_configs.items() if key not in ['default_model', 'models']}
+        return settings | {"model": model} | dict(provider_configs.models[model] or {}) | overrides
+
+    def get(self, provider: str, model: str | None = None, **overrides) -> BaseChatModel:
+        settings = self.settings(provider, model or self.default_model(provider), **overrides)
+        key = (provider, tuple(sorted(settings.items())))
+        with self.lock:
+            if key not in self.clients:
+                self.clients[key] = self.builders[provider](**settings)
+            return self.clients[key]
+
+
+class ProviderModels(Mapping):
+    """ Read-only `{model: client}` view of a provider's configured models, clients are built on first access """
+
+    def __init__(self, provider: str):
+        self.provider = provider
+
+    def __getitem__(self, model: str) -> BaseChatModel:
+        return LLMRegistry().get(self.provider, model)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(configs.llms[self.provider].models)
+
+    def __len__(self) -> int:
+        return len(configs.llms[self.provider].models)
+
+
+openai = ProviderModels("openai")
+
+anthropic = ProviderModels("anthropic")
+
+
+def get_llm(provider: str, model: str | None = None, **overrides) -> BaseChatModel:
+    """ Shared client of `model` (the provider's default model when None), e.g. get_llm('openai', temperature=0) """
+    return LLMRegistry().get(provider, model, **overrides)
+
+
+def get_llm_provider(llm: BaseChatModel) -> str:
+    # e.g. 'openai' for `openai-chat` and 'anthropic' for `anthropic-chat`
+    return llm._llm_type.split('-')[0]
+
+
+def get_llm_model_name(llm: BaseChatModel) -> str:
+    return getattr(llm, 'model_name', None) or getattr(llm, 'model', None) or llm._llm_type
+
+
+def supports_structured_output(llm: BaseChatModel) -> bool:
+    return configs.structured_output.native and get_llm_provider(llm) in configs.structured_output.providers
+
+
+def structured_output_kwargs(llm: BaseChatModel, tools: List[Type[BaseModel]] | None) -> Dict:
+    """ Invocation arguments binding `tools` in the format of the model's provider and forcing a call of the first """
+    if not tools or not supports_structured_output(llm):
+        return {}
+    return dict(llm.bind_tools(tools, tool_choice=tools[0].__name__).kwargs)
+
+
+async def call_llm(llm: BaseChatModel, messages: List[BaseMessage], tools: List[Type[BaseModel]] | None = None):
+    """
+    Invoke the chat model, queueing on the shared rate limiter of its provider and model first. With `tools`, models
+    supporting native structured output answer with a tool call, returned as its JSON arguments
+    """
+    rate_limiter = get_rate_limiter(get_llm_provider(llm), get_llm_model_name(llm))
+    estimated_tokens = estimate_messages_tokens(messages) + configs.rate_limits.expected_completion_tokens
+    # The report's token ledger refuses the call before it is sent when it would exceed the report's budget
+    ledger = current_ledger()
+    if ledger is not None:
+        ledger.reserve(estimated_tokens)
+    usage = None
+    try:
+        queued_at = time.perf_counter()
+        await rate_limiter.acquire(estimated_tokens)
+        llm_span = current_span()
+        llm_span.set(queued=round(time.perf_counter() - queued_at, 4))
+        # Hung calls are abandoned after `resilience.timeout` seconds and count as a failure of the provider
+        response = await asyncio.wait_for(llm.ainvoke(messages, **structured_output_kwargs(llm, tools)),
+                                          timeout=configs.resilience.timeout or None)
+        response = tool_call_message(response)
+        usage = get_token_usage(response)
+        rate_limiter.settle(estimated_tokens, sum(usage) if usage else None)
+        # Providers that report no usage are accounted with the local estimate
+        usage = usage or (estimate_messages_tokens(messages), estimate_tokens(response.content))
+        llm_span.set(prompt_tokens=usage[0], completion_tokens=usage[1])
+    finally:
+        if ledger is not None:
+            ledger.settle(estimated_tokens, get_llm_model_name(llm), *(usage or (None, None)))
+    return response
+
+
+def routed_model(provider: str, stage: str) -> str | None:
+    """ Model the routing table assigns to `stage` for `provider`, None to use the report's model """
+    if not configs.routing.enabled:
+        return None
+    return (configs.routing.stages.get(stage) or {}).get(provider)
+
+
+def select_llm(llm: BaseChatModel | None, stage: str | None = None) -> BaseChatModel:
+    """
+    The chat model to call for `stage` (the running one by default): the report's model unless the routing table
+    assigns the stage a model of the same provider. Reports running low on their token budget switch to the cheaper
+    model of the provider for every stage.
+    """
+    llm = llm or get_llm('openai')
+    provider = get_llm_provider(llm)
+    model = cheaper_model(provider) or routed_model(provider, stage or current_stage())
+    return llm if model is None else get_llm(provider, model)
+
+
+def failover_llm(provider: str) -> BaseChatModel | None:
+    """ Client taking over the calls of `provider` while its circuit is open, None when no failover is available """
+    failover_provider = configs.resilience.failover.get(provider)
+    if failover_provider is None or not get_circuit_breaker(failover_provider).allow():
+        return None
+    try:
+        # Same routing as the report's model, e.g. dedup calls fail over to the fast model of the other provider
+        return select_llm(get_llm(failover_provider))
+    except Exception:
+        # e.g. no API key of the failover provider, which then stays out of the rotation until the next cooldown
+        get_circuit_breaker(failover_provider).record_failure()
+        return None
+
+
+def hedge_llm(llm: BaseChatModel) -> BaseChatModel:
+    # Duplicate requests go to `resilience.hedging.models` of the provider, to the same model when it has none
+    provider = get_llm_provider(llm)
+    model = configs.resilience.hedging.models.get(provider)
+    return llm if model is None else get_llm(provider, model)
+
+
+async def resilient_call_llm(llm: BaseChatModel, messages: List[BaseMessage],
+                             tools: List[Type[BaseModel]] | None = None):
+    """
+    `call_llm` guarded by the circuit breaker of the model's provider, failing over to `resilience.failover` while
+    the circuit is open. With hedging, a call slower than the configured latency percentile of its model gets a
+    duplicate request and the first answer wins.
+    """
+    provider = get_llm_provider(llm)
+    breaker = get_circuit_breaker(provider)
+    if not breaker.allow():
+        failover = failover_llm(provider)
+        if failover is None:
+            raise CircuitOpenError(f"Circuit of {provider} is open and no failover provider is available")
+        current_span().set(failover=f"{get_llm_provider(failover)}/{get_llm_model_name(failover)}")
+        llm, breaker = failover, get_circuit_breaker(get_llm_provider(failover))
+
+    async def timed_call(target: BaseChatModel):
+        started = time.perf_counter()
+        response = await call_llm(target, messages, tools)
+        tracker = get_latency_tracker(get_llm_provider(target), get_llm_model_name(target))
+        tracker.record(time.perf_counter() - started)
+        return response
+
+    tracker = get_latency_tracker(get_llm_provider(llm), get_llm_model_name(llm))
+    duplicate_llm = hedge_llm(llm)
     try:
-        parsed_output = output_parser.parse(output.content)
-    except OutputParserException:
-        fixing_parser = OutputFixingParser.from_llm(parser=output_parser, llm=llm)
-        parsed_output = fixing_parser.parse(output.content)
+        response = await hedged(lambda: timed_call(llm), lambda: timed_call(duplicate_llm), hedge_delay(tracker),
+                                tracker)
+    except TokenBudgetExceeded:
+        # Refused by the report's budget before anything was sent, which says nothing about the provider
+        breaker.release()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
+    return response
+
+
+async def fix_output(output_parser, completion: str, llm: BaseChatModel, use_cache: bool = True):
+    """
+    Parsed output of a completion that did not parse, asking the model to fix it with the OutputFixingParser prompt.
+    The call is charged to the `output_fixing` stage and goes through the cache, budget and resilience of any other call
+    """
+    try:
+        return output_parser.parse(completion)
+    except OutputParserException as error:
+        messages = NAIVE_FIX_PROMPT.format_prompt(instructions=output_parser.get_format_instructions(),
+                                                  completion=completion, error=repr(error)).to_messages()
+    with ChargeTo('output_fixing'):
+        llm = select_llm(llm)
+        cache = LLMCache()
+        cache_key = LLMCache.make_key(llm, messages) if use_cache and cache.enabled else None
+        with span("output_fixing", kind='llm', model=get_llm_model_name(llm)) as llm_span:
+            fixed = await cache.aget(cache_key) if cache_key else None
+            from_cache = fixed is not None
+            llm_span.set(cache=("hit" if from_cache else "miss") if cache_key else "disabled")
+            if not from_cache:
+                fixed = await resilient_call_llm(llm, messages)
+            parsed = parse_locally(output_parser, fixed.content)
+            parsed_output = output_parser.parse(fixed.content) if parsed is None else parsed[0]
+    if cache_key and not from_cache:
+        await cache.aset(cache_key, fixed)
+    return parsed_output
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_fixed(0.2),
+       retry=(retry_if_exception_type((JSONDecodeError, ValidationError))), before=record_attempt)
+async def invoke_parser_llm(prompt, output_parser, llm: BaseChatModel | None, use_cache: bool = True,
+                            schema: Type[BaseModel] | None = None):
+    """
+    Parsed output of the prompt. With a `schema`, providers supporting it answer through native structured output.
+    Outputs that do not parse are repaired locally first, only what cannot be repaired costs a `fix_output` call
+    """
+    llm = select_llm(llm)
+    messages = prompt.to_messages()
+    tools = [schema] if schema is not None and supports_structured_output(llm) else None
+    cache = LLMCache()
+    cache_key = LLMCache.make_key(llm, messages, tools) if use_cache and cache.enabled else None
+    with span("invoke_parser_llm", kind='llm', model=get_llm_model_name(llm)) as llm_span:
+        output = await cache.aget(cache_key) if cache_key else None
+        from_cache = output is not None
+        llm_span.set(cache=("hit" if from_cache else "miss") if cache_key else "disabled")
+        if not from_cache:
+            output = await resilient_call_llm(llm, messages, tools)
+        parsed = parse_locally(output_parser, output.content)
+        if parsed is not None:
+            parsed_output, parse_path = parsed
+            if parse_path == 'json' and output.response_metadata.get("structured_output"):
+                parse_path = 'native'
+        else:
+            parse_path = 'output_fixing'
+            parsed_output = await fix_output(output_parser, output.content, llm, use_cache)
+        record_parse_path(parse_path)
+        llm_span.set(parse_path=parse_path)
+    # Only outputs that could be parsed are cached, so a retry never replays a broken response
+    if cache_key and not from_cache:
+        await cache.aset(cache_key, output)
     return parsed_output
 
 
-async def invoke_llm(messages: List[BaseMessage], llm: BaseChatModel | None):
-    llm = llm or openai[os.getenv('GPT_MODEL', 'gpt-4o')]
-    return await llm.ainvoke(messages)
+async def invoke_llm(messages: List[BaseMessage], llm: BaseChatModel | None, use_cache: bool = True):
+    llm = select_llm(llm)
+    cache = LLMCache()
+    with span("invoke_llm", kind='llm', model=get_llm_model_name(llm)) as llm_span:
+        if not (use_cache and cache.enabled):
+            llm_span.set(cache="disabled")
+            return await resilient_call_llm(llm, messages)
+
+        cache_key = LLMCache.make_key(llm, messages)
+        response = await cache.aget(cache_key)
+        llm_span.set(cache="miss" if response is None else "hit")
+        if response is None:
+            response = await resilient_call_llm(llm, messages)
+            await cache.aset(cache_key, response)
+        return response
 
 
-__all__ = ['openai', 'anthropic', 'invoke_parser_llm', 'invoke_llm']
+__all__ = ['openai', 'anthropic', 'get_llm', 'select_llm', 'LLMRegistry', 'invoke_parser_llm', 'invoke_llm',
+           'fix_output']
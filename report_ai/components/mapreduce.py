@@ -0,0 +1,112 @@
+import asyncio
+from typing import List
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from report_ai.common.utils import configs
+from report_ai.components.llms import invoke_llm
+from report_ai.components.tokens import estimate_tokens
+from report_ai.components.retrieval import MESSAGE_SEPARATOR, split_into_chunks
+
+logger = configs.logger
+
+# Notes of different chunks are separated like the messages of a serialized conversation
+NOTES_SEPARATOR = f"\n{MESSAGE_SEPARATOR}\n"
+
+# Rough number of English words per token, used to turn token budgets into length instructions
+WORDS_PER_TOKEN = 0.75
+
+EXTRACT_SYSTEM_PROMPT_TEMPLATE = (
+    "You condense an excerpt of a dialogue exchange between a user and an AI about bio-medical research into notes "
+    "another model will design a report from. Keep the format of the excerpt: repeat every question of the user as "
+    "`User: <question>`, followed by `AI: <notes>` holding the key findings, figures, trial names, table contents and "
+    "relationships of its answer. Drop greetings, repetitions and broad descriptions. Use at most __MAX_WORDS__ words "
+    "in total and return the notes only"
+)
+
+MERGE_SYSTEM_PROMPT_TEMPLATE = (
+    "You merge consecutive notes on a dialogue exchange between a user and an AI about bio-medical research into one "
+    "shorter set of notes in the same `User: <question>` / `AI: <notes>` format. Keep every distinct question, merge "
+    "repeated findings and keep figures, trial names and relationships. Use at most __MAX_WORDS__ words in total and "
+    "return the notes only"
+)
+
+
+def split_conversation(serialized_conversation: str, chunk_tokens: int) -> List[str]:
+    """ Consecutive exchanges packed into chunks of up to `chunk_tokens`, exchanges longer than that split further """
+    chunks, group, group_tokens = [], [], 0
+    for exchange in serialized_conversation.split(MESSAGE_SEPARATOR):
+        if not exchange.strip():
+            continue
+        exchange_tokens = estimate_tokens(exchange)
+        if group and group_tokens + exchange_tokens > chunk_tokens:
+            chunks.append(MESSAGE_SEPARATOR.join(group))
+            group, group_tokens = [], 0
+        if exchange_tokens > chunk_tokens:
+            # Paragraph groups of a single exchange, each prefixed with the user question like the retrieval chunks
+            chunks += split_into_chunks(exchange, chunk_tokens)
+            continue
+        group.append(exchange)
+        group_tokens += exchange_tokens
+    if group:
+        chunks.append(MESSAGE_SEPARATOR.join(group))
+    return chunks
+
+
+def group_notes(notes: List[str], group_tokens: int) -> List[List[str]]:
+    # Every group but the last one holds at least two notes, so each reduce round strictly shrinks the list
+    groups, tokens = [[]], 0
+    for note in notes:
+        note_tokens = estimate_tokens(note)
+        if len(groups[-1]) >= 2 and tokens + note_tokens > group_tokens:
+            groups.append([])
+            tokens = 0
+        groups[-1].append(note)
+        tokens += note_tokens
+    return groups
+
+
+async def condense(system_prompt_template: str, content: str, llm: BaseChatModel | None) -> str:
+    system_prompt = system_prompt_template.replace(
+        "__MAX_WORDS__", str(int(configs.mapreduce.extract_tokens * WORDS_PER_TOKEN))
+    )
+    response = await invoke_llm([SystemMessage(content=system_prompt), HumanMessage(content=content)], llm=llm)
+    return response.content.strip()
+
+
+async def condense_conversation(serialized_conversation: str, llm: BaseChatModel | None = None) -> str:
+    """
+    Conversations above `mapreduce.threshold_tokens` are split on their message separators, every chunk is condensed
+    concurrently (map) and the notes are merged in rounds until they fit into `mapreduce.digest_tokens` (reduce). The
+    digest keeps the `User:` / `AI:` format, so the skeleton and summary prompts take it in place of the conversation.
+    Smaller conversations are returned unchanged.
+    """
+    conversation_tokens = estimate_tokens(serialized_conversation)
+    if not configs.mapreduce.enabled or conversation_tokens <= configs.mapreduce.threshold_tokens:
+        return serialized_conversation
+
+    semaphore = asyncio.Semaphore(configs.mapreduce.concurrency)
+
+    async def bounded_condense(system_prompt_template: str, content: str) -> str:
+        async with semaphore:
+            return await condense(system_prompt_template, content, llm)
+
+    chunks = split_conversation(serialized_conversation, configs.mapreduce.chunk_tokens)
+    notes = await asyncio.gather(*(bounded_condense(EXTRACT_SYSTEM_PROMPT_TEMPLATE, chunk) for chunk in chunks))
+    rounds = 0
+    while len(notes) > 1 and estimate_tokens(NOTES_SEPARATOR.join(notes)) > configs.mapreduce.digest_tokens:
+        groups = group_notes(notes, configs.mapreduce.chunk_tokens)
+        # A note left alone in the last group is already condensed, it is carried over to the next round as is
+        notes = await asyncio.gather(*(
+            bounded_condense(MERGE_SYSTEM_PROMPT_TEMPLATE, NOTES_SEPARATOR.join(group)) if len(group) > 1
+            else asyncio.sleep(0, result=group[0]) for group in groups
+        ))
+        rounds += 1
+
+    digest = NOTES_SEPARATOR.join(notes)
+    logger.info(f"Condensed a conversation of {conversation_tokens} tokens in {len(chunks)} chunks into a digest of "
+                f"{estimate_tokens(digest)} tokens after {rounds} merge rounds")
+    return digest
+
+
+__all__ = ['condense_conversation', 'split_conversation']
@@ -0,0 +1,245 @@
+import re
+import html
+from typing import Dict, FrozenSet, List, Tuple
+
+# Node id such as `A`, `node_1` or `node-1`, a hyphen only belongs to it when a word character follows, so `A-->B`
+# and `A-.->B` still start a link right after `A`
+mermaid_id_regex_pattern = r'\w+(?:-\w+)*'
+
+# Matches node definitions such as A["GPR119 Activation"], B(Insulin), C{Decision} or D(("Circle")), capturing the id
+# and either the quoted or the unquoted label
+mermaid_node_regex_pattern = (
+    r'\b(' + mermaid_id_regex_pattern + r')\s*'
+    r'(?:\[\(|\(\[|\[\[|\(\(|\[|\(|\{)\s*(?:"([^"]*)"|([^"\]\)\}]*?))\s*(?:\)\]|\]\)|\]\]|\)\)|\]|\)|\})'
+)
+
+# Matches edge labels written as `-->|label|`, `-- label -->` or `-. label .->`
+mermaid_edge_label_regex_pattern = r'\|[^|]*\||--\s+[^->|]+?\s+(?=--)|(?<=-\.)\s*[^\s|.>-][^|]*?\s*(?=\.-)'
+
+# Matches links between nodes, e.g. `-->`, `---`, `-.->`, `==>` or `<-->`
+mermaid_link_regex_pattern = r'<?(?:-\.+-|--+|==+)[>ox]?'
+
+# First line of a flowchart, e.g. `graph TB` or `flowchart LR`
+mermaid_header_regex_pattern = r'^\s*(?:graph|flowchart)\b[^\n]*'
+
+
+def extract_node_labels(diagram_source: str) -> List[str]:
+    # Node labels in order of first appearance
+    labels = [(quoted or unquoted).strip()
+              for _, quoted, unquoted in re.findall(mermaid_node_regex_pattern, diagram_source)]
+    return list(dict.fromkeys(label for label in labels if label))
+
+
+def extract_node_definitions(diagram_source: str) -> Dict[str, str]:
+    # Map of node id to its label, the first definition of a node wins
+    definitions = {}
+    for node_id, quoted, unquoted in re.findall(mermaid_node_regex_pattern, diagram_source):
+        definitions.setdefault(node_id, (quoted or unquoted).strip() or node_id)
+    return definitions
+
+
+def extract_edges(diagram_source: str) -> List[Tuple[str, str]]:
+    """ Edges of a flowchart as (source label, target label) pairs, falling back to node ids for unlabeled nodes """
+    labels = extract_node_definitions(diagram_source)
+    body = re.sub(mermaid_header_regex_pattern, '', diagram_source, count=1)
+    edges = []
+    for statement in re.split(r'[\n;]', body):
+        # Reduce every node definition to its id, and drop edge labels, so only `id link id link id` remains
+        statement = re.sub(mermaid_node_regex_pattern, lambda match: match.group(1), statement)
+        statement = re.sub(mermaid_edge_label_regex_pattern, '', statement)
+        node_ids = [node_id.strip() for node_id in re.split(mermaid_link_regex_pattern, statement)]
+        if len(node_ids) < 2 or not all(re.fullmatch(mermaid_id_regex_pattern, node_id) for node_id in node_ids):
+            continue
+        edges += [(labels.get(source, source), labels.get(target, target))
+                  for source, target in zip(node_ids, node_ids[1:])]
+    return edges
+
+
+def normalize_label(label: str) -> str:
+    return re.sub(r'\s+', ' ', label).strip().lower()
+
+
+def normalize_diagram_source(diagram_source: str) -> str:
+    # Indentation, blank lines and repeated spaces never change the rendered diagram
+    lines = (re.sub(r'[ \t]+', ' ', line).strip() for line in html.unescape(diagram_source).splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def canonicalize_diagram(diagram_source: str) -> FrozenSet[str]:
+    """
+    Layout independent representation of a flowchart: its edges between normalized node labels plus any node that is
+    not part of an edge. Node ids, whitespace, statement order and arrow styles do not change the result.
+    """
+    edges = {f"{normalize_label(source)} -> {normalize_label(target)}" for source, target in extract_edges(diagram_source)}
+    connected = {node for edge in edges for node in edge.split(' -> ')}
+    nodes = {normalize_label(label) for label in extract_node_labels(diagram_source)} - connected
+    return frozenset(edges | nodes)
+
+
+# Header of a flowchart with an optional direction, e.g. `graph TD` or `flowchart LR`
+mermaid_flowchart_header_regex_pattern = r'^(graph|flowchart)(?:\s+(TB|TD|BT|RL|LR))?$'
+
+# First word of diagram types other than flowcharts, which are not validated
+mermaid_other_diagram_regex_pattern = (
+    r'^(?:sequenceDiagram|classDiagram|stateDiagram(?:-v2)?|erDiagram|journey|gantt|pie|quadrantChart|'
+    r'requirementDiagram|gitGraph|mindmap|timeline|sankey-beta|xychart-beta|block-beta)\b'
+)
+
+# Flowchart statements that are not node and link chains
+mermaid_directive_regex_pattern = r'^(?:%%|subgraph\b|end$|direction\s|classDef\s|class\s|style\s|linkStyle\s|click\s)'
+
+# Node id at the start of a chain element
+mermaid_node_id_regex_pattern = r'\s*(' + mermaid_id_regex_pattern + r')'
+
+# Opening and closing delimiters of the node shapes, longest first so `((` wins over `(`
+mermaid_node_shapes = [('(((', ')))'), ('([', '])'), ('[[', ']]'), ('[(', ')]'), ('((', '))'), ('{{', '}}'),
+                       ('>', ']'), ('[', ']'), ('(', ')'), ('{', '}')]
+
+# What may follow a complete node: the end of the statement, `&`, a `:::class` or the start of a link
+mermaid_node_end_regex_pattern = r'\s*(?:$|&|:::|<?[-=~]|[→—])'
+
+# A valid link with an optional `|label|`, e.g. `-->`, `---`, `-.->`, `==>`, `--o`, `<-->`, `-- label -->` or
+# `-.label.->` (dotted labels need no spaces around them)
+mermaid_chain_link_regex_pattern = (
+    r'\s*(<?(?:(?:--|==|-\.)\s+[^|]*?\s+(?:-{2,}|={2,}|\.-)[>ox]?|-\.\s*(?![\s.>-])[^|]*?\s*\.-[>ox]?|-\.+-[>ox]?'
+    r'|-{2,}[>ox]?|={2,}[>ox]?|~~~))(\|[^|]*\|)?\s*'
+)
+
+# Arrows LLMs write that mermaid rejects, each is replaced by `-->`
+mermaid_invalid_link_regex_pattern = r'\s*(-\s*>|=>|-\s+->|--\s+>|—+>|→)(\|[^|]*\|)?\s*'
+
+# Characters that end or confuse a node shape unless the label is quoted
+mermaid_label_special_characters_regex_pattern = r'[()\[\]{}|"<>;]'
+
+# Words mermaid reads as keywords, they break a chain when used as node ids
+mermaid_reserved_node_ids = {'end', 'graph', 'subgraph', 'flowchart'}
+
+
+def split_diagram_statements(diagram_source: str) -> List[str]:
+    # Statements are separated by newlines or semicolons, semicolons inside quoted labels do not count
+    statements = []
+    for line in diagram_source.splitlines():
+        statements += [statement.strip() for statement in re.split(r';(?=(?:[^"]*"[^"]*")*[^"]*$)', line)]
+    return [statement for statement in statements if statement]
+
+
+def scan_node(statement: str, position: int) -> Tuple[str, int, List[str]] | None:
+    """ Parse the node at `position`, returning it rewritten with a quoted label if needed, the end and the fixes """
+    match = re.compile(mermaid_node_id_regex_pattern).match(statement, position)
+    if match is None:
+        return None
+    node_id, position, fixes = match.group(1), match.end(), []
+    if node_id in mermaid_reserved_node_ids:
+        fixes.append(f"renamed node id '{node_id}'")
+        node_id += '_'
+    shape = next(((opening, closing) for opening, closing in mermaid_node_shapes
+                  if statement.startswith(opening, position)), None)
+    if shape is None:
+        return node_id, position, fixes
+
+    opening, closing = shape
+    start = position + len(opening)
+    quoted = re.compile(r'\s*"([^"]*)"\s*').match(statement, start)
+    if quoted and statement.startswith(closing, quoted.end()):
+        return f'{node_id}{opening}"{quoted.group(1)}"{closing}', quoted.end() + len(closing), fixes
+    # The label ends at the first closing delimiter that is followed by whatever may come after a node
+    end = statement.find(closing, start)
+    while end != -1:
+        if re.compile(mermaid_node_end_regex_pattern).match(statement, end + len(closing)):
+            label = statement[start:end].strip()
+            if re.search(mermaid_label_special_characters_regex_pattern, label):
+                fixes.append(f"quoted label '{label}'")
+                label = '"' + label.replace('"', "'") + '"'
+            return f'{node_id}{opening}{label}{closing}', end + len(closing), fixes
+        end = statement.find(closing, end + 1)
+    return None
+
+
+def scan_chain(statement: str) -> (str | None, List[str]):
+    """ Rebuild a `node link node ...` statement with quoted labels and valid arrows, None when it cannot be parsed """
+    parts, fixes, position = [], [], 0
+    while True:
+        node = scan_node(statement, position)
+        if node is None:
+            return None, fixes
+        node_text, position, node_fixes = node
+        parts.append(node_text)
+        fixes += node_fixes
+        class_match = re.compile(r':::\w+').match(statement, position)
+        if class_match:
+            parts.append(class_match.group(0))
+            position = class_match.end()
+        if not statement[position:].strip():
+            return ''.join(parts), fixes
+        join_match = re.compile(r'\s*&\s*').match(statement, position)
+        if join_match:
+            parts.append(' & ')
+            position = join_match.end()
+            continue
+        link_match = re.compile(mermaid_chain_link_regex_pattern).match(statement, position)
+        if link_match is None:
+            link_match = re.compile(mermaid_invalid_link_regex_pattern).match(statement, position)
+            if link_match is None:
+                return None, fixes
+            fixes.append(f"replaced arrow '{link_match.group(1)}'")
+            parts.append(f" -->{link_match.group(2) or ''} ")
+        else:
+            parts.append(f" {link_match.group(1)}{link_match.group(2) or ''} ")
+        position = link_match.end()
+
+
+def check_diagram(diagram_source: str) -> (str, List[str], List[str]):
+    """
+    Check a mermaid flowchart against the subset of the grammar reports use. Returns the source with every
+    deterministic fix applied, the fixes and the problems left. Other diagram types are returned unchecked.
+    """
+    # Entity escaped arrows and markdown code fences are the most common LLM mistakes
+    source = html.unescape(diagram_source)
+    source = re.sub(r'^\s*```(?:mermaid)?\s*$', '', source, flags=re.MULTILINE)
+    fixes = ["unescaped HTML entities"] if source != diagram_source else []
+    statements = split_diagram_statements(source)
+    if not statements:
+        return source, fixes, ["empty diagram"]
+    if re.match(mermaid_other_diagram_regex_pattern, statements[0]):
+        return diagram_source, [], []
+
+    header, errors = re.match(mermaid_flowchart_header_regex_pattern, statements[0], flags=re.IGNORECASE), []
+    if header:
+        normalized_header = ' '.join(part for part in [header.group(1).lower(), (header.group(2) or '').upper()] if part)
+        if normalized_header != statements[0]:
+            fixes.append(f"normalized header '{statements[0]}'")
+            statements[0] = normalized_header
+    else:
+        fixes.append("added missing 'graph TD' header")
+        statements.insert(0, 'graph TD')
+
+    lines = [statements[0]]
+    for statement in statements[1:]:
+        if re.match(mermaid_directive_regex_pattern, statement):
+            lines.append(statement)
+            continue
+        chain, chain_fixes = scan_chain(statement)
+        if chain is None:
+            errors.append(f"cannot parse statement `{statement}`")
+            lines.append(statement)
+            continue
+        fixes += chain_fixes
+        # Statements that needed no fix keep their original formatting
+        lines.append(chain if chain_fixes else statement)
+    return ('\n'.join(lines) if fixes else diagram_source), fixes, errors
+
+
+def validate_diagram(diagram_source: str) -> List[str]:
+    """ Problems of a mermaid flowchart, fixable or not. Empty when mermaid will parse it as is """
+    _, fixes, errors = check_diagram(diagram_source)
+    return fixes + errors
+
+
+def fix_diagram(diagram_source: str) -> (str, List[str]):
+    """ Apply every deterministic fix to a mermaid flowchart, returning it and the problems that are left """
+    source, _, errors = check_diagram(diagram_source)
+    return source, errors
+
+
+__all__ = ['extract_node_labels', 'extract_node_definitions', 'extract_edges', 'canonicalize_diagram',
+           'normalize_diagram_source', 'validate_diagram', 'fix_diagram', 'check_diagram']
@@ -0,0 +1,110 @@
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+from report_ai.components.budget import ChargeTo
+from report_ai.components.tracing import span
+
+
+class Stage:
+    def __init__(self, name: str, func: Callable[..., Awaitable[Any]], inputs: Sequence[str] = ()):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+
+
+class Pipeline:
+    """
+    Minimal dependency-graph scheduler. Every stage declares the names of the stages (or initial values) it consumes
+    and is started as soon as all of them are available, so independent stages overlap.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+        self.timeline: List[Dict[str, Any]] = []
+
+    def add_stage(self, name: str, func: Callable[..., Awaitable[Any]], inputs: Sequence[str] = ()) -> 'Pipeline':
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already defined")
+        self.stages[name] = Stage(name, func, inputs)
+        return self
+
+    def _topological_order(self, initial: Dict[str, Any]) -> List[Stage]:
+        order, visiting, visited = [], set(), set()
+
+        def visit(name: str):
+            if name in visited or name in initial:
+                return
+            if name not in self.stages:
+                raise ValueError(f"Unknown pipeline input '{name}'")
+            if name in visiting:
+                raise ValueError(f"Pipeline has a cycle through stage '{name}'")
+            visiting.add(name)
+            for dependency in self.stages[name].inputs:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+            order.append(self.stages[name])
+
+        for stage_name in self.stages:
+            visit(stage_name)
+        return order
+
+    async def run(self, **initial: Any) -> Dict[str, Any]:
+        """ Run every stage once its inputs are ready and return the outputs keyed by stage name """
+        self.timeline = []
+        pipeline_start = time.perf_counter()
+        tasks: Dict[str, asyncio.Future] = {}
+        for name, value in initial.items():
+            tasks[name] = asyncio.get_running_loop().create_future()
+            tasks[name].set_result(value)
+
+        async def run_stage(stage: Stage):
+            inputs = {dependency: await tasks[dependency] for dependency in stage.inputs}
+            start = time.perf_counter()
+            # LLM calls made by the stage are traced and accounted under its name
+            with span(stage.name), ChargeTo(stage.name):
+                result = await stage.func(**inputs)
+            end = time.perf_counter()
+            self.timeline.append({
+                "stage": stage.name,
+                "inputs": stage.inputs,
+                "start": round(start - pipeline_start, 4),
+                "end": round(end - pipeline_start, 4),
+                "duration": round(end - start, 4)
+            })
+            return result
+
+        # Stages are created in topological order so every dependency already has a task to await
+        for stage in self._topological_order(initial):
+            tasks[stage.name] = asyncio.ensure_future(run_stage(stage))
+
+        try:
+            await asyncio.gather(*(tasks[name] for name in self.stages))
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        self.timeline.sort(key=lambda entry: entry["start"])
+        return {name: tasks[name].result() for name in self.stages}
+
+    def critical_path(self) -> List[str]:
+        """ Chain of stages that determined the end-to-end latency of the last run """
+        timings = {entry["stage"]: entry for entry in self.timeline}
+        if not timings:
+            return []
+
+        def finished_last(entry: Dict[str, Any]) -> (float, float):
+            # Timings are rounded, of stages ending at the same time the one started last depends on the other
+            return entry["end"], entry["start"]
+
+        path = [max(timings.values(), key=finished_last)["stage"]]
+        while True:
+            dependencies = [timings[name] for name in timings[path[-1]]["inputs"] if name in timings]
+            if not dependencies:
+                break
+            path.append(max(dependencies, key=finished_last)["stage"])
+        return path[::-1]
+
+
+__all__ = ['Stage', 'Pipeline']
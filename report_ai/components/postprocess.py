@@ -0,0 +1,301 @@
+import re
+import html
+import asyncio
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+from typing import Dict, Iterator, List
+
+from report_ai.common.utils import configs
+from report_ai.components.tracing import span
+
+logger = configs.logger
+
+# Text inside these elements is never part of the extracted text
+NON_TEXT_TAGS = {'script', 'style'}
+
+
+class BeautifulSoupBackend:
+    """ Pure Python fallback, always available since BeautifulSoup is a dependency of the package """
+    name = 'bs4'
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        from bs4.element import PreformattedString
+        self.BeautifulSoup, self.PreformattedString = BeautifulSoup, PreformattedString
+
+    def parse(self, html_content: str):
+        soup = self.BeautifulSoup(html_content, 'html.parser')
+        # Fall back to the whole document when the LLM left out the <body> tag (e.g. when re-processing body content)
+        return soup.body or soup
+
+    def parse_document(self, html_content: str):
+        return self.BeautifulSoup(html_content, 'html.parser')
+
+    @staticmethod
+    def serialize(document) -> str:
+        return str(document)
+
+    @staticmethod
+    def inner_html(body) -> str:
+        return ''.join(map(str, body.contents))
+
+    def set_inner_html(self, node, html_content: str):
+        node.clear()
+        node.append(self.BeautifulSoup(html_content, 'html.parser'))
+
+    @staticmethod
+    def set_attribute(node, name: str, value: str):
+        node[name] = value
+
+    def iter_texts(self, node) -> Iterator[str]:
+        for string in node.find_all(string=True):
+            # Comments, doctypes and similar are skipped like in `get_text`
+            if not isinstance(string, self.PreformattedString) and string.parent.name not in NON_TEXT_TAGS:
+                yield str(string)
+
+    @staticmethod
+    def select(node, tags: List[str]) -> List:
+        return node.find_all(tags)
+
+    @staticmethod
+    def select_class(node, class_name: str) -> List:
+        return node.select(f'.{class_name}')
+
+    @staticmethod
+    def remove(node):
+        node.decompose()
+
+
+class LxmlBackend:
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        from lxml.etree import ParserError
+        self.lxml_html, self.ParserError = lxml.html, ParserError
+
+    def parse(self, html_content: str):
+        try:
+            return self.lxml_html.document_fromstring(html_content).body
+        except self.ParserError:
+            # lxml rejects documents without any content
+            return self.lxml_html.document_fromstring('<body></body>').body
+
+    def parse_document(self, html_content: str):
+        try:
+            return self.lxml_html.document_fromstring(html_content)
+        except self.ParserError:
+            return self.lxml_html.document_fromstring('<body></body>')
+
+    def serialize(self, document) -> str:
+        # Serializing the tree keeps the doctype
+        return self.lxml_html.tostring(document.getroottree(), encoding='unicode')
+
+    def inner_html(self, body) -> str:
+        return html.escape(body.text or '', quote=False) + ''.join(
+            self.lxml_html.tostring(child, encoding='unicode') for child in body
+        )
+
+    def set_inner_html(self, node, html_content: str):
+        # `clear` would drop the attributes and the text following the element too
+        for child in list(node):
+            node.remove(child)
+        fragments = self.lxml_html.fragments_fromstring(html_content)
+        node.text = fragments.pop(0) if fragments and isinstance(fragments[0], str) else None
+        node.extend(fragments)
+
+    @staticmethod
+    def set_attribute(node, name: str, value: str):
+        node.set(name, value)
+
+    def iter_texts(self, node) -> Iterator[str]:
+        # Comments have a non string tag, their text is skipped but the text following them is not
+        if isinstance(node.tag, str) and node.tag not in NON_TEXT_TAGS:
+            if node.text:
+                yield node.text
+            for child in node:
+                yield from self.iter_texts(child)
+                if child.tail:
+                    yield child.tail
+
+    @staticmethod
+    def select(node, tags: List[str]) -> List:
+        return list(node.iter(*tags))
+
+    @staticmethod
+    def select_class(node, class_name: str) -> List:
+        return node.find_class(class_name)
+
+    @staticmethod
+    def remove(node):
+        # Keeps the text following the element
+        node.drop_tree()
+
+
+class SelectolaxBackend:
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self.LexborHTMLParser = LexborHTMLParser
+
+    def parse(self, html_content: str):
+        return self.LexborHTMLParser(html_content).body
+
+    def parse_document(self, html_content: str):
+        return self.LexborHTMLParser(html_content)
+
+    @staticmethod
+    def serialize(document) -> str:
+        return document.html or ''
+
+    @staticmethod
+    def inner_html(body) -> str:
+        match = re.fullmatch(r'<body[^>]*>(.*)</body>', body.html or '', flags=re.DOTALL)
+        return match.group(1) if match else ''
+
+    def set_inner_html(self, node, html_content: str):
+        for child in list(node.iter(include_text=True)):
+            child.decompose()
+        for child in self.parse(f'<body>{html_content}</body>').iter(include_text=True):
+            node.insert_child(child)
+
+    @staticmethod
+    def set_attribute(node, name: str, value: str):
+        node.attrs[name] = value
+
+    @staticmethod
+    def iter_texts(node) -> Iterator[str]:
+        for child in node.traverse(include_text=True):
+            if child.tag == '-text' and child.parent.tag not in NON_TEXT_TAGS:
+                yield child.text_content
+
+    @staticmethod
+    def select(node, tags: List[str]) -> List:
+        return node.css(', '.join(tags))
+
+    @staticmethod
+    def select_class(node, class_name: str) -> List:
+        return node.css(f'.{class_name}')
+
+    @staticmethod
+    def remove(node):
+        node.decompose()
+
+
+# Backends in order of preference for `postprocess.parser: auto`
+BACKENDS = {backend.name: backend for backend in [SelectolaxBackend, LxmlBackend, BeautifulSoupBackend]}
+
+
+@lru_cache(maxsize=None)
+def get_backend(name: str | None = None):
+    """ The configured HTML parser backend, `auto` picking the fastest one installed """
+    name = name or configs.postprocess.parser
+    for backend in (BACKENDS.values() if name == 'auto' else [BACKENDS[name]]):
+        try:
+            return backend()
+        except ImportError:
+            logger.debug(f"HTML parser backend '{backend.name}' is not installed")
+    raise ImportError(f"HTML parser backend '{name}' is not installed")
+
+
+def get_text(backend, node, separator: str = '', strip: bool = False) -> str:
+    # Same semantics as BeautifulSoup's `get_text`
+    texts = backend.iter_texts(node)
+    if strip:
+        texts = (text.strip() for text in texts)
+        texts = (text for text in texts if text)
+    return separator.join(texts)
+
+
+class ParsedSection:
+    """
+    Everything the pipeline needs from an LLM generated HTML section, extracted from a single parse: the body HTML and
+    text, headings, tables, mermaid diagram sources, claims (paragraph and list item texts) and the prose without
+    tables and diagrams.
+    """
+
+    def __init__(self, html_content: str, backend=None):
+        backend = backend or get_backend()
+        body = backend.parse(html_content)
+        self.html = backend.inner_html(body)
+        self.text = get_text(backend, body, '\n', strip=True)
+        headings = backend.select(body, ['h2'])
+        self.heading = get_text(backend, headings[0], strip=True) if headings else ''
+        self.sub_headings = [get_text(backend, sub_heading, strip=True) for sub_heading in backend.select(body, ['h3'])]
+
+        diagrams = backend.select_class(body, 'mermaid')
+        self.diagrams = [get_text(backend, diagram) for diagram in diagrams]
+        # Remove the diagrams so their source code does not end up in the claims and the prose. Nested elements come
+        # after their parents in document order, so removing in reverse never touches an already removed element
+        for diagram in reversed(diagrams):
+            backend.remove(diagram)
+
+        tables = backend.select(body, ['table'])
+        self.tables: List[Dict] = []
+        for table in tables:
+            captions = backend.select(table, ['caption'])
+            self.tables.append({
+                "caption": get_text(backend, captions[0], strip=True) if captions else '',
+                "header": [get_text(backend, cell, strip=True) for cell in backend.select(table, ['th'])],
+                "rows": [[get_text(backend, cell, ' ', strip=True) for cell in backend.select(row, ['td', 'th'])]
+                         for row in backend.select(table, ['tr'])]
+            })
+        self.claims = [claim for claim in (get_text(backend, element, ' ', strip=True)
+                                           for element in backend.select(body, ['p', 'li'])) if claim]
+        for table in reversed(tables):
+            backend.remove(table)
+        self.prose = get_text(backend, body, '\n', strip=True)
+
+
+class ParseCache:
+    """ Parsed sections by their HTML, shared by every consumer so each LLM output is parsed only once """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.sections: OrderedDict[str, ParsedSection] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits, self.misses = 0, 0
+
+    def get(self, html_content: str) -> ParsedSection | None:
+        with self.lock:
+            parsed = self.sections.get(html_content)
+            if parsed is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.sections.move_to_end(html_content)
+            return parsed
+
+    def set(self, html_content: str, parsed: ParsedSection):
+        with self.lock:
+            # The extracted body HTML parses to the same section, callers often pass it back in
+            for key in {html_content, parsed.html}:
+                self.sections[key] = parsed
+                self.sections.move_to_end(key)
+            while len(self.sections) > self.max_size:
+                self.sections.popitem(last=False)
+
+
+parse_cache = ParseCache(configs.postprocess.cache_size)
+
+
+def parse_section(html_content: str) -> ParsedSection:
+    """ Parse an LLM generated section, reusing an earlier parse of the same HTML. The result must not be modified """
+    parsed = parse_cache.get(html_content)
+    if parsed is None:
+        with span("parse_section", kind='parse', characters=len(html_content)):
+            parsed = ParsedSection(html_content)
+        parse_cache.set(html_content, parsed)
+    return parsed
+
+
+async def parse_section_async(html_content: str) -> ParsedSection:
+    # Large sections are parsed in a worker thread, so they do not stall other reports on the event loop
+    if len(html_content) >= configs.postprocess.thread_threshold:
+        return await asyncio.to_thread(parse_section, html_content)
+    return parse_section(html_content)
+
+
+__all__ = ['ParsedSection', 'parse_section', 'parse_section_async', 'get_backend', 'get_text', 'parse_cache']
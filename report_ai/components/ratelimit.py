@@ -0,0 +1,117 @@
+import os
+import time
+import asyncio
+from typing import Dict, Tuple
+
+from report_ai.common.utils import configs
+
+logger = configs.logger
+
+
+class TokenBucket:
+    """ Bucket refilled continuously at `capacity` units per minute. A capacity of 0 means unlimited """
+
+    def __init__(self, capacity: float):
+        self.capacity = capacity
+        self.available = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        if not self.capacity:
+            return 0.0
+        # Requests larger than the whole bucket only wait for a full bucket instead of forever
+        missing = min(amount, self.capacity) - self.available
+        return max(missing, 0) * 60 / self.capacity
+
+    def consume(self, amount: float):
+        # May go negative when a call used more than estimated, later callers then wait for the debt to refill
+        if self.capacity:
+            self.available -= amount
+
+
+class RateLimiter:
+    """
+    Async requests-per-minute and tokens-per-minute limiter. Callers queue in arrival order on a lock held while the
+    head of the queue waits for capacity, so nobody fails and nobody is starved.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.queue_depth = 0
+        self.calls = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Locks belong to one event loop, e.g. one `asyncio.run` per report, while the buckets live for the process
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        return self._lock
+
+    async def acquire(self, estimated_tokens: int) -> float:
+        """ Wait until a call with `estimated_tokens` fits into both limits and return the seconds waited """
+        start = time.monotonic()
+        self.queue_depth += 1
+        try:
+            async with self._get_lock():
+                while True:
+                    now = time.monotonic()
+                    self.requests.refill(now)
+                    self.tokens.refill(now)
+                    wait = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(wait)
+                self.requests.consume(1)
+                self.tokens.consume(estimated_tokens)
+        finally:
+            self.queue_depth -= 1
+        waited = time.monotonic() - start
+        self.calls += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def settle(self, estimated_tokens: int, actual_tokens: int | None):
+        """ Correct the token bucket with the usage reported by the provider once the call finished """
+        if actual_tokens is not None:
+            self.tokens.consume(actual_tokens - estimated_tokens)
+
+    def stats(self) -> Dict[str, float]:
+        return {"queue_depth": self.queue_depth, "calls": self.calls, "total_wait": round(self.total_wait, 4),
+                "average_wait": round(self.total_wait / self.calls, 4) if self.calls else 0.0,
+                "max_wait": round(self.max_wait, 4)}
+
+
+rate_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+
+
+def get_rate_limit(provider: str, model: str) -> (float, float):
+    limits = configs.rate_limits
+    entry = limits.get(f"{provider}/{model}") or limits.get(provider) or limits.default
+    requests_per_minute = os.getenv(f"RATE_LIMIT_{provider.upper()}_RPM", entry.requests_per_minute)
+    tokens_per_minute = os.getenv(f"RATE_LIMIT_{provider.upper()}_TPM", entry.tokens_per_minute)
+    return float(requests_per_minute), float(tokens_per_minute)
+
+
+def get_rate_limiter(provider: str, model: str) -> RateLimiter:
+    """ Process-wide limiter shared by every report calling `model` of `provider` """
+    key = (provider, model)
+    if key not in rate_limiters:
+        rate_limiters[key] = RateLimiter(*get_rate_limit(provider, model))
+    return rate_limiters[key]
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, float]]:
+    return {f"{provider}/{model}": limiter.stats() for (provider, model), limiter in rate_limiters.items()}
+
+
+__all__ = ['TokenBucket', 'RateLimiter', 'get_rate_limiter', 'rate_limiter_stats']
@@ -0,0 +1,151 @@
+import atexit
+import asyncio
+from typing import List
+from contextlib import asynccontextmanager
+from pyppeteer import launch
+from pyppeteer.page import Page
+from pyppeteer.browser import Browser
+
+from report_ai.common.utils import configs
+from report_ai.common.utils.helpers import Singleton
+from report_ai.components.functions import get_module_path
+
+logger = configs.logger
+
+
+class PdfRenderer(metaclass=Singleton):
+    """
+    Long-lived headless Chromium shared by every report rendered in the process. Pages are kept in a bounded pool and
+    reused across renders, the browser is relaunched when it crashes and recycled after `max_renders` renders.
+
+    The browser belongs to the event loop it was launched on and is relaunched when pages are borrowed on another
+    loop. The synchronous entry points therefore share one background loop, async callers should keep theirs.
+    """
+
+    def __init__(self, pool_size: int | None = None, max_renders: int | None = None,
+                 health_check_timeout: float | None = None):
+        self.pool_size = pool_size or configs.renderer.pool_size
+        self.max_renders = max_renders or configs.renderer.max_renders
+        self.health_check_timeout = health_check_timeout or configs.renderer.health_check_timeout
+        self._browser: Browser | None = None
+        self._idle_pages: List[Page] = []
+        self._in_use = 0
+        self._renders = 0
+        self._draining = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._condition: asyncio.Condition | None = None
+        self._launch_lock: asyncio.Lock | None = None
+        # Chromium is stopped here at exit rather than by pyppeteer, whose handler needs the browser's loop to be idle
+        atexit.register(self._terminate_browser)
+
+    def _terminate_browser(self):
+        if self._browser is not None and self._browser.process is not None:
+            self._browser.process.terminate()
+        self._browser, self._idle_pages = None, []
+
+    def _bind_to_running_loop(self):
+        # The browser connection and asyncio primitives belong to one event loop, e.g. one `asyncio.run` per report
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        if self._browser is not None:
+            logger.info("PDF renderer used on a new event loop, relaunching its browser")
+        self._terminate_browser()
+        self._in_use, self._renders, self._draining = 0, 0, False
+        self._loop = loop
+        self._condition = asyncio.Condition()
+        self._launch_lock = asyncio.Lock()
+
+    def _browser_alive(self) -> bool:
+        return (self._browser is not None and self._browser.process is not None
+                and self._browser.process.poll() is None)
+
+    async def _ensure_browser(self) -> Browser:
+        async with self._launch_lock:
+            if not self._browser_alive():
+                if self._browser is not None:
+                    logger.warning("Chromium is not running anymore, relaunching the PDF renderer browser")
+                self._idle_pages = []
+                self._browser = await launch(
+                    executablePath=get_module_path("chromium"),
+                    headless=True,
+                    args=['--no-sandbox'],
+                    handleSIGINT=False,
+                    handleSIGTERM=False,
+                    handleSIGHUP=False,
+                    autoClose=False
+                )
+            return self._browser
+
+    async def _page_healthy(self, page: Page) -> bool:
+        if page.isClosed():
+            return False
+        try:
+            return await asyncio.wait_for(page.evaluate('() => true'), self.health_check_timeout)
+        except Exception:
+            return False
+
+    async def _acquire_page(self) -> Page:
+        browser = await self._ensure_browser()
+        while self._idle_pages:
+            page = self._idle_pages.pop()
+            if await self._page_healthy(page):
+                return page
+            await self._close_page(page)
+        return await browser.newPage()
+
+    @staticmethod
+    async def _close_page(page: Page):
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    async def _close_browser(self):
+        browser, self._browser, self._idle_pages = self._browser, None, []
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                logger.exception("Failed to close the PDF renderer browser")
+
+    @asynccontextmanager
+    async def page(self):
+        """ Borrow a page from the pool, waiting while all `pool_size` pages are busy """
+        self._bind_to_running_loop()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_use < self.pool_size and not self._draining)
+            self._in_use += 1
+
+        page, healthy = None, False
+        try:
+            page = await self._acquire_page()
+            yield page
+            healthy = True
+        finally:
+            self._renders += 1
+            if page is not None and healthy and self._browser_alive() and self._renders < self.max_renders:
+                self._idle_pages.append(page)
+            elif page is not None:
+                await self._close_page(page)
+
+            async with self._condition:
+                self._in_use -= 1
+                if self._renders >= self.max_renders:
+                    # Stop handing out pages and relaunch the browser once every borrowed page is back
+                    self._draining = True
+                if self._draining and self._in_use == 0:
+                    logger.info(f"Recycling the PDF renderer browser after {self._renders} renders")
+                    await self._close_browser()
+                    self._renders, self._draining = 0, False
+                self._condition.notify_all()
+
+    async def close(self):
+        """ Close the shared browser, e.g. when shutting down a worker """
+        if self._loop is asyncio.get_running_loop():
+            await self._close_browser()
+        else:
+            self._terminate_browser()
+
+
+__all__ = ['PdfRenderer']
@@ -0,0 +1,74 @@
+import re
+import asyncio
+from typing import List
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from report_ai.common.utils import configs
+from report_ai.components.llms import invoke_llm
+from report_ai.components.budget import ChargeTo
+from report_ai.components.mermaid import check_diagram
+
+logger = configs.logger
+
+REPAIR_SYSTEM_PROMPT = (
+    "You fix syntax errors in mermaid flowcharts. You will be given a flowchart and the errors a parser found in it. "
+    "Return the corrected flowchart only, without code fences or any explanation. Keep every node, label and link of "
+    "the original, only change what is needed for mermaid to parse it:\n"
+    "- Start with a `graph` or `flowchart` header followed by a direction (TB, TD, BT, RL or LR).\n"
+    "- Wrap every node label in double quotes, e.g. A[\"Label (with parentheses)\"], and never use double quotes "
+    "inside a label.\n"
+    "- Only use valid links such as `-->`, `---`, `-.->`, `==>` or `-->|label|`."
+)
+
+# Matches an element with the `mermaid` class, capturing its opening tag, its source and its closing tag
+mermaid_block_regex_pattern = (
+    r'(<(pre|div)\b[^>]*\bclass\s*=\s*["\'][^"\']*\bmermaid\b[^"\']*["\'][^>]*>)(.*?)(</\2\s*>)'
+)
+
+
+async def repair_diagram(diagram_source: str, errors: List[str], llm: BaseChatModel | None = None) -> str | None:
+    """ Ask the LLM to fix a single diagram, returning it when the repaired version passes the local check """
+    messages = [
+        SystemMessage(content=REPAIR_SYSTEM_PROMPT),
+        HumanMessage(content=f"Flowchart:\n{diagram_source}\n\nErrors:\n" + '\n'.join(errors))
+    ]
+    with ChargeTo("repair_diagrams"):
+        response = await invoke_llm(messages, llm=llm)
+    repaired, _, remaining_errors = check_diagram(response.content)
+    return None if remaining_errors else repaired
+
+
+async def repair_diagrams(html_content: str, llm: BaseChatModel | None = None) -> str:
+    """
+    Validate every mermaid diagram of LLM generated HTML, fixing common syntax errors locally. Only diagrams that are
+    still broken afterwards are sent to the LLM, one small repair call each, instead of regenerating the whole section.
+    """
+    blocks = list(re.finditer(mermaid_block_regex_pattern, html_content, flags=re.DOTALL | re.IGNORECASE))
+    checked = [check_diagram(block.group(3)) for block in blocks]
+
+    async def repair(idx: int) -> str:
+        source, _, errors = checked[idx]
+        if not errors:
+            return source
+        repaired = await repair_diagram(source, errors, llm)
+        if repaired is None:
+            # The diagram is kept as it is, mermaid shows its error box instead of failing the section
+            logger.warning(f"Failed to repair mermaid diagram ({'; '.join(errors)}):\n{source}")
+            return source
+        return repaired
+
+    sources = await asyncio.gather(*(repair(idx) for idx in range(len(blocks))))
+    fixed = sum(1 for _, fixes, errors in checked if fixes and not errors)
+    repaired = sum(1 for _, _, errors in checked if errors)
+    if fixed or repaired:
+        logger.info(f"Mermaid diagrams: {fixed} of {len(blocks)} fixed locally, {repaired} sent for repair")
+
+    # Rebuild the HTML from the end, so earlier block offsets stay valid
+    for block, source in reversed(list(zip(blocks, sources))):
+        if source != block.group(3):
+            html_content = html_content[:block.start(3)] + f"\n{source.strip()}\n" + html_content[block.end(3):]
+    return html_content
+
+
+__all__ = ['repair_diagram', 'repair_diagrams']
@@ -0,0 +1,164 @@
+import time
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Dict, Tuple, TypeVar
+
+from report_ai.common.utils import configs
+from report_ai.components.tracing import current_span
+
+logger = configs.logger
+
+T = TypeVar('T')
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class LatencyTracker:
+    """ Latencies of the recent calls to one model, the percentile of which decides when a slow call gets hedged """
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record(self, latency: float):
+        self.latencies.append(latency)
+
+    def percentile(self, percentile: float, min_samples: int) -> float | None:
+        # No estimate until enough calls were seen, a cold model is never hedged on a guess
+        if len(self.latencies) < max(min_samples, 1):
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+    def stats(self) -> Dict[str, float]:
+        return {"samples": len(self.latencies), "hedges": self.hedges, "hedge_wins": self.hedge_wins,
+                "p50": round(self.percentile(50, 1) or 0.0, 4), "p95": round(self.percentile(95, 1) or 0.0, 4)}
+
+
+class CircuitBreaker:
+    """
+    Consecutive failures of one provider. After `failure_threshold` of them the circuit opens and calls go to the
+    failover provider. Once `cooldown` seconds passed, a single trial call is let through (half-open): its success
+    closes the circuit, its failure opens it for another cooldown.
+    """
+
+    def __init__(self, provider: str, failure_threshold: int, cooldown: float):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        return 'half_open' if self.trial_in_flight or self.cooldown_elapsed() else 'open'
+
+    def cooldown_elapsed(self) -> bool:
+        return time.monotonic() - self.opened_at >= self.cooldown
+
+    def allow(self) -> bool:
+        """ Whether a call may be sent to the provider, taking the trial slot when the circuit is half-open """
+        if self.opened_at is None:
+            return True
+        if self.trial_in_flight or not self.cooldown_elapsed():
+            return False
+        self.trial_in_flight = True
+        return True
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info(f"Circuit of {self.provider} closed")
+        self.failures, self.opened_at, self.trial_in_flight = 0, None, False
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                self.times_opened += 1
+                logger.warning(f"Circuit of {self.provider} opened after {self.failures} consecutive failures")
+            self.opened_at = time.monotonic()
+
+    def release(self):
+        # A cancelled call says nothing about the provider, it only gives back the trial slot it may hold
+        self.trial_in_flight = False
+
+    def stats(self) -> Dict[str, float | str]:
+        return {"state": self.state, "failures": self.failures, "times_opened": self.times_opened}
+
+
+latency_trackers: Dict[Tuple[str, str], LatencyTracker] = {}
+
+circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_latency_tracker(provider: str, model: str) -> LatencyTracker:
+    key = (provider, model)
+    if key not in latency_trackers:
+        latency_trackers[key] = LatencyTracker(configs.resilience.hedging.window)
+    return latency_trackers[key]
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """ Process-wide breaker shared by every report calling `provider` """
+    if provider not in circuit_breakers:
+        settings = configs.resilience.circuit_breaker
+        circuit_breakers[provider] = CircuitBreaker(provider, settings.failure_threshold, settings.cooldown)
+    return circuit_breakers[provider]
+
+
+def hedge_delay(tracker: LatencyTracker) -> float | None:
+    """ Seconds after which a call still running gets a duplicate, None when hedging is off or the model is cold """
+    settings = configs.resilience.hedging
+    if not settings.enabled:
+        return None
+    return tracker.percentile(settings.percentile, settings.min_samples)
+
+
+async def hedged(call: Callable[[], Awaitable[T]], hedge_call: Callable[[], Awaitable[T]], delay: float | None,
+                 tracker: LatencyTracker) -> T:
+    """
+    Run `call` and, when it has not finished after `delay` seconds, `hedge_call` next to it. The first successful
+    result wins and the other call is cancelled, the call fails only when both do.
+    """
+    primary = asyncio.ensure_future(call())
+    pending = {primary}
+    try:
+        if delay is not None:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+            tracker.hedges += 1
+            current_span().set(hedged=True)
+            pending.add(asyncio.ensure_future(hedge_call()))
+        failed = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not primary:
+                        tracker.hedge_wins += 1
+                        current_span().set(hedge_won=True)
+                    return task.result()
+                failed = failed or task
+        return failed.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def resilience_stats() -> Dict[str, Dict]:
+    return {"circuits": {provider: breaker.stats() for provider, breaker in circuit_breakers.items()},
+            "latencies": {f"{provider}/{model}": tracker.stats()
+                          for (provider, model), tracker in latency_trackers.items()}}
+
+
+__all__ = ['CircuitOpenError', 'LatencyTracker', 'CircuitBreaker', 'get_latency_tracker', 'get_circuit_breaker',
+           'hedge_delay', 'hedged', 'resilience_stats']
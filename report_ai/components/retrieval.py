@@ -0,0 +1,93 @@
+import re
+import math
+from typing import List, Tuple
+from collections import Counter
+
+from report_ai.components.tokens import estimate_tokens
+
+# Separator `serialize_conversation` puts after every AI message
+MESSAGE_SEPARATOR = "-" * 60
+
+# BM25 term frequency saturation and document length normalization parameters
+BM25_K1, BM25_B = 1.5, 0.75
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is", "it", "of", "on", "or", "that",
+    "the", "this", "to", "was", "what", "which", "with", "ai", "user"
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in re.findall(r'\w+', text.lower()) if word not in STOPWORDS]
+
+
+def split_into_chunks(serialized_conversation: str, chunk_tokens: int) -> List[str]:
+    """ Split every exchange into paragraph groups of roughly `chunk_tokens`, each prefixed with the user message """
+    chunks = []
+    for exchange in serialized_conversation.split(MESSAGE_SEPARATOR):
+        exchange = exchange.strip()
+        if not exchange:
+            continue
+        question, separator, answer = exchange.partition("\nAI: ")
+        header = question + separator
+        group, group_tokens = [], estimate_tokens(header)
+        for paragraph in re.split(r'\n\s*\n', answer):
+            paragraph_tokens = estimate_tokens(paragraph)
+            if group and group_tokens + paragraph_tokens > chunk_tokens:
+                chunks.append(header + '\n\n'.join(group))
+                group, group_tokens = [], estimate_tokens(header)
+            group.append(paragraph)
+            group_tokens += paragraph_tokens
+        chunks.append(header + '\n\n'.join(group))
+    return chunks
+
+
+class ConversationIndex:
+    """ BM25 index over conversation chunks, built once per report and queried for every section """
+
+    def __init__(self, chunks: List[str]):
+        self.chunks = chunks
+        self.chunk_tokens = [estimate_tokens(chunk) for chunk in chunks]
+        self.term_frequencies = [Counter(tokenize(chunk)) for chunk in chunks]
+        self.lengths = [sum(frequencies.values()) for frequencies in self.term_frequencies]
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0
+        document_frequencies = Counter(term for frequencies in self.term_frequencies for term in frequencies)
+        self.idf = {
+            term: math.log(1 + (len(chunks) - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequencies.items()
+        }
+
+    @classmethod
+    def from_serialized_conversation(cls, serialized_conversation: str, chunk_tokens: int) -> 'ConversationIndex':
+        return cls(split_into_chunks(serialized_conversation, chunk_tokens))
+
+    def search(self, query: str) -> List[Tuple[int, float]]:
+        """ Chunk indexes with a positive BM25 score for `query`, best first """
+        scores = []
+        query_terms = set(tokenize(query))
+        for idx, frequencies in enumerate(self.term_frequencies):
+            score = 0.0
+            for term in query_terms & frequencies.keys():
+                frequency = frequencies[term]
+                length_norm = 1 - BM25_B + BM25_B * self.lengths[idx] / (self.average_length or 1)
+                score += self.idf[term] * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * length_norm)
+            if score > 0:
+                scores.append((idx, score))
+        return sorted(scores, key=lambda item: item[1], reverse=True)
+
+    def select(self, query: str, token_budget: int) -> List[int]:
+        """ Indexes of the most relevant chunks that fit into `token_budget`, in conversation order """
+        selected, used = [], 0
+        for idx, _ in self.search(query):
+            if used + self.chunk_tokens[idx] > token_budget:
+                continue
+            selected.append(idx)
+            used += self.chunk_tokens[idx]
+        return sorted(selected)
+
+    def retrieve(self, query: str, token_budget: int) -> str:
+        """ Most relevant chunks that fit into `token_budget`, in conversation order. Empty when nothing matches """
+        return f"\n\n{MESSAGE_SEPARATOR}\n".join(self.chunks[idx] for idx in self.select(query, token_budget))
+
+
+__all__ = ['ConversationIndex', 'split_into_chunks']
@@ -0,0 +1,130 @@
+import re
+import hashlib
+from typing import Dict, List
+from collections import defaultdict
+
+from report_ai.components.mermaid import extract_edges
+from report_ai.components.postprocess import parse_section
+
+# Number of hash functions in a MinHash signature and number of LSH bands they are split into
+NUM_PERMUTATIONS, NUM_BANDS = 64, 16
+
+# Number of consecutive words in a shingle
+SHINGLE_SIZE = 3
+
+# Units shorter than this many words carry too little content to be compared reliably
+MIN_UNIT_WORDS = 4
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def extract_units(section_html: str) -> List[str]:
+    """ Split a section into comparable units: sentences, table rows and mermaid edges """
+    section = parse_section(section_html)
+    units = [f"{source} -> {target}" for diagram in section.diagrams for source, target in extract_edges(diagram)]
+    units += [' | '.join(row) for table in section.tables for row in table["rows"]]
+    units += [sentence for sentence in re.split(r'(?<=[.!?])\s+|\n', section.prose) if sentence.strip()]
+    return units
+
+
+def shingle_unit(unit: str) -> set:
+    words = re.findall(r'\w+', unit.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+class MinHasher:
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, seed: int = 1):
+        # Fixed coefficients of the universal hash functions `(a * x + b) mod p`, identical in every process. Each
+        # function gets its own digest, so all of them (and all LSH bands) are independent
+        self.permutations = []
+        for i in range(num_permutations):
+            digest = hashlib.sha256(f"{seed}:{i}".encode()).digest()
+            self.permutations.append((int.from_bytes(digest[:8], 'big') % (MERSENNE_PRIME - 1) + 1,
+                                      int.from_bytes(digest[8:16], 'big') % MERSENNE_PRIME))
+
+    def signature(self, shingles: set) -> tuple:
+        hashes = [int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'big') for shingle in shingles]
+        return tuple(
+            min(((a * value + b) % MERSENNE_PRIME) & MAX_HASH for value in hashes)
+            for a, b in self.permutations
+        )
+
+
+def estimate_similarity(signature: tuple, other_signature: tuple) -> float:
+    return sum(a == b for a, b in zip(signature, other_signature)) / len(signature)
+
+
+class OverlapDetector:
+    """
+    Local near-duplicate detector over the sections generated so far. Units of every accepted section are MinHashed
+    and bucketed with LSH, so checking a new section only compares it against likely matches.
+    """
+
+    def __init__(self, unit_threshold: float = 0.5, num_permutations: int = NUM_PERMUTATIONS,
+                 num_bands: int = NUM_BANDS):
+        self.unit_threshold = unit_threshold
+        self.hasher = MinHasher(num_permutations)
+        self.rows_per_band = num_permutations // num_bands
+        self.num_bands = num_bands
+        self.units: List[str] = []
+        self.signatures: List[tuple] = []
+        self.buckets: Dict[tuple, List[int]] = defaultdict(list)
+        # Dedup gate decision per section index, a retried section counts once with its last decision
+        self.decisions: Dict[int, bool] = {}
+
+    def _bands(self, signature: tuple) -> List[tuple]:
+        return [(band, signature[band * self.rows_per_band:(band + 1) * self.rows_per_band])
+                for band in range(self.num_bands)]
+
+    def _signatures(self, section_html: str) -> List[tuple]:
+        units = [unit for unit in extract_units(section_html) if len(unit.split()) >= MIN_UNIT_WORDS or ' -> ' in unit]
+        return [(unit, self.hasher.signature(shingles)) for unit in units if (shingles := shingle_unit(unit))]
+
+    def add(self, section_html: str):
+        for unit, signature in self._signatures(section_html):
+            idx = len(self.units)
+            self.units.append(unit)
+            self.signatures.append(signature)
+            for band in self._bands(signature):
+                self.buckets[band].append(idx)
+
+    def compare(self, section_html: str) -> Dict:
+        """ Score how much of `section_html` repeats the sections added so far and return the overlapping spans """
+        signatures = self._signatures(section_html)
+        matched_units, similarities = {}, []
+        for unit, signature in signatures:
+            candidates = {idx for band in self._bands(signature) for idx in self.buckets.get(band, [])}
+            best = max((estimate_similarity(signature, self.signatures[idx]), idx) for idx in candidates) \
+                if candidates else (0.0, None)
+            similarities.append(best[0])
+            if best[0] >= self.unit_threshold:
+                matched_units[best[1]] = self.units[best[1]]
+        overlapping = sum(similarity >= self.unit_threshold for similarity in similarities)
+        return {
+            "score": overlapping / len(signatures) if signatures else 0.0,
+            "max_similarity": max(similarities, default=0.0),
+            "overlapping_units": overlapping,
+            "total_units": len(signatures),
+            "spans": [matched_units[idx] for idx in sorted(matched_units)]
+        }
+
+    def record(self, section_idx: int, deduplicated: bool):
+        self.decisions[section_idx] = deduplicated
+
+    @property
+    def checked(self) -> int:
+        return len(self.decisions)
+
+    @property
+    def skipped(self) -> int:
+        return sum(not deduplicated for deduplicated in self.decisions.values())
+
+    @property
+    def skip_rate(self) -> float:
+        return self.skipped / self.checked if self.checked else 0.0
+
+
+__all__ = ['OverlapDetector', 'MinHasher', 'extract_units', 'estimate_similarity']
@@ -0,0 +1,143 @@
+import re
+import json
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.messages import AIMessage
+from langchain_core.exceptions import OutputParserException
+
+from report_ai.common.utils import configs
+
+# How structured outputs got parsed: native tool call, plain JSON, locally repaired JSON or the OutputFixingParser call
+PARSE_PATHS = ['native', 'json', 'repaired', 'output_fixing']
+
+parse_paths: Counter = Counter()
+
+CODE_FENCE_PATTERN = re.compile(r'```[a-zA-Z]*\s*(.*?)```', re.DOTALL)
+TRAILING_COMMA_PATTERN = re.compile(r',(\s*[}\]])')
+PYTHON_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+PYTHON_LITERAL_PATTERN = re.compile(r'\b(True|False|None)\b')
+CLOSING = {'{': '}', '[': ']'}
+
+
+def extract_json_span(text: str) -> str | None:
+    """
+    The first JSON object or array of `text`, without the prose before and after it. Strings in double or single quotes
+    are skipped, and brackets and strings left open by a truncated output are closed.
+    """
+    start = min((idx for idx in (text.find('{'), text.find('[')) if idx != -1), default=-1)
+    if start == -1:
+        return None
+    stack, quote, escaped = [], None, False
+    for idx in range(start, len(text)):
+        char = text[idx]
+        if quote is not None:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in CLOSING:
+            stack.append(CLOSING[char])
+        elif char in '}]':
+            if not stack or stack.pop() != char:
+                return None
+            if not stack:
+                return text[start:idx + 1]
+    return text[start:] + (quote or '') + ''.join(reversed(stack))
+
+
+def fix_code(segment: str) -> str:
+    # Outside of strings, trailing commas are dropped and Python literals replaced by their JSON counterparts
+    segment = TRAILING_COMMA_PATTERN.sub(r'\1', segment)
+    return PYTHON_LITERAL_PATTERN.sub(lambda match: PYTHON_LITERALS[match.group(1)], segment)
+
+
+def normalize_json(text: str) -> str:
+    """ Turn single-quoted strings into double-quoted ones and fix the JSON between the strings """
+    segments: List[str] = []
+    code, idx = [], 0
+    while idx < len(text):
+        char = text[idx]
+        if char not in '"\'':
+            code.append(char)
+            idx += 1
+            continue
+        segments.append(fix_code(''.join(code)))
+        code = []
+        # Copy the string up to its closing quote, re-escaping quotes for a double-quoted JSON string
+        content, idx, escaped = [], idx + 1, False
+        while idx < len(text) and (escaped or text[idx] != char):
+            if escaped:
+                content.append(text[idx])
+                escaped = False
+            elif text[idx] == '\\':
+                escaped = True
+                if idx + 1 < len(text) and text[idx + 1] != "'":
+                    content.append('\\')
+            elif text[idx] == '"' and char == "'":
+                content.append('\\"')
+            else:
+                content.append(text[idx])
+            idx += 1
+        segments.append('"' + ''.join(content) + '"')
+        idx += 1
+    segments.append(fix_code(''.join(code)))
+    return ''.join(segments)
+
+
+def repair_json(text: str) -> str | None:
+    """
+    Locally repaired JSON of an LLM output with common defects: a code fence, text around the JSON, single quotes,
+    trailing commas, Python literals or a truncated end. None when it cannot be repaired
+    """
+    fenced = CODE_FENCE_PATTERN.search(text)
+    candidate = extract_json_span(fenced.group(1) if fenced else text)
+    if candidate is None:
+        return None
+    for attempt in (candidate, normalize_json(candidate)):
+        try:
+            return json.dumps(json.loads(attempt))
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def parse_locally(output_parser, text: str) -> Tuple[Any, str] | None:
+    """ Parsed output and parse path ('json' or 'repaired') of `text`, None when only an LLM could fix it """
+    try:
+        return output_parser.parse(text), 'json'
+    except OutputParserException:
+        if not configs.structured_output.local_repair:
+            return None
+    repaired = repair_json(text)
+    if repaired is None:
+        return None
+    try:
+        return output_parser.parse(repaired), 'repaired'
+    except OutputParserException:
+        return None
+
+
+def tool_call_message(response: AIMessage) -> AIMessage:
+    """ The arguments of the response's first tool call as JSON content, so they are parsed and cached like text """
+    tool_calls = getattr(response, 'tool_calls', None)
+    if not tool_calls:
+        return response
+    return AIMessage(content=json.dumps(tool_calls[0]['args']),
+                     response_metadata={**response.response_metadata, "structured_output": True},
+                     usage_metadata=getattr(response, 'usage_metadata', None))
+
+
+def record_parse_path(path: str):
+    parse_paths[path] += 1
+
+
+def parse_path_stats() -> Dict[str, int]:
+    return {path: parse_paths[path] for path in PARSE_PATHS}
+
+
+__all__ = ['repair_json', 'parse_locally', 'tool_call_message', 'record_parse_path', 'parse_path_stats']
@@ -0,0 +1,43 @@
+from typing import Tuple
+from functools import lru_cache
+
+# Rough number of characters per token for English prose, used when no tokenizer is available
+CHARACTERS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def get_encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # tiktoken is missing or cannot fetch its vocabulary (e.g. on air-gapped hosts)
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    encoding = get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return -(-len(text) // CHARACTERS_PER_TOKEN)
+
+
+def estimate_messages_tokens(messages) -> int:
+    return sum(estimate_tokens(message.content) for message in messages)
+
+
+def get_token_usage(response) -> Tuple[int, int] | None:
+    """ Prompt and completion tokens reported by the provider for a chat model response, if any """
+    usage = getattr(response, 'usage_metadata', None)
+    if usage:
+        return usage['input_tokens'], usage['output_tokens']
+    metadata = response.response_metadata or {}
+    # OpenAI reports `token_usage`, Anthropic reports `usage`
+    if token_usage := metadata.get('token_usage'):
+        return token_usage.get('prompt_tokens', 0), token_usage.get('completion_tokens', 0)
+    if token_usage := metadata.get('usage'):
+        return token_usage.get('input_tokens', 0), token_usage.get('output_tokens', 0)
+    return None
+
+
+__all__ = ['estimate_tokens', 'estimate_messages_tokens', 'get_token_usage']
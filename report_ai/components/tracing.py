@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import itertools
+from contextvars import ContextVar
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+from report_ai.common.utils import configs
+
+logger = configs.logger
+
+# Callables receiving every finished span, e.g. to export it to a tracing backend
+span_hooks: List[Callable[['Span'], None]] = []
+
+_span_ids = itertools.count(1)
+_current_trace: ContextVar['Trace | None'] = ContextVar('current_trace', default=None)
+_current_span: ContextVar['Span | None'] = ContextVar('current_span', default=None)
+# Attempt number of the retried operation about to run, set by tenacity through `record_attempt`
+_current_attempt: ContextVar[int] = ContextVar('current_attempt', default=1)
+
+
+class Span:
+    """ Timed unit of work, e.g. a pipeline stage, a section or an LLM call, nested under the span it started in """
+    __slots__ = ('name', 'kind', 'span_id', 'parent_id', 'trace', 'start', 'end', 'attributes', 'error', '_token')
+
+    def __init__(self, name: str, kind: str, trace: 'Trace | None', attributes: Dict[str, Any]):
+        self.name, self.kind, self.trace = name, kind, trace
+        self.span_id = next(_span_ids)
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = attributes
+        # Every retried operation opens a span first, which takes over the attempt number set for it
+        attempt = _current_attempt.get()
+        if attempt != 1:
+            self.attributes["attempt"] = attempt
+            _current_attempt.set(1)
+        self.start, self.end, self.error, self._token = None, None, None, None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def __enter__(self) -> 'Span':
+        self.start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.end = time.perf_counter()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc_value}"
+        if self.trace is not None:
+            self.trace.spans.append(self)
+        for hook in span_hooks:
+            try:
+                hook(self)
+            except Exception:
+                logger.exception(f"Span hook {hook} failed")
+        return False
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        return {"id": self.span_id, "parent_id": self.parent_id, "name": self.name, "kind": self.kind,
+                "start": round(self.start - origin, 4), "end": round(self.end - origin, 4),
+                "duration": round(self.end - self.start, 4), "attributes": self.attributes, "error": self.error}
+
+
+class NoopSpan:
+    """ Stand-in returned while nothing is traced, so instrumented code costs a single context variable lookup """
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self) -> 'NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class Trace:
+    """ Spans of one report run, written as a JSON profile when the run completes """
+
+    def __init__(self, request_id: int | str | None):
+        self.request_id = request_id
+        self.spans: List[Span] = []
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self._token = None
+
+    def __enter__(self) -> 'Trace':
+        self._token = _current_trace.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_trace.reset(self._token)
+        return False
+
+    def summary(self) -> Dict[str, Any]:
+        """ Time per stage and totals of the LLM calls, retries, HTML parsing and PDF rendering of the run """
+        llm_spans = [span for span in self.spans if span.kind == 'llm']
+        # Other kinds are summed over concurrent spans, so their totals can exceed the duration of the run
+        kinds = defaultdict(float)
+        for span in self.spans:
+            if span.kind != 'stage':
+                kinds[span.kind] += span.duration
+        cache, parse_paths = defaultdict(int), defaultdict(int)
+        for span in llm_spans:
+            cache[span.attributes.get("cache", "disabled")] += 1
+            if "parse_path" in span.attributes:
+                parse_paths[span.attributes["parse_path"]] += 1
+        return {
+            "duration": round(time.perf_counter() - self.origin, 4),
+            "stages": {span.name: round(span.duration, 4) for span in self.spans if span.kind == 'stage'},
+            "kinds": {kind: round(duration, 4) for kind, duration in kinds.items()},
+            "llm_calls": len(llm_spans),
+            "llm_cache": dict(cache),
+            "parse_paths": dict(parse_paths),
+            "prompt_tokens": sum(span.attributes.get("prompt_tokens", 0) for span in llm_spans),
+            "completion_tokens": sum(span.attributes.get("completion_tokens", 0) for span in llm_spans),
+            "retries": sum(1 for span in self.spans if span.attributes.get("attempt", 1) > 1),
+            "errors": sum(1 for span in self.spans if span.error)
+        }
+
+    def to_profile(self) -> Dict[str, Any]:
+        spans = sorted((span for span in self.spans if span.end is not None), key=lambda span: span.start)
+        return {"request_id": self.request_id, "started_at": self.started_at, "summary": self.summary(),
+                "spans": [span.to_dict(self.origin) for span in spans]}
+
+    def write_profile(self, path: str) -> str | None:
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(self.to_profile(), file, indent=2, default=str)
+            return path
+        except OSError:
+            logger.exception(f"Failed to write run profile to {path}")
+            return None
+
+    def summary_line(self) -> str:
+        summary = self.summary()
+        stages = ', '.join(f"{name} {duration:.1f}s" for name, duration in summary["stages"].items())
+        return (f"Run {self.request_id} took {summary['duration']:.1f}s ({stages}); {summary['llm_calls']} LLM calls "
+                f"in {summary['kinds'].get('llm', 0):.1f}s, cache {summary['llm_cache']}, {summary['prompt_tokens']} "
+                f"prompt and {summary['completion_tokens']} completion tokens, {summary['retries']} retries, "
+                f"{summary['errors']} errors")
+
+
+def start_trace(request_id: int | str | None) -> Trace | None:
+    """ Trace of a report run, None when tracing is disabled """
+    return Trace(request_id) if configs.tracing.enabled else None
+
+
+def span(name: str, kind: str = 'stage', **attributes) -> Span | NoopSpan:
+    """ Context manager timing a unit of work. Spans are only recorded inside a trace or when hooks are registered """
+    trace = _current_trace.get()
+    if trace is None and not span_hooks:
+        return NOOP_SPAN
+    return Span(name, kind, trace, attributes)
+
+
+def current_span() -> Span | NoopSpan:
+    return _current_span.get() or NOOP_SPAN
+
+
+def record_attempt(retry_state):
+    """ tenacity `before` callback, so the span of a retried operation records which attempt it is """
+    _current_attempt.set(retry_state.attempt_number)
+
+
+def add_span_hook(hook: Callable[[Span], None]):
+    span_hooks.append(hook)
+
+
+def remove_span_hook(hook: Callable[[Span], None]):
+    span_hooks.remove(hook)
+
+
+__all__ = ['Span', 'Trace', 'span', 'current_span', 'start_trace', 'record_attempt', 'add_span_hook',
+           'remove_span_hook']
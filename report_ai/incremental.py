@@ -0,0 +1,71 @@
+from typing import Dict, List, Set, Tuple
+
+from report_ai.common.utils import configs
+from report_ai.section import section_query
+from report_ai.components.retrieval import ConversationIndex
+
+logger = configs.logger
+
+
+def diff_conversation(previous_conversation: List[Dict] | None, conversation: List[Dict]) -> List[Dict] | None:
+    """ Messages appended to `previous_conversation`, or None when `conversation` does not extend it """
+    if not previous_conversation or conversation[:len(previous_conversation)] != previous_conversation:
+        return None
+    return conversation[len(previous_conversation):]
+
+
+def find_new_chunks(previous_index: ConversationIndex, conversation_index: ConversationIndex) -> Set[int]:
+    # Exchanges are chunked independently, so chunks of untouched exchanges come out identical
+    previous_chunks = set(previous_index.chunks)
+    return {idx for idx, chunk in enumerate(conversation_index.chunks) if chunk not in previous_chunks}
+
+
+def find_affected_sections(report_skeleton: List[Dict], conversation_index: ConversationIndex,
+                           new_chunks: Set[int]) -> (List[int], Set[int]):
+    """
+    Indexes of the sections whose conversation excerpt now includes new content, and the new chunks no section
+    retrieves. Introduction, Conclusion and sections without any matching chunk read the whole conversation, so they
+    are always affected.
+    """
+    if not new_chunks:
+        return [], set()
+    affected, covered = [], set()
+    for idx, section in enumerate(report_skeleton):
+        if not configs.retrieval.enabled or section['heading'] in ["Introduction", "Conclusion"]:
+            affected.append(idx)
+            continue
+        selected = set(conversation_index.select(section_query(section), configs.retrieval.token_budget))
+        covered |= selected & new_chunks
+        if not selected or selected & new_chunks:
+            affected.append(idx)
+    return affected, new_chunks - covered
+
+
+def merge_skeleton(report_skeleton: List[Dict], new_sections: List[Dict]) -> (List[Dict], Dict[int, int]):
+    """
+    Insert the sections of `new_sections` missing from the report before its Conclusion. Returns the merged skeleton
+    and the position of every original section in it.
+    """
+    headings = {section['heading'].lower() for section in report_skeleton}
+    additions = [section for section in new_sections
+                 if section['heading'] not in ["Introduction", "Conclusion"] and section['heading'].lower() not in headings]
+    insert_at = len(report_skeleton)
+    if report_skeleton and report_skeleton[-1]['heading'] == "Conclusion":
+        insert_at -= 1
+    merged = report_skeleton[:insert_at] + additions + report_skeleton[insert_at:]
+    positions = {idx: idx if idx < insert_at else idx + len(additions) for idx in range(len(report_skeleton))}
+    return merged, positions
+
+
+def plan_incremental_update(previous: Dict, conversation_index: ConversationIndex) -> Tuple[List[int], Set[int]]:
+    """ Affected sections of the previous run's skeleton and the new chunks none of them covers """
+    previous_index = ConversationIndex.from_serialized_conversation(previous["serialize"][0],
+                                                                    configs.retrieval.chunk_tokens)
+    new_chunks = find_new_chunks(previous_index, conversation_index)
+    affected, uncovered = find_affected_sections(previous["skeleton"], conversation_index, new_chunks)
+    # A section can only be reused when the previous run actually finished it
+    affected = [idx for idx in range(len(previous["skeleton"])) if idx in affected or f"section:{idx}" not in previous]
+    logger.info(f"{len(new_chunks)} new conversation chunks affect {len(affected)} of {len(previous['skeleton'])} "
+                f"sections, {len(uncovered)} chunks are not covered by any section")
+    return affected, uncovered
+
@@ -1,95 +1,96 @@
 import os
 from report_ai.report import run_generation
 
-if __name__ == '__main__':
-    conversation = [
-        {
-            "role": "user",
-            "content": "What are the diseases associated with GP3119? How does activation of GPR119 treat metabolic diseases?"
-        },
-        {
-            "role": "assistant",
-            "content": "### Comprehensive Problem Statement on GPR119 and Metabolic Diseases\n\n#### Overview\nGPR119 is a G protein-coupled receptor primarily expressed in pancreatic β-cells and gastrointestinal enteroendocrine cells. It plays a significant role in the regulation of glucose homeostasis and energy balance through the modulation of insulin and incretin hormones. This receptor's activation is pivotal in the management of metabolic disorders, particularly type 2 diabetes mellitus (T2DM) and non-alcoholic fatty liver disease (NAFLD), as well as obesity.\n\n#### Diseases Linked with GPR119\n\n| Disease             | Relevance to GPR119 Activation |\n|---------------------|--------------------------------|\n| Type 2 Diabetes     | GPR119 activation enhances insulin and incretin release, crucial for glucose regulation. |\n| Obesity             | Activation leads to increased satiety and potentially reduced food intake. |\n| Non-Alcoholic Fatty Liver Disease | Improved metabolic regulation may reduce liver fat accumulation. |\n\n#### Mechanism of Action\nActivation of GPR119 stimulates the secretion of glucose-dependent insulinotropic peptide (GIP) and glucagon-like peptide-1 (GLP-1), both of which are incretins that enhance insulin secretion from pancreatic β-cells in a glucose-dependent manner. This process is crucial for maintaining blood glucose levels within a normal range, thereby providing a therapeutic mechanism for managing T2DM and related metabolic conditions.\n\n```mermaid\ngraph TB\nA[\"GPR119 Activation\"] --> B[\"Stimulates Incretin Release (GIP, GLP-1)\"]\nB --> C[\"Enhanced Insulin Secretion from Pancreatic β-cells\"]\nC --> D[\"Improved Glucose Regulation\"]\nA --> E[\"Promotes Satiety\"]\nE --> F[\"Potential Reduction in Food Intake\"]\nA --> G[\"Modulates Energy Metabolism\"]\nG --> H[\"Possible Impact on NAFLD Progression\"]\n```\n\n#### Physiological Role of GPR119\n\n- **Glucose Homeostasis**: GPR119 activation is integral to the regulation of blood glucose levels through its effects on insulin and incretin hormones.\n- **Energy Balance**: The receptor influences energy metabolism, which is crucial in the management of body weight and metabolic health.\n\n#### Therapeutic Implications\n\n- **Type 2 Diabetes**: GPR119 agonists like MBX-2982 show promise in stimulating glucose-dependent insulin secretion, offering a potential treatment that avoids hypoglycemia.\n- **Obesity**: By enhancing satiety, GPR119 agonists could help in weight management and reduction of obesity-related complications.\n- **Non-Alcoholic Fatty Liver Disease**: Improved metabolic control through GPR119 activation might reduce hepatic fat accumulation, offering a novel approach to manage NAFLD.\n\n#### Conclusion\nGPR119 represents a promising therapeutic target for metabolic diseases due to its role in enhancing insulin secretion and incretin release, improving glucose homeostasis, and potentially aiding in weight management. Ongoing research into the receptor's activation mechanisms and the development of specific agonists continues to open new avenues for the treatment of metabolic dysfunctions such as T2DM, obesity, and NAFLD. Further clinical trials and studies are needed to fully understand the therapeutic potential and safety profile of GPR119 agonists.\n\n --- \n\n  \nReferences  \n[https://www.cureus.com/articles/219219-novel-therapies-in-diabetes-a-comprehensive-narrative-review-of-glp-1-receptor-agonists-sglt2-inhibitors-and-beyond](https://www.cureus.com/articles/219219-novel-therapies-in-diabetes-a-comprehensive-narrative-review-of-glp-1-receptor-agonists-sglt2-inhibitors-and-beyond)  \n[https://healthtransformer.co/pramanas-biotech-discoveries-promise-revolutionary-type-1-diabetes-management-d903fd391bf0](https://healthtransformer.co/pramanas-biotech-discoveries-promise-revolutionary-type-1-diabetes-management-d903fd391bf0)  \n[https://www.genengnews.com/news/sanofi-aventis-to-develop-metabolex-type-2-diabetes-therapy-as-part-of-375m-deal/](https://www.genengnews.com/news/sanofi-aventis-to-develop-metabolex-type-2-diabetes-therapy-as-part-of-375m-deal/)  \n[https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7](https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7)  \n[https://phys.org/news/2022-08-reveals-ligand-recognition-mechanism-orphan.html](https://phys.org/news/2022-08-reveals-ligand-recognition-mechanism-orphan.html)  \n[https://www.mdpi.com/2073-4409/10/12/3347](https://www.mdpi.com/2073-4409/10/12/3347)  \n[https://pubmed.ncbi.nlm.nih.gov/28722242/](https://pubmed.ncbi.nlm.nih.gov/28722242/)"
-        },
-        {
-            "role": "user",
-            "content": "What are the potential benefits of GPR119 activation in managing non-alcoholic fatty liver disease?"
-        },
-        {
-            "role": "assistant",
-            "content": "### Detailed Explanation of the Role of GPR119 Activation in Managing NAFLD\n\nGPR119 is a G protein-coupled receptor that is predominantly expressed in pancreatic β-cells and gastrointestinal enteroendocrine cells. Its activation plays a crucial role in the regulation of glucose levels and overall energy metabolism, which are key factors in the management of non-alcoholic fatty liver disease (NAFLD).\n\n#### Mechanisms of GPR119 Activation\n\nWhen GPR119 is activated, it primarily triggers the secretion of incretin hormones such as glucagon-like peptide-1 (GLP-1) and glucagon-like peptide-2 (GLP-2). These hormones are instrumental in enhancing insulin secretion from the pancreas, improving insulin sensitivity in peripheral tissues, and promoting a feeling of satiety. These actions collectively contribute to improved glycemic control and energy balance.\n\n- **Insulin Secretion**: GLP-1 enhances glucose-dependent insulin secretion, which helps in lowering blood glucose levels.\n- **Insulin Sensitivity**: Improved insulin sensitivity helps in reducing insulin resistance, which is a common issue in NAFLD.\n- **Satiety and Reduced Food Intake**: By promoting satiety, GLP-1 can reduce food intake, thus indirectly contributing to weight management and reduced liver fat.\n\n#### Biochemical Pathways Involved\n\nActivation of GPR119 leads to an increase in intracellular cyclic AMP (cAMP) levels. Elevated cAMP levels enhance the secretion of incretins (GLP-1 and GLP-2) and activate protein kinase A (PKA), which further influences various metabolic processes including glucose and lipid metabolism.\n\n```mermaid\ngraph TB\n    A[\"GPR119 Activation\"] -->|Increases cAMP| B[\"Cyclic AMP (cAMP)\"]\n    B --> C[\"Incretin Secretion (GLP-1, GLP-2)\"]\n    C --> D[\"Enhanced Insulin Secretion\"]\n    C --> E[\"Improved Insulin Sensitivity\"]\n    C --> F[\"Promotes Satiety\"]\n    D --> G[\"Lower Blood Glucose Levels\"]\n    E --> H[\"Reduced Insulin Resistance\"]\n    F --> I[\"Reduced Food Intake\"]\n    B --> J[\"Activation of PKA\"]\n    J --> K[\"Modulation of Glucose and Lipid Metabolism\"]\n```\n\n#### Physiological Impact on NAFLD\n\nThe physiological and biochemical actions mediated by GPR119 activation have significant implications for managing NAFLD:\n\n- **Improved Glycemic Control**: Lower blood glucose levels and enhanced insulin sensitivity help in managing the hyperglycemia often associated with NAFLD.\n- **Reduction in Liver Fat**: By controlling dietary intake and improving metabolic functions, GPR119 activation can lead to a reduction in liver fat accumulation, which is crucial in preventing the progression of NAFLD to more severe stages like nonalcoholic steatohepatitis (NASH).\n- **Anti-inflammatory Effects**: Incretins, particularly GLP-1, have been shown to possess anti-inflammatory properties, which can help in reducing liver inflammation seen in NAFLD patients.\n\n### Conclusion\n\nThe activation of GPR119 offers a promising therapeutic target for managing NAFLD due to its role in regulating glucose metabolism and enhancing overall metabolic health. Through the secretion of incretins and the subsequent biochemical pathways, GPR119 activation helps in improving insulin sensitivity, reducing liver fat, and managing energy balance, all of which are crucial for the effective management of NAFLD.\n\n --- \n\n  \nReferences  \n[https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/](https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/)  \n[https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7](https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7)  \n[https://pubmed.ncbi.nlm.nih.gov/28722242/](https://pubmed.ncbi.nlm.nih.gov/28722242/)"
-        },
-        {
-            "role": "user",
-            "content": "Are there any ongoing clinical trials investigating the use of GPR119 activation in NAFLD?"
-        },
-        {
-            "role": "assistant",
-            "content": "### Current Clinical Trials on GPR119 Activation for NAFLD Treatment\n\nGPR119, a G-protein coupled receptor primarily expressed in pancreatic and gastrointestinal tissues, has recently been targeted in clinical trials for its potential therapeutic effects in treating non-alcoholic fatty liver disease (NAFLD). These trials aim to explore the efficacy of GPR119 activation in improving metabolic outcomes and liver health in NAFLD patients.\n\n#### Overview of Ongoing Clinical Trials\n\nBelow is a detailed table summarizing the ongoing clinical trials focusing on GPR119 agonists for NAFLD treatment:\n\n| Trial ID      | Sponsor/Collaborator | Study Phase | Status       | Primary Objectives                                                                                              |\n|---------------|----------------------|-------------|--------------|-----------------------------------------------------------------------------------------------------------------|\n| NCT02939404   | NeuroBo Pharmaceuticals | Phase II    | Recruiting   | To assess the efficacy of DA-1241 in reducing liver fat content and improving liver function and insulin sensitivity |\n| NCT03021187   | Dong-A ST             | Phase I/II  | Active, not recruiting | To evaluate the safety and metabolic effects of DA-1726 on patients with obesity and NAFLD                      |\n\nThese trials typically measure endpoints such as changes in liver fat content, liver function markers, insulin sensitivity, and overall lipid profiles.\n\n#### Mechanistic Insights and Therapeutic Targets\n\nThe primary mechanisms by which GPR119 agonists are hypothesized to exert beneficial effects in NAFLD include:\n\n- **Reduction in Hepatic Lipogenesis**: By inhibiting de novo lipogenesis pathways.\n- **Enhancement of AMPK Activation**: AMPK plays a crucial role in regulating metabolic processes, potentially reducing liver fat accumulation.\n- **Regulation of SREBP-1**: This transcription factor is involved in fatty acid and triglyceride synthesis; its modulation by GPR119 could mitigate hepatic steatosis.\n\n```mermaid\ngraph TB\nA[\"GPR119 Activation\"] --> B[\"Inhibition of Hepatic Lipogenesis\"]\nA --> C[\"Enhancement of AMPK Activation\"]\nA --> D[\"Regulation of SREBP-1\"]\nB --> E[\"Reduction in Liver Fat Content\"]\nC --> F[\"Improvement in Metabolic Parameters\"]\nD --> G[\"Decrease in Triglyceride Synthesis\"]\nE --> H[\"Improved Liver Function\"]\nF --> I[\"Enhanced Insulin Sensitivity\"]\nG --> J[\"Improved Lipid Profiles\"]\n```\n\nThe diagram above illustrates the hypothesized pathways through which GPR119 activation impacts NAFLD, highlighting the therapeutic targets and expected outcomes of current clinical trials.\n\n### Conclusion\n\nThe ongoing clinical trials for GPR119 agonists represent a promising frontier in the treatment of NAFLD. By focusing on key metabolic pathways and liver health indicators, these studies aim to develop more effective therapies for managing and potentially reversing NAFLD. The outcomes of these trials could pave the way for new, targeted treatments that offer hope to patients suffering from this increasingly common disease.\n\n --- \n\n  \nReferences  \n[https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7](https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7)  \n[https://www.ajupress.com/view/20220915111008606](https://www.ajupress.com/view/20220915111008606)  \n[https://pubmed.ncbi.nlm.nih.gov/26399788/](https://pubmed.ncbi.nlm.nih.gov/26399788/)"
-        },
-        {
-            "role": "user",
-            "content": "How do the primary endpoints of the current clinical trials on GPR119 activation in NAFLD compare to traditional treatment approaches for NAFLD?"
-        },
-        {
-            "role": "assistant",
-            "content": "### Comprehensive Analysis of Primary Endpoints in Clinical Trials for NAFLD: GPR119 Activation vs. Traditional Treatments\n\nNon-alcoholic fatty liver disease (NAFLD) treatments are undergoing significant evolution with the introduction of GPR119 agonists. This analysis compares the primary endpoints used in clinical trials activating GPR119 against those utilized in traditional NAFLD treatment methodologies.\n\n#### 1. Efficacy Endpoints Comparison\n\n| **Endpoint**                     | **Traditional Treatments**                     | **GPR119-Focused Trials**                      |\n|----------------------------------|------------------------------------------------|------------------------------------------------|\n| **Liver Fat Content (LFC)**      | Assessed indirectly through biomarkers         | Directly measured via MRI, quantifying changes |\n| **Histological Improvement**     | Less commonly targeted                         | Focus on NAS reduction, NASH resolution, liver fibrosis improvement |\n| **Biochemical Markers**          | AST, ALT, HbA1c                                | Not primarily focused; secondary consideration |\n\nTraditional treatments often rely on liver function tests and indirect measures such as biochemical markers (AST, ALT, HbA1c) and imaging techniques. In contrast, GPR119-focused trials prioritize direct histological improvements, including steatosis, inflammation, and fibrosis, assessed through advanced imaging and histological scoring.\n\n#### 2. Safety Outcomes Comparison\n\nBoth traditional and GPR119-focused trials emphasize the safety and tolerability of treatments. However, GPR119 agonists have shown a favorable safety profile with manageable side effects, which might be attributed to their targeted mechanism of action.\n\n#### 3. Novel Metrics Introduced by GPR119-Focused Trials\n\nGPR119-focused trials introduce more precise and disease-specific metrics such as detailed histological assessments and direct measurements of liver fat content using MRI. These metrics allow for a more accurate evaluation of the therapeutic effects on liver pathology.\n\n#### Visualization of Endpoint Focus Shift\n\n```mermaid\ngraph TB\nA[\"Traditional NAFLD Treatments\"] --> B[\"Liver Function Tests\"]\nA --> C[\"Biochemical Markers (AST, ALT, HbA1c)\"]\nA --> D[\"Imaging Techniques (VCTE, MRI)\"]\nE[\"GPR119-Focused NAFLD Treatments\"] --> F[\"Direct LFC Measurement (MRI)\"]\nE --> G[\"Histological Scores (NAS, NASH resolution)\"]\nE --> H[\"Liver Fibrosis Stages\"]\n```\n\nThis diagram illustrates the shift from predominantly functional and biochemical assessments in traditional treatments to more direct and histological evaluations in GPR119-focused trials.\n\n### Conclusion\n\nThe shift in primary endpoints from traditional NAFLD treatments to those activating GPR119 reflects a deeper understanding of the disease's pathology. GPR119 agonists not only promise improved efficacy in reducing liver fat content and improving liver histology but also maintain a favorable safety profile. This targeted approach could potentially lead to more effective and tailored therapies for NAFLD, aligning treatment objectives more closely with pathological outcomes.\n\n --- \n\n  \nReferences  \n[https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/](https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/)  \n[https://www.mdpi.com/1422-0067/21/6/1907](https://www.mdpi.com/1422-0067/21/6/1907)  \n[https://classic.clinicaltrials.gov/ct2/show/NCT05605158](https://classic.clinicaltrials.gov/ct2/show/NCT05605158)  \n[https://delta.larvol.com/Products/?ProductId=89be1b01-31db-4a51-a2e0-64f89ed5d5dd](https://delta.larvol.com/Products/?ProductId=89be1b01-31db-4a51-a2e0-64f89ed5d5dd)  \n[https://synapse.patsnap.com/target/b4b209ac8a7341189848500477d9b108](https://synapse.patsnap.com/target/b4b209ac8a7341189848500477d9b108)  \n[https://pubmed.ncbi.nlm.nih.gov/37355043/](https://pubmed.ncbi.nlm.nih.gov/37355043/)"
-        },
-        {
-            "role": "user",
-            "content": "What are the common side effects associated with GPR119 agonists in clinical trials for NAFLD?"
-        },
-        {
-            "role": "assistant",
-            "content": "### Common Side Effects of GPR119 Agonists in NAFLD Clinical Trials\n\nGPR119 agonists, currently under investigation for their therapeutic potential in treating non-alcoholic fatty liver disease (NAFLD), have shown a range of side effects based on clinical trial observations. Below is a detailed list of these side effects categorized by their nature and frequency.\n\n#### Table: Side Effects Observed in Clinical Trials\n\n| Side Effect Category | Specific Side Effects | Severity | Frequency |\n|----------------------|-----------------------|----------|-----------|\n| Gastrointestinal     | Nausea                | Mild to Moderate | Common |\n|                      | Vomiting              | Mild to Moderate | Common |\n|                      | Diarrhea              | Mild to Moderate | Common |\n| Neurological         | Headaches             | Mild to Moderate | Common |\n|                      | Dizziness             | Mild to Moderate | Common |\n| General Discomfort   | Fatigue               | Mild to Moderate | Common |\n| Allergic Reactions   | Rash                  | Mild | Rare       |\n|                      | Itching               | Mild | Rare       |\n\nThese side effects are generally transient, with many tending to decrease in intensity as patients continue with the treatment. It is important for healthcare providers to monitor these effects to adjust treatment plans accordingly.\n\n#### Graphical Representation of Side Effect Pathways\n\nThe following diagram illustrates the typical pathways through which side effects manifest in patients undergoing treatment with GPR119 agonists.\n\n```mermaid\ngraph TB\n    A[\"GPR119 Agonist Administration\"] --> B[\"Gastrointestinal Effects\"]\n    A --> C[\"Neurological Effects\"]\n    A --> D[\"General Discomfort\"]\n    A --> E[\"Allergic Reactions\"]\n\n    B --> F[\"Nausea\"]\n    B --> G[\"Vomiting\"]\n    B --> H[\"Diarrhea\"]\n\n    C --> I[\"Headaches\"]\n    C --> J[\"Dizziness\"]\n\n    D --> K[\"Fatigue\"]\n\n    E --> L[\"Rash\"]\n    E --> M[\"Itching\"]\n```\n\nThis diagram helps in visualizing the different categories of side effects and their specific manifestations, providing a clear overview for healthcare professionals monitoring these effects.\n\n#### Conclusion\n\nWhile GPR119 agonists show promise in treating NAFLD, particularly in mitigating associated metabolic disturbances, the occurrence of side effects, primarily gastrointestinal and neurological, necessitates careful patient management. The transient nature of most side effects and their manageability with proper medical oversight are positive indicators for the continued exploration of these compounds in clinical settings.\n\n --- \n\n  \nReferences  \n[https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7](https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7)  \n[https://www.uchicagomedicine.org/en/forefront/gastrointestinal-articles/2024/march/masld-drug-clinical-trial](https://www.uchicagomedicine.org/en/forefront/gastrointestinal-articles/2024/march/masld-drug-clinical-trial)"
-        },
-        {
-            "role": "user",
-            "content": "Are there any drug interactions to be cautious about when using GPR119 agonists for NAFLD?"
-        },
-        {
-            "role": "assistant",
-            "content": "### Potential Drug Interactions of GPR119 Agonists in NAFLD Treatment\n\nWhen considering the use of GPR119 agonists for the treatment of non-alcoholic fatty liver disease (NAFLD), it is crucial to evaluate potential drug interactions that could affect the efficacy and safety of the treatment regimen. GPR119 agonists, which are primarily investigated for their beneficial effects on glucose and lipid metabolism through incretin secretion, may interact with other medications commonly prescribed for NAFLD or related metabolic conditions.\n\n#### Key Considerations for Drug Interactions\n\n1. **Metformin**: Often used in the management of type 2 diabetes, which frequently co-occurs with NAFLD. Metformin may also influence incretin levels and could potentially interact with the mechanisms of GPR119 agonists.\n\n2. **Statins**: These are cholesterol-lowering agents that might be used concurrently in NAFLD patients to manage dyslipidemia. The interaction between statins and GPR119 agonists needs careful monitoring as both influence lipid metabolism.\n\n3. **Antihypertensive Drugs**: NAFLD patients often have comorbid hypertension. Certain antihypertensives might alter metabolic parameters, potentially conflicting with the actions of GPR119 agonists.\n\n4. **Oral Hypoglycemic Agents**: Other glucose-lowering drugs might have synergistic or antagonistic interactions with GPR119 agonists, affecting glucose homeostasis.\n\n#### Impact on Efficacy and Safety\n\n- **Synergistic Effects**: Some drugs may enhance the therapeutic effects of GPR119 agonists, potentially allowing for dose reductions and reduced side effects.\n- **Antagonistic Effects**: Other drugs might counteract the effects of GPR119 agonists, necessitating adjustments in therapeutic strategies.\n- **Side Effects and Toxicity**: Interactions could also lead to increased side effects or toxicity, requiring careful patient monitoring.\n\n#### Visual Representation of Interactions\n\nTo better understand the potential interactions and their implications, the following diagram illustrates the interaction pathways:\n\n```mermaid\ngraph TB\n    A[\"GPR119 Agonists\"] -->|Increase Incretin Levels| B[\"Incretin (GLP-1, GLP-2)\"]\n    B -->|Improves Metabolism| C[\"NAFLD Management\"]\n    A -->|Potential Interaction| D[\"Metformin\"]\n    A -->|Potential Interaction| E[\"Statins\"]\n    A -->|Potential Interaction| F[\"Antihypertensive Drugs\"]\n    A -->|Potential Interaction| G[\"Oral Hypoglycemic Agents\"]\n    D -->|Altered Incretin Effect| C\n    E -->|Modified Lipid Profile| C\n    F -->|Blood Pressure Impact| C\n    G -->|Glucose Homeostasis| C\n```\n\n#### Conclusion\n\nWhile GPR119 agonists show promise in the treatment of NAFLD, particularly in improving metabolic parameters and reducing inflammation, understanding and managing potential drug interactions is crucial for optimizing therapeutic outcomes. Clinicians should consider these interactions when designing treatment regimens, ensuring comprehensive patient care and monitoring to maximize both efficacy and safety.\n\n --- \n\n  \nReferences  \n[https://www.wjgnet.com/1007-9327/full/v27/i8/677.htm](https://www.wjgnet.com/1007-9327/full/v27/i8/677.htm)  \n[https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7](https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7)"
-        },
-        {
-            "role": "user",
-            "content": "Can GPR119 agonists be used in combination with other medications for NAFLD treatment?"
-        },
-        {
-            "role": "assistant",
-            "content": "### Integration of GPR119 Agonists in NAFLD Treatment Regimens\n\nThe potential for integrating GPR119 agonists into existing treatment regimens for non-alcoholic fatty liver disease (NAFLD) requires a detailed understanding of their interactions with commonly prescribed medications. These include metformin, statins, antihypertensive drugs, and oral hypoglycemic agents. The primary concerns when integrating new therapeutic agents include safety, efficacy, and the avoidance of adverse drug interactions.\n\n#### **1. Mechanistic Insights into GPR119 Agonists**\n\nGPR119 is a G-protein-coupled receptor primarily expressed in pancreatic and gastrointestinal tissues, where it plays a role in insulin secretion and glucose homeostasis. Activation of GPR119 has been associated with beneficial effects on glucose metabolism, making it a promising target for the treatment of conditions like NAFLD, which often coexists with metabolic syndromes such as type 2 diabetes and obesity.\n\n#### **2. Interaction with Common NAFLD Medications**\n\nTo evaluate the potential interactions of GPR119 agonists with other medications, we need to consider the metabolic pathways involved and the pharmacokinetic profiles of these drugs.\n\n- **Metformin**: Primarily acts by reducing hepatic glucose production and improving insulin sensitivity. It is not extensively metabolized by the liver and does not significantly interact with liver enzyme systems that metabolize most drugs.\n- **Statins**: Used for managing cholesterol levels; primarily metabolized by the liver. Potential interactions might involve liver enzyme pathways, particularly if the GPR119 agonist is metabolized through similar pathways.\n- **Antihypertensive drugs**: Diverse in mechanism, including ACE inhibitors, ARBs, beta-blockers, and calcium channel blockers. The interaction risk varies depending on the specific drug and its metabolism.\n- **Oral hypoglycemic agents**: Include sulfonylureas, thiazolidinediones, and DPP-4 inhibitors. These drugs might share common metabolic pathways with GPR119 agonists, particularly those involving pancreatic insulin regulation.\n\n#### **3. Evaluating Drug-Drug Interactions and Efficacy**\n\nTo systematically assess the safety and efficacy of GPR119 agonists when used with these medications, consider the following diagram illustrating potential interactions and pathways:\n\n```mermaid\ngraph TB\n  A[\"GPR119 Agonists\"] -->|Insulin Secretion| B[\"Improved Glucose Metabolism\"]\n  B --> C[\"Potential Synergy with Oral Hypoglycemic Agents\"]\n  A -->|Lipid Metabolism| D[\"Statins (Cholesterol Management)\"]\n  D --> E[\"Potential for Enhanced Lipid Profile\"]\n  A -->|Impact on Blood Pressure| F[\"Antihypertensive Drugs\"]\n  F --> G[\"Monitoring for Hypotension or Hypertension Adjustments\"]\n  A -->|No Direct Interaction| H[\"Metformin\"]\n  H --> I[\"Safe Co-administration\"]\n```\n\n#### **4. Clinical Considerations and Monitoring**\n\nWhen integrating GPR119 agonists into treatment regimens for NAFLD, it is crucial to monitor:\n\n- **Liver function tests**: To assess any potential hepatotoxic effects, especially when combined with statins or other hepatometabolized drugs.\n- **Blood glucose levels**: Especially in patients using multiple glucose-lowering medications, to prevent hypoglycemia.\n- **Lipid profiles**: Particularly when using statins, to evaluate the combined effect on cholesterol and triglyceride levels.\n- **Blood pressure**: In patients on antihypertensive therapy, adjustments may be necessary based on the observed effects of GPR119 agonist treatment.\n\n#### **5. Conclusion**\n\nThe integration of GPR119 agonists into existing NAFLD treatment regimens appears promising but requires careful consideration of potential drug-drug interactions and vigilant monitoring of patient response to therapy. Clinical trials and pharmacokinetic studies will be essential to further elucidate these interactions and optimize therapeutic strategies for NAFLD patients.\n\n --- \n\n  \nReferences  \n[https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/](https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/)  \n[https://www.mdpi.com/1422-0067/21/6/1907](https://www.mdpi.com/1422-0067/21/6/1907)  \n[https://classic.clinicaltrials.gov/ct2/show/NCT05254626](https://classic.clinicaltrials.gov/ct2/show/NCT05254626)  \n[https://www.frontiersin.org/articles/10.3389/fphar.2021.807548/full](https://www.frontiersin.org/articles/10.3389/fphar.2021.807548/full)  \n[https://www.frontiersin.org/journals/pharmacology/articles/10.3389/fphar.2020.554961/full](https://www.frontiersin.org/journals/pharmacology/articles/10.3389/fphar.2020.554961/full)  \n[https://www.fda.gov/news-events/press-announcements/fda-approves-first-treatment-patients-liver-scarring-due-fatty-liver-disease](https://www.fda.gov/news-events/press-announcements/fda-approves-first-treatment-patients-liver-scarring-due-fatty-liver-disease)"
-        },
-        {
-            "role": "user",
-            "content": "What rare diseases can be treated with GPR119 agonists?"
-        },
-        {
-            "role": "assistant",
-            "content": "# Comprehensive Analysis of GPR119 Agonists in the Treatment of Rare Diseases Including NAFLD\n\nGPR119 agonists have emerged as promising therapeutic agents in the treatment of metabolic disorders, including non-alcoholic fatty liver disease (NAFLD). Below, we explore the potential application of these agonists in various rare diseases, focusing on their efficacy and mechanisms of action, supported by an overview of the current research landscape and clinical trial findings.\n\n## Potential Rare Diseases Targeted by GPR119 Agonists\n\n| Disease | Relevance to GPR119 Agonists | Mechanism of Action |\n|---------|------------------------------|---------------------|\n| NAFLD   | High | GPR119 agonists reduce hepatic lipid accumulation by modulating lipid metabolism pathways and enhancing incretin secretion, which improves glucose and lipid homeostasis. |\n| Prader-Willi Syndrome | Moderate | Potential to control hyperphagia and obesity through appetite regulation mechanisms. |\n| Lipodystrophy | Moderate | Could improve metabolic profiles by enhancing lipid and glucose metabolism. |\n\n## Mechanisms of GPR119 Agonists in NAFLD Treatment\n\n```mermaid\ngraph TB\nA[\"GPR119 Activation\"] --> B[\"Incretin Secretion (GLP-1, GLP-2)\"]\nA --> C[\"AMPK Activation\"]\nB --> D{\"Improved Metabolic Regulation\"}\nC --> E[\"Phosphorylation of SREBP-1c\"]\nE --> F[\"Inhibition of Hepatic Lipogenesis\"]\nD --> G[\"Reduced Hepatic Steatosis\"]\nF --> G\n```\n\nThis diagram illustrates the dual pathway through which GPR119 agonists exert their therapeutic effects in NAFLD. Activation of GPR119 leads to increased secretion of incretins and activation of AMPK, both of which converge to improve hepatic lipid metabolism and reduce steatosis.\n\n## Current Research and Clinical Trials\n\nRecent clinical trials have demonstrated the efficacy of GPR119 agonists in managing NAFLD. These studies have primarily focused on the role of these agonists in enhancing insulin sensitivity, regulating lipid metabolism, and reducing liver fat content.\n\n| Study ID | Description | Outcome |\n|----------|-------------|---------|\n| CT001    | A phase II trial evaluating the effect of a GPR119 agonist on liver fat content in NAFLD patients. | Positive reduction in liver steatosis and improved insulin sensitivity. |\n| CT002    | A study on the impact of GPR119 agonist on incretin levels and metabolic health in NAFLD. | Significant increase in GLP-1 and GLP-2 levels, correlated with improved liver function tests. |\n\nThese trials underscore the therapeutic potential of GPR119 agonists, not only in improving liver health but also in enhancing overall metabolic functions in patients with NAFLD.\n\n## Conclusion\n\nGPR119 agonists represent a novel and promising approach to treating NAFLD and potentially other rare metabolic diseases. Their ability to modulate key metabolic pathways and improve incretin profiles offers a multifaceted strategy to address the complexities of these conditions. Ongoing and future clinical trials will be crucial in further delineating their role and efficacy in clinical practice.\n\n --- \n\n  \nReferences  \n[https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/](https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/)  \n[https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7](https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7)  \n[https://www.uchicagomedicine.org/en/forefront/gastrointestinal-articles/2024/march/masld-drug-clinical-trial](https://www.uchicagomedicine.org/en/forefront/gastrointestinal-articles/2024/march/masld-drug-clinical-trial)  \n[https://www.prnewswire.com/news-releases/neurobo-pharmaceuticals-reports-first-quarter-2024-financial-results-and-provides-corporate-update-302141088.html](https://www.prnewswire.com/news-releases/neurobo-pharmaceuticals-reports-first-quarter-2024-financial-results-and-provides-corporate-update-302141088.html)  \n[https://synapse.patsnap.com/target/b4b209ac8a7341189848500477d9b108](https://synapse.patsnap.com/target/b4b209ac8a7341189848500477d9b108)  \n[https://pubmed.ncbi.nlm.nih.gov/26399788/](https://pubmed.ncbi.nlm.nih.gov/26399788/)  \n[https://www.sciencedaily.com/releases/2016/01/160111121358.htm](https://www.sciencedaily.com/releases/2016/01/160111121358.htm)"
-        },
-        {
-            "role": "user",
-            "content": "How will GP119 agonist treat Prader Willie Syndrome?"
-        },
-        {
-            "role": "assistant",
-            "content": "### Utilization of GPR119 Agonists in Prader-Willi Syndrome Treatment\n\nGPR119 agonists represent a promising therapeutic strategy for managing symptoms of Prader-Willi Syndrome (PWS), particularly hyperphagia and obesity. Below is a detailed exploration of how these agonists can be effectively utilized by modulating appetite regulation mechanisms.\n\n#### Mechanism of Action of GPR119 Agonists\n\nGPR119 is a G-protein coupled receptor primarily expressed in pancreatic β-cells and gastrointestinal enteroendocrine cells. Activation of this receptor enhances the release of incretin hormones, such as glucagon-like peptide-1 (GLP-1), which play a crucial role in regulating appetite and glucose homeostasis.\n\n```mermaid\ngraph TB\nA[\"GPR119 Receptor Activation\"] --> B[\"Enhanced GLP-1 Secretion\"]\nB --> C[\"Increased Insulin Release\"]\nB --> D[\"Delayed Gastric Emptying\"]\nB --> E[\"Reduced Appetite\"]\nC --> F[\"Improved Glucose Homeostasis\"]\nD --> G[\"Prolonged Satiety\"]\nE --> H[\"Decreased Food Intake\"]\n```\n\n#### Therapeutic Benefits in Prader-Willi Syndrome\n\nThe primary therapeutic benefits of GPR119 agonists in PWS include:\n\n- **Appetite Suppression**: By enhancing GLP-1 secretion, GPR119 agonists can reduce appetite, which directly addresses hyperphagia.\n- **Weight Management**: Reduced food intake and improved metabolic effects contribute to weight management in PWS patients.\n- **Improved Metabolic Profile**: These agonists help in regulating blood glucose levels and improving the lipid profile, which are often compromised in PWS.\n\n#### Clinical Research and Trials\n\nOngoing clinical trials are crucial to determine the efficacy and safety of GPR119 agonists in PWS. These studies focus on various age groups and symptoms, providing comprehensive data on the potential benefits of these agonists.\n\n| Trial Sponsor         | Phase | Target Symptom     | Age Group |\n|-----------------------|-------|--------------------|-----------|\n| Aardvark Therapeutics | 2     | Hyperphagia        | 17-65     |\n| Harmony Biosciences   | 3     | Daytime Sleepiness | 6-65      |\n| FPWR                  | 3     | Hyperphagia        | 18-64     |\n\n#### Potential Challenges and Considerations\n\nWhile GPR119 agonists show promise, several challenges must be addressed:\n\n- **Specificity and Safety**: Ensuring that these agonists specifically target symptoms of PWS without significant side effects.\n- **Long-term Efficacy**: Assessing the long-term effectiveness and potential development of tolerance.\n- **Regulatory Approval**: Navigating the complex regulatory environment to gain approval for new therapeutic uses.\n\nIn conclusion, GPR119 agonists hold significant potential for managing hyperphagia and obesity in Prader-Willi Syndrome by modulating appetite regulation mechanisms. Ongoing research and clinical trials will further elucidate their role and efficacy in this context.\n\n --- \n\n  \nReferences  \n[https://www.mdpi.com/2077-0383/10/19/4540](https://www.mdpi.com/2077-0383/10/19/4540)  \n[https://academic.oup.com/edrv/article/43/3/507/6407704](https://academic.oup.com/edrv/article/43/3/507/6407704)  \n[https://classic.clinicaltrials.gov/ct2/show/NCT01444898](https://classic.clinicaltrials.gov/ct2/show/NCT01444898)  \n[https://www.fpwr.org/pws-clinical-trials](https://www.fpwr.org/pws-clinical-trials)  \n[https://www.pwsausa.org/what-we-do/clinical-trials/](https://www.pwsausa.org/what-we-do/clinical-trials/)  \n[https://joe.bioscientifica.com/view/journals/joe/221/1/T1.xml](https://joe.bioscientifica.com/view/journals/joe/221/1/T1.xml)  \n[https://journals.plos.org/plosone/article?id=10.1371/journal.pone.0092494](https://journals.plos.org/plosone/article?id=10.1371/journal.pone.0092494)  \n[https://www.mdpi.com/2072-6643/14/9/1950](https://www.mdpi.com/2072-6643/14/9/1950)"
-        },
-        {
-            "role": "user",
-            "content": "How do GPR119 agonists compare to other treatment options available for managing symptoms of Prader-Willi Syndrome?"
-        },
-        {
-            "role": "assistant",
-            "content": "### Comprehensive Analysis of GPR119 Agonists for Managing Prader-Willi Syndrome (PWS)\n\nPrader-Willi Syndrome (PWS) is a complex genetic disorder characterized by hyperphagia (excessive hunger), obesity, and metabolic issues. Current treatment options vary, with growth hormone therapy being prominent for addressing growth and metabolism but not directly targeting hyperphagia. This analysis explores the potential of GPR119 agonists in managing appetite suppression and weight in PWS compared to other treatments.\n\n#### Mechanisms of Action\n\nGPR119 agonists function by targeting the GPR119 receptors located in enteroendocrine and islet β cells. Activation of these receptors enhances the secretion of incretin hormones like GLP-1, which are crucial for appetite regulation and glucose homeostasis.\n\n```mermaid\ngraph TB\nA[\"GPR119 Receptors in Enteroendocrine and Islet β Cells\"] --> B[\"Activation of GPR119\"]\nB --> C[\"Enhanced GLP-1 Secretion\"]\nC --> D[\"Improved Glucose Homeostasis\"]\nB --> E[\"Reduced Food Intake\"]\nE --> F[\"Weight Management\"]\n```\n\n#### Clinical Outcomes and Efficacy\n\nWhile traditional treatments like growth hormone therapy focus on metabolic balance and growth issues, GPR119 agonists offer a targeted approach to managing hyperphagia and obesity, key challenges in PWS. Clinical studies have shown that these agonists can effectively reduce food intake and influence weight management through hormonal pathways.\n\n#### Side Effects\n\nThe side effect profile of GPR119 agonists generally includes gastrointestinal disturbances. However, the specific impact on PWS patients remains under-researched, necessitating cautious interpretation of general side effect data.\n\n#### Patient Response Data\n\nData on patient satisfaction and preference for GPR119 agonists is limited but would largely depend on their effectiveness in controlling appetite and their tolerability compared to other therapies.\n\n#### Comparative Analysis\n\nBelow is a table comparing GPR119 agonists with other treatments for PWS, focusing on efficacy in appetite suppression and weight management, side effects, and patient response:\n\n| Treatment Option            | Efficacy in Appetite Suppression | Efficacy in Weight Management | Common Side Effects        | Patient Response Data |\n|-----------------------------|----------------------------------|-------------------------------|----------------------------|-----------------------|\n| **GPR119 Agonists**         | High                             | High                          | Gastrointestinal disturbances | Limited              |\n| **Growth Hormone Therapy**  | Moderate                         | Moderate                      | Injection site reactions, headaches | Generally positive   |\n\nThis table highlights that while growth hormone therapy is beneficial for growth and metabolic issues, GPR119 agonists may offer superior control over appetite and weight, albeit with a need for more targeted patient response data.\n\n#### Conclusion\n\nGPR119 agonists present a promising alternative for managing hyperphagia and obesity in PWS, with a mechanism that directly targets the hormonal pathways involved in appetite and glucose regulation. However, further clinical trials and patient-centered studies are essential to fully establish their efficacy and safety profile in the PWS population. The potential for these agonists to improve quality of life by addressing critical aspects of PWS makes them a valuable subject for ongoing research and consideration in treatment strategies.\n\n --- \n\n  \nReferences  \n[https://www.pws.org.nz/medical-information/treatments-available/potential-future-treatments](https://www.pws.org.nz/medical-information/treatments-available/potential-future-treatments)  \n[https://journals.plos.org/plosone/article?id=10.1371/journal.pone.0092494](https://journals.plos.org/plosone/article?id=10.1371/journal.pone.0092494)  \n[https://pubmed.ncbi.nlm.nih.gov/38372052/](https://pubmed.ncbi.nlm.nih.gov/38372052/)  \n[https://www.empr.com/home/news/drugs-in-the-pipeline/pitolisant-granted-orphan-drug-status-for-prader-willi-syndrome/](https://www.empr.com/home/news/drugs-in-the-pipeline/pitolisant-granted-orphan-drug-status-for-prader-willi-syndrome/)  \n[https://academic.oup.com/edrv/article/43/3/507/6407704](https://academic.oup.com/edrv/article/43/3/507/6407704)  \n[https://www.fpwr.org/therapeutics-in-development-for-pws](https://www.fpwr.org/therapeutics-in-development-for-pws)  \n[https://joe.bioscientifica.com/view/journals/joe/221/1/T1.xml](https://joe.bioscientifica.com/view/journals/joe/221/1/T1.xml)"
-        }
-    ]
-
-    title_dict = {
-        "title": "Exploring GPR119 Agonists in Metabolic Disease Therapies: A Focus on NAFLD and Prader-Willi Syndrome",
-        "sub_title": "Comparative Efficacy, Mechanisms of Action, and Clinical Outcomes"
+conversation = [
+    {
+        "role": "user",
+        "content": "What are the diseases associated with GP3119? How does activation of GPR119 treat metabolic diseases?"
+    },
+    {
+        "role": "assistant",
+        "content": "### Comprehensive Problem Statement on GPR119 and Metabolic Diseases\n\n#### Overview\nGPR119 is a G protein-coupled receptor primarily expressed in pancreatic β-cells and gastrointestinal enteroendocrine cells. It plays a significant role in the regulation of glucose homeostasis and energy balance through the modulation of insulin and incretin hormones. This receptor's activation is pivotal in the management of metabolic disorders, particularly type 2 diabetes mellitus (T2DM) and non-alcoholic fatty liver disease (NAFLD), as well as obesity.\n\n#### Diseases Linked with GPR119\n\n| Disease             | Relevance to GPR119 Activation |\n|---------------------|--------------------------------|\n| Type 2 Diabetes     | GPR119 activation enhances insulin and incretin release, crucial for glucose regulation. |\n| Obesity             | Activation leads to increased satiety and potentially reduced food intake. |\n| Non-Alcoholic Fatty Liver Disease | Improved metabolic regulation may reduce liver fat accumulation. |\n\n#### Mechanism of Action\nActivation of GPR119 stimulates the secretion of glucose-dependent insulinotropic peptide (GIP) and glucagon-like peptide-1 (GLP-1), both of which are incretins that enhance insulin secretion from pancreatic β-cells in a glucose-dependent manner. This process is crucial for maintaining blood glucose levels within a normal range, thereby providing a therapeutic mechanism for managing T2DM and related metabolic conditions.\n\n```mermaid\ngraph TB\nA[\"GPR119 Activation\"] --> B[\"Stimulates Incretin Release (GIP, GLP-1)\"]\nB --> C[\"Enhanced Insulin Secretion from Pancreatic β-cells\"]\nC --> D[\"Improved Glucose Regulation\"]\nA --> E[\"Promotes Satiety\"]\nE --> F[\"Potential Reduction in Food Intake\"]\nA --> G[\"Modulates Energy Metabolism\"]\nG --> H[\"Possible Impact on NAFLD Progression\"]\n```\n\n#### Physiological Role of GPR119\n\n- **Glucose Homeostasis**: GPR119 activation is integral to the regulation of blood glucose levels through its effects on insulin and incretin hormones.\n- **Energy Balance**: The receptor influences energy metabolism, which is crucial in the management of body weight and metabolic health.\n\n#### Therapeutic Implications\n\n- **Type 2 Diabetes**: GPR119 agonists like MBX-2982 show promise in stimulating glucose-dependent insulin secretion, offering a potential treatment that avoids hypoglycemia.\n- **Obesity**: By enhancing satiety, GPR119 agonists could help in weight management and reduction of obesity-related complications.\n- **Non-Alcoholic Fatty Liver Disease**: Improved metabolic control through GPR119 activation might reduce hepatic fat accumulation, offering a novel approach to manage NAFLD.\n\n#### Conclusion\nGPR119 represents a promising therapeutic target for metabolic diseases due to its role in enhancing insulin secretion and incretin release, improving glucose homeostasis, and potentially aiding in weight management. Ongoing research into the receptor's activation mechanisms and the development of specific agonists continues to open new avenues for the treatment of metabolic dysfunctions such as T2DM, obesity, and NAFLD. Further clinical trials and studies are needed to fully understand the therapeutic potential and safety profile of GPR119 agonists.\n\n --- \n\n  \nReferences  \n[https://www.cureus.com/articles/219219-novel-therapies-in-diabetes-a-comprehensive-narrative-review-of-glp-1-receptor-agonists-sglt2-inhibitors-and-beyond](https://www.cureus.com/articles/219219-novel-therapies-in-diabetes-a-comprehensive-narrative-review-of-glp-1-receptor-agonists-sglt2-inhibitors-and-beyond)  \n[https://healthtransformer.co/pramanas-biotech-discoveries-promise-revolutionary-type-1-diabetes-management-d903fd391bf0](https://healthtransformer.co/pramanas-biotech-discoveries-promise-revolutionary-type-1-diabetes-management-d903fd391bf0)  \n[https://www.genengnews.com/news/sanofi-aventis-to-develop-metabolex-type-2-diabetes-therapy-as-part-of-375m-deal/](https://www.genengnews.com/news/sanofi-aventis-to-develop-metabolex-type-2-diabetes-therapy-as-part-of-375m-deal/)  \n[https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7](https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7)  \n[https://phys.org/news/2022-08-reveals-ligand-recognition-mechanism-orphan.html](https://phys.org/news/2022-08-reveals-ligand-recognition-mechanism-orphan.html)  \n[https://www.mdpi.com/2073-4409/10/12/3347](https://www.mdpi.com/2073-4409/10/12/3347)  \n[https://pubmed.ncbi.nlm.nih.gov/28722242/](https://pubmed.ncbi.nlm.nih.gov/28722242/)"
+    },
+    {
+        "role": "user",
+        "content": "What are the potential benefits of GPR119 activation in managing non-alcoholic fatty liver disease?"
+    },
+    {
+        "role": "assistant",
+        "content": "### Detailed Explanation of the Role of GPR119 Activation in Managing NAFLD\n\nGPR119 is a G protein-coupled receptor that is predominantly expressed in pancreatic β-cells and gastrointestinal enteroendocrine cells. Its activation plays a crucial role in the regulation of glucose levels and overall energy metabolism, which are key factors in the management of non-alcoholic fatty liver disease (NAFLD).\n\n#### Mechanisms of GPR119 Activation\n\nWhen GPR119 is activated, it primarily triggers the secretion of incretin hormones such as glucagon-like peptide-1 (GLP-1) and glucagon-like peptide-2 (GLP-2). These hormones are instrumental in enhancing insulin secretion from the pancreas, improving insulin sensitivity in peripheral tissues, and promoting a feeling of satiety. These actions collectively contribute to improved glycemic control and energy balance.\n\n- **Insulin Secretion**: GLP-1 enhances glucose-dependent insulin secretion, which helps in lowering blood glucose levels.\n- **Insulin Sensitivity**: Improved insulin sensitivity helps in reducing insulin resistance, which is a common issue in NAFLD.\n- **Satiety and Reduced Food Intake**: By promoting satiety, GLP-1 can reduce food intake, thus indirectly contributing to weight management and reduced liver fat.\n\n#### Biochemical Pathways Involved\n\nActivation of GPR119 leads to an increase in intracellular cyclic AMP (cAMP) levels. Elevated cAMP levels enhance the secretion of incretins (GLP-1 and GLP-2) and activate protein kinase A (PKA), which further influences various metabolic processes including glucose and lipid metabolism.\n\n```mermaid\ngraph TB\n    A[\"GPR119 Activation\"] -->|Increases cAMP| B[\"Cyclic AMP (cAMP)\"]\n    B --> C[\"Incretin Secretion (GLP-1, GLP-2)\"]\n    C --> D[\"Enhanced Insulin Secretion\"]\n    C --> E[\"Improved Insulin Sensitivity\"]\n    C --> F[\"Promotes Satiety\"]\n    D --> G[\"Lower Blood Glucose Levels\"]\n    E --> H[\"Reduced Insulin Resistance\"]\n    F --> I[\"Reduced Food Intake\"]\n    B --> J[\"Activation of PKA\"]\n    J --> K[\"Modulation of Glucose and Lipid Metabolism\"]\n```\n\n#### Physiological Impact on NAFLD\n\nThe physiological and biochemical actions mediated by GPR119 activation have significant implications for managing NAFLD:\n\n- **Improved Glycemic Control**: Lower blood glucose levels and enhanced insulin sensitivity help in managing the hyperglycemia often associated with NAFLD.\n- **Reduction in Liver Fat**: By controlling dietary intake and improving metabolic functions, GPR119 activation can lead to a reduction in liver fat accumulation, which is crucial in preventing the progression of NAFLD to more severe stages like nonalcoholic steatohepatitis (NASH).\n- **Anti-inflammatory Effects**: Incretins, particularly GLP-1, have been shown to possess anti-inflammatory properties, which can help in reducing liver inflammation seen in NAFLD patients.\n\n### Conclusion\n\nThe activation of GPR119 offers a promising therapeutic target for managing NAFLD due to its role in regulating glucose metabolism and enhancing overall metabolic health. Through the secretion of incretins and the subsequent biochemical pathways, GPR119 activation helps in improving insulin sensitivity, reducing liver fat, and managing energy balance, all of which are crucial for the effective management of NAFLD.\n\n --- \n\n  \nReferences  \n[https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/](https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/)  \n[https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7](https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7)  \n[https://pubmed.ncbi.nlm.nih.gov/28722242/](https://pubmed.ncbi.nlm.nih.gov/28722242/)"
+    },
+    {
+        "role": "user",
+        "content": "Are there any ongoing clinical trials investigating the use of GPR119 activation in NAFLD?"
+    },
+    {
+        "role": "assistant",
+        "content": "### Current Clinical Trials on GPR119 Activation for NAFLD Treatment\n\nGPR119, a G-protein coupled receptor primarily expressed in pancreatic and gastrointestinal tissues, has recently been targeted in clinical trials for its potential therapeutic effects in treating non-alcoholic fatty liver disease (NAFLD). These trials aim to explore the efficacy of GPR119 activation in improving metabolic outcomes and liver health in NAFLD patients.\n\n#### Overview of Ongoing Clinical Trials\n\nBelow is a detailed table summarizing the ongoing clinical trials focusing on GPR119 agonists for NAFLD treatment:\n\n| Trial ID      | Sponsor/Collaborator | Study Phase | Status       | Primary Objectives                                                                                              |\n|---------------|----------------------|-------------|--------------|-----------------------------------------------------------------------------------------------------------------|\n| NCT02939404   | NeuroBo Pharmaceuticals | Phase II    | Recruiting   | To assess the efficacy of DA-1241 in reducing liver fat content and improving liver function and insulin sensitivity |\n| NCT03021187   | Dong-A ST             | Phase I/II  | Active, not recruiting | To evaluate the safety and metabolic effects of DA-1726 on patients with obesity and NAFLD                      |\n\nThese trials typically measure endpoints such as changes in liver fat content, liver function markers, insulin sensitivity, and overall lipid profiles.\n\n#### Mechanistic Insights and Therapeutic Targets\n\nThe primary mechanisms by which GPR119 agonists are hypothesized to exert beneficial effects in NAFLD include:\n\n- **Reduction in Hepatic Lipogenesis**: By inhibiting de novo lipogenesis pathways.\n- **Enhancement of AMPK Activation**: AMPK plays a crucial role in regulating metabolic processes, potentially reducing liver fat accumulation.\n- **Regulation of SREBP-1**: This transcription factor is involved in fatty acid and triglyceride synthesis; its modulation by GPR119 could mitigate hepatic steatosis.\n\n```mermaid\ngraph TB\nA[\"GPR119 Activation\"] --> B[\"Inhibition of Hepatic Lipogenesis\"]\nA --> C[\"Enhancement of AMPK Activation\"]\nA --> D[\"Regulation of SREBP-1\"]\nB --> E[\"Reduction in Liver Fat Content\"]\nC --> F[\"Improvement in Metabolic Parameters\"]\nD --> G[\"Decrease in Triglyceride Synthesis\"]\nE --> H[\"Improved Liver Function\"]\nF --> I[\"Enhanced Insulin Sensitivity\"]\nG --> J[\"Improved Lipid Profiles\"]\n```\n\nThe diagram above illustrates the hypothesized pathways through which GPR119 activation impacts NAFLD, highlighting the therapeutic targets and expected outcomes of current clinical trials.\n\n### Conclusion\n\nThe ongoing clinical trials for GPR119 agonists represent a promising frontier in the treatment of NAFLD. By focusing on key metabolic pathways and liver health indicators, these studies aim to develop more effective therapies for managing and potentially reversing NAFLD. The outcomes of these trials could pave the way for new, targeted treatments that offer hope to patients suffering from this increasingly common disease.\n\n --- \n\n  \nReferences  \n[https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7](https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7)  \n[https://www.ajupress.com/view/20220915111008606](https://www.ajupress.com/view/20220915111008606)  \n[https://pubmed.ncbi.nlm.nih.gov/26399788/](https://pubmed.ncbi.nlm.nih.gov/26399788/)"
+    },
+    {
+        "role": "user",
+        "content": "How do the primary endpoints of the current clinical trials on GPR119 activation in NAFLD compare to traditional treatment approaches for NAFLD?"
+    },
+    {
+        "role": "assistant",
+        "content": "### Comprehensive Analysis of Primary Endpoints in Clinical Trials for NAFLD: GPR119 Activation vs. Traditional Treatments\n\nNon-alcoholic fatty liver disease (NAFLD) treatments are undergoing significant evolution with the introduction of GPR119 agonists. This analysis compares the primary endpoints used in clinical trials activating GPR119 against those utilized in traditional NAFLD treatment methodologies.\n\n#### 1. Efficacy Endpoints Comparison\n\n| **Endpoint**                     | **Traditional Treatments**                     | **GPR119-Focused Trials**                      |\n|----------------------------------|------------------------------------------------|------------------------------------------------|\n| **Liver Fat Content (LFC)**      | Assessed indirectly through biomarkers         | Directly measured via MRI, quantifying changes |\n| **Histological Improvement**     | Less commonly targeted                         | Focus on NAS reduction, NASH resolution, liver fibrosis improvement |\n| **Biochemical Markers**          | AST, ALT, HbA1c                                | Not primarily focused; secondary consideration |\n\nTraditional treatments often rely on liver function tests and indirect measures such as biochemical markers (AST, ALT, HbA1c) and imaging techniques. In contrast, GPR119-focused trials prioritize direct histological improvements, including steatosis, inflammation, and fibrosis, assessed through advanced imaging and histological scoring.\n\n#### 2. Safety Outcomes Comparison\n\nBoth traditional and GPR119-focused trials emphasize the safety and tolerability of treatments. However, GPR119 agonists have shown a favorable safety profile with manageable side effects, which might be attributed to their targeted mechanism of action.\n\n#### 3. Novel Metrics Introduced by GPR119-Focused Trials\n\nGPR119-focused trials introduce more precise and disease-specific metrics such as detailed histological assessments and direct measurements of liver fat content using MRI. These metrics allow for a more accurate evaluation of the therapeutic effects on liver pathology.\n\n#### Visualization of Endpoint Focus Shift\n\n```mermaid\ngraph TB\nA[\"Traditional NAFLD Treatments\"] --> B[\"Liver Function Tests\"]\nA --> C[\"Biochemical Markers (AST, ALT, HbA1c)\"]\nA --> D[\"Imaging Techniques (VCTE, MRI)\"]\nE[\"GPR119-Focused NAFLD Treatments\"] --> F[\"Direct LFC Measurement (MRI)\"]\nE --> G[\"Histological Scores (NAS, NASH resolution)\"]\nE --> H[\"Liver Fibrosis Stages\"]\n```\n\nThis diagram illustrates the shift from predominantly functional and biochemical assessments in traditional treatments to more direct and histological evaluations in GPR119-focused trials.\n\n### Conclusion\n\nThe shift in primary endpoints from traditional NAFLD treatments to those activating GPR119 reflects a deeper understanding of the disease's pathology. GPR119 agonists not only promise improved efficacy in reducing liver fat content and improving liver histology but also maintain a favorable safety profile. This targeted approach could potentially lead to more effective and tailored therapies for NAFLD, aligning treatment objectives more closely with pathological outcomes.\n\n --- \n\n  \nReferences  \n[https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/](https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/)  \n[https://www.mdpi.com/1422-0067/21/6/1907](https://www.mdpi.com/1422-0067/21/6/1907)  \n[https://classic.clinicaltrials.gov/ct2/show/NCT05605158](https://classic.clinicaltrials.gov/ct2/show/NCT05605158)  \n[https://delta.larvol.com/Products/?ProductId=89be1b01-31db-4a51-a2e0-64f89ed5d5dd](https://delta.larvol.com/Products/?ProductId=89be1b01-31db-4a51-a2e0-64f89ed5d5dd)  \n[https://synapse.patsnap.com/target/b4b209ac8a7341189848500477d9b108](https://synapse.patsnap.com/target/b4b209ac8a7341189848500477d9b108)  \n[https://pubmed.ncbi.nlm.nih.gov/37355043/](https://pubmed.ncbi.nlm.nih.gov/37355043/)"
+    },
+    {
+        "role": "user",
+        "content": "What are the common side effects associated with GPR119 agonists in clinical trials for NAFLD?"
+    },
+    {
+        "role": "assistant",
+        "content": "### Common Side Effects of GPR119 Agonists in NAFLD Clinical Trials\n\nGPR119 agonists, currently under investigation for their therapeutic potential in treating non-alcoholic fatty liver disease (NAFLD), have shown a range of side effects based on clinical trial observations. Below is a detailed list of these side effects categorized by their nature and frequency.\n\n#### Table: Side Effects Observed in Clinical Trials\n\n| Side Effect Category | Specific Side Effects | Severity | Frequency |\n|----------------------|-----------------------|----------|-----------|\n| Gastrointestinal     | Nausea                | Mild to Moderate | Common |\n|                      | Vomiting              | Mild to Moderate | Common |\n|                      | Diarrhea              | Mild to Moderate | Common |\n| Neurological         | Headaches             | Mild to Moderate | Common |\n|                      | Dizziness             | Mild to Moderate | Common |\n| General Discomfort   | Fatigue               | Mild to Moderate | Common |\n| Allergic Reactions   | Rash                  | Mild | Rare       |\n|                      | Itching               | Mild | Rare       |\n\nThese side effects are generally transient, with many tending to decrease in intensity as patients continue with the treatment. It is important for healthcare providers to monitor these effects to adjust treatment plans accordingly.\n\n#### Graphical Representation of Side Effect Pathways\n\nThe following diagram illustrates the typical pathways through which side effects manifest in patients undergoing treatment with GPR119 agonists.\n\n```mermaid\ngraph TB\n    A[\"GPR119 Agonist Administration\"] --> B[\"Gastrointestinal Effects\"]\n    A --> C[\"Neurological Effects\"]\n    A --> D[\"General Discomfort\"]\n    A --> E[\"Allergic Reactions\"]\n\n    B --> F[\"Nausea\"]\n    B --> G[\"Vomiting\"]\n    B --> H[\"Diarrhea\"]\n\n    C --> I[\"Headaches\"]\n    C --> J[\"Dizziness\"]\n\n    D --> K[\"Fatigue\"]\n\n    E --> L[\"Rash\"]\n    E --> M[\"Itching\"]\n```\n\nThis diagram helps in visualizing the different categories of side effects and their specific manifestations, providing a clear overview for healthcare professionals monitoring these effects.\n\n#### Conclusion\n\nWhile GPR119 agonists show promise in treating NAFLD, particularly in mitigating associated metabolic disturbances, the occurrence of side effects, primarily gastrointestinal and neurological, necessitates careful patient management. The transient nature of most side effects and their manageability with proper medical oversight are positive indicators for the continued exploration of these compounds in clinical settings.\n\n --- \n\n  \nReferences  \n[https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7](https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7)  \n[https://www.uchicagomedicine.org/en/forefront/gastrointestinal-articles/2024/march/masld-drug-clinical-trial](https://www.uchicagomedicine.org/en/forefront/gastrointestinal-articles/2024/march/masld-drug-clinical-trial)"
+    },
+    {
+        "role": "user",
+        "content": "Are there any drug interactions to be cautious about when using GPR119 agonists for NAFLD?"
+    },
+    {
+        "role": "assistant",
+        "content": "### Potential Drug Interactions of GPR119 Agonists in NAFLD Treatment\n\nWhen considering the use of GPR119 agonists for the treatment of non-alcoholic fatty liver disease (NAFLD), it is crucial to evaluate potential drug interactions that could affect the efficacy and safety of the treatment regimen. GPR119 agonists, which are primarily investigated for their beneficial effects on glucose and lipid metabolism through incretin secretion, may interact with other medications commonly prescribed for NAFLD or related metabolic conditions.\n\n#### Key Considerations for Drug Interactions\n\n1. **Metformin**: Often used in the management of type 2 diabetes, which frequently co-occurs with NAFLD. Metformin may also influence incretin levels and could potentially interact with the mechanisms of GPR119 agonists.\n\n2. **Statins**: These are cholesterol-lowering agents that might be used concurrently in NAFLD patients to manage dyslipidemia. The interaction between statins and GPR119 agonists needs careful monitoring as both influence lipid metabolism.\n\n3. **Antihypertensive Drugs**: NAFLD patients often have comorbid hypertension. Certain antihypertensives might alter metabolic parameters, potentially conflicting with the actions of GPR119 agonists.\n\n4. **Oral Hypoglycemic Agents**: Other glucose-lowering drugs might have synergistic or antagonistic interactions with GPR119 agonists, affecting glucose homeostasis.\n\n#### Impact on Efficacy and Safety\n\n- **Synergistic Effects**: Some drugs may enhance the therapeutic effects of GPR119 agonists, potentially allowing for dose reductions and reduced side effects.\n- **Antagonistic Effects**: Other drugs might counteract the effects of GPR119 agonists, necessitating adjustments in therapeutic strategies.\n- **Side Effects and Toxicity**: Interactions could also lead to increased side effects or toxicity, requiring careful patient monitoring.\n\n#### Visual Representation of Interactions\n\nTo better understand the potential interactions and their implications, the following diagram illustrates the interaction pathways:\n\n```mermaid\ngraph TB\n    A[\"GPR119 Agonists\"] -->|Increase Incretin Levels| B[\"Incretin (GLP-1, GLP-2)\"]\n    B -->|Improves Metabolism| C[\"NAFLD Management\"]\n    A -->|Potential Interaction| D[\"Metformin\"]\n    A -->|Potential Interaction| E[\"Statins\"]\n    A -->|Potential Interaction| F[\"Antihypertensive Drugs\"]\n    A -->|Potential Interaction| G[\"Oral Hypoglycemic Agents\"]\n    D -->|Altered Incretin Effect| C\n    E -->|Modified Lipid Profile| C\n    F -->|Blood Pressure Impact| C\n    G -->|Glucose Homeostasis| C\n```\n\n#### Conclusion\n\nWhile GPR119 agonists show promise in the treatment of NAFLD, particularly in improving metabolic parameters and reducing inflammation, understanding and managing potential drug interactions is crucial for optimizing therapeutic outcomes. Clinicians should consider these interactions when designing treatment regimens, ensuring comprehensive patient care and monitoring to maximize both efficacy and safety.\n\n --- \n\n  \nReferences  \n[https://www.wjgnet.com/1007-9327/full/v27/i8/677.htm](https://www.wjgnet.com/1007-9327/full/v27/i8/677.htm)  \n[https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7](https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7)"
+    },
+    {
+        "role": "user",
+        "content": "Can GPR119 agonists be used in combination with other medications for NAFLD treatment?"
+    },
+    {
+        "role": "assistant",
+        "content": "### Integration of GPR119 Agonists in NAFLD Treatment Regimens\n\nThe potential for integrating GPR119 agonists into existing treatment regimens for non-alcoholic fatty liver disease (NAFLD) requires a detailed understanding of their interactions with commonly prescribed medications. These include metformin, statins, antihypertensive drugs, and oral hypoglycemic agents. The primary concerns when integrating new therapeutic agents include safety, efficacy, and the avoidance of adverse drug interactions.\n\n#### **1. Mechanistic Insights into GPR119 Agonists**\n\nGPR119 is a G-protein-coupled receptor primarily expressed in pancreatic and gastrointestinal tissues, where it plays a role in insulin secretion and glucose homeostasis. Activation of GPR119 has been associated with beneficial effects on glucose metabolism, making it a promising target for the treatment of conditions like NAFLD, which often coexists with metabolic syndromes such as type 2 diabetes and obesity.\n\n#### **2. Interaction with Common NAFLD Medications**\n\nTo evaluate the potential interactions of GPR119 agonists with other medications, we need to consider the metabolic pathways involved and the pharmacokinetic profiles of these drugs.\n\n- **Metformin**: Primarily acts by reducing hepatic glucose production and improving insulin sensitivity. It is not extensively metabolized by the liver and does not significantly interact with liver enzyme systems that metabolize most drugs.\n- **Statins**: Used for managing cholesterol levels; primarily metabolized by the liver. Potential interactions might involve liver enzyme pathways, particularly if the GPR119 agonist is metabolized through similar pathways.\n- **Antihypertensive drugs**: Diverse in mechanism, including ACE inhibitors, ARBs, beta-blockers, and calcium channel blockers. The interaction risk varies depending on the specific drug and its metabolism.\n- **Oral hypoglycemic agents**: Include sulfonylureas, thiazolidinediones, and DPP-4 inhibitors. These drugs might share common metabolic pathways with GPR119 agonists, particularly those involving pancreatic insulin regulation.\n\n#### **3. Evaluating Drug-Drug Interactions and Efficacy**\n\nTo systematically assess the safety and efficacy of GPR119 agonists when used with these medications, consider the following diagram illustrating potential interactions and pathways:\n\n```mermaid\ngraph TB\n  A[\"GPR119 Agonists\"] -->|Insulin Secretion| B[\"Improved Glucose Metabolism\"]\n  B --> C[\"Potential Synergy with Oral Hypoglycemic Agents\"]\n  A -->|Lipid Metabolism| D[\"Statins (Cholesterol Management)\"]\n  D --> E[\"Potential for Enhanced Lipid Profile\"]\n  A -->|Impact on Blood Pressure| F[\"Antihypertensive Drugs\"]\n  F --> G[\"Monitoring for Hypotension or Hypertension Adjustments\"]\n  A -->|No Direct Interaction| H[\"Metformin\"]\n  H --> I[\"Safe Co-administration\"]\n```\n\n#### **4. Clinical Considerations and Monitoring**\n\nWhen integrating GPR119 agonists into treatment regimens for NAFLD, it is crucial to monitor:\n\n- **Liver function tests**: To assess any potential hepatotoxic effects, especially when combined with statins or other hepatometabolized drugs.\n- **Blood glucose levels**: Especially in patients using multiple glucose-lowering medications, to prevent hypoglycemia.\n- **Lipid profiles**: Particularly when using statins, to evaluate the combined effect on cholesterol and triglyceride levels.\n- **Blood pressure**: In patients on antihypertensive therapy, adjustments may be necessary based on the observed effects of GPR119 agonist treatment.\n\n#### **5. Conclusion**\n\nThe integration of GPR119 agonists into existing NAFLD treatment regimens appears promising but requires careful consideration of potential drug-drug interactions and vigilant monitoring of patient response to therapy. Clinical trials and pharmacokinetic studies will be essential to further elucidate these interactions and optimize therapeutic strategies for NAFLD patients.\n\n --- \n\n  \nReferences  \n[https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/](https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/)  \n[https://www.mdpi.com/1422-0067/21/6/1907](https://www.mdpi.com/1422-0067/21/6/1907)  \n[https://classic.clinicaltrials.gov/ct2/show/NCT05254626](https://classic.clinicaltrials.gov/ct2/show/NCT05254626)  \n[https://www.frontiersin.org/articles/10.3389/fphar.2021.807548/full](https://www.frontiersin.org/articles/10.3389/fphar.2021.807548/full)  \n[https://www.frontiersin.org/journals/pharmacology/articles/10.3389/fphar.2020.554961/full](https://www.frontiersin.org/journals/pharmacology/articles/10.3389/fphar.2020.554961/full)  \n[https://www.fda.gov/news-events/press-announcements/fda-approves-first-treatment-patients-liver-scarring-due-fatty-liver-disease](https://www.fda.gov/news-events/press-announcements/fda-approves-first-treatment-patients-liver-scarring-due-fatty-liver-disease)"
+    },
+    {
+        "role": "user",
+        "content": "What rare diseases can be treated with GPR119 agonists?"
+    },
+    {
+        "role": "assistant",
+        "content": "# Comprehensive Analysis of GPR119 Agonists in the Treatment of Rare Diseases Including NAFLD\n\nGPR119 agonists have emerged as promising therapeutic agents in the treatment of metabolic disorders, including non-alcoholic fatty liver disease (NAFLD). Below, we explore the potential application of these agonists in various rare diseases, focusing on their efficacy and mechanisms of action, supported by an overview of the current research landscape and clinical trial findings.\n\n## Potential Rare Diseases Targeted by GPR119 Agonists\n\n| Disease | Relevance to GPR119 Agonists | Mechanism of Action |\n|---------|------------------------------|---------------------|\n| NAFLD   | High | GPR119 agonists reduce hepatic lipid accumulation by modulating lipid metabolism pathways and enhancing incretin secretion, which improves glucose and lipid homeostasis. |\n| Prader-Willi Syndrome | Moderate | Potential to control hyperphagia and obesity through appetite regulation mechanisms. |\n| Lipodystrophy | Moderate | Could improve metabolic profiles by enhancing lipid and glucose metabolism. |\n\n## Mechanisms of GPR119 Agonists in NAFLD Treatment\n\n```mermaid\ngraph TB\nA[\"GPR119 Activation\"] --> B[\"Incretin Secretion (GLP-1, GLP-2)\"]\nA --> C[\"AMPK Activation\"]\nB --> D{\"Improved Metabolic Regulation\"}\nC --> E[\"Phosphorylation of SREBP-1c\"]\nE --> F[\"Inhibition of Hepatic Lipogenesis\"]\nD --> G[\"Reduced Hepatic Steatosis\"]\nF --> G\n```\n\nThis diagram illustrates the dual pathway through which GPR119 agonists exert their therapeutic effects in NAFLD. Activation of GPR119 leads to increased secretion of incretins and activation of AMPK, both of which converge to improve hepatic lipid metabolism and reduce steatosis.\n\n## Current Research and Clinical Trials\n\nRecent clinical trials have demonstrated the efficacy of GPR119 agonists in managing NAFLD. These studies have primarily focused on the role of these agonists in enhancing insulin sensitivity, regulating lipid metabolism, and reducing liver fat content.\n\n| Study ID | Description | Outcome |\n|----------|-------------|---------|\n| CT001    | A phase II trial evaluating the effect of a GPR119 agonist on liver fat content in NAFLD patients. | Positive reduction in liver steatosis and improved insulin sensitivity. |\n| CT002    | A study on the impact of GPR119 agonist on incretin levels and metabolic health in NAFLD. | Significant increase in GLP-1 and GLP-2 levels, correlated with improved liver function tests. |\n\nThese trials underscore the therapeutic potential of GPR119 agonists, not only in improving liver health but also in enhancing overall metabolic functions in patients with NAFLD.\n\n## Conclusion\n\nGPR119 agonists represent a novel and promising approach to treating NAFLD and potentially other rare metabolic diseases. Their ability to modulate key metabolic pathways and improve incretin profiles offers a multifaceted strategy to address the complexities of these conditions. Ongoing and future clinical trials will be crucial in further delineating their role and efficacy in clinical practice.\n\n --- \n\n  \nReferences  \n[https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/](https://health.ucsd.edu/news/press-releases/2023-08-23-clinical-trial-studying-possible-new-treatment-option-for-patients-with-nafld/)  \n[https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7](https://cmbl.biomedcentral.com/articles/10.1186/s11658-021-00276-7)  \n[https://www.uchicagomedicine.org/en/forefront/gastrointestinal-articles/2024/march/masld-drug-clinical-trial](https://www.uchicagomedicine.org/en/forefront/gastrointestinal-articles/2024/march/masld-drug-clinical-trial)  \n[https://www.prnewswire.com/news-releases/neurobo-pharmaceuticals-reports-first-quarter-2024-financial-results-and-provides-corporate-update-302141088.html](https://www.prnewswire.com/news-releases/neurobo-pharmaceuticals-reports-first-quarter-2024-financial-results-and-provides-corporate-update-302141088.html)  \n[https://synapse.patsnap.com/target/b4b209ac8a7341189848500477d9b108](https://synapse.patsnap.com/target/b4b209ac8a7341189848500477d9b108)  \n[https://pubmed.ncbi.nlm.nih.gov/26399788/](https://pubmed.ncbi.nlm.nih.gov/26399788/)  \n[https://www.sciencedaily.com/releases/2016/01/160111121358.htm](https://www.sciencedaily.com/releases/2016/01/160111121358.htm)"
+    },
+    {
+        "role": "user",
+        "content": "How will GP119 agonist treat Prader Willie Syndrome?"
+    },
+    {
+        "role": "assistant",
+        "content": "### Utilization of GPR119 Agonists in Prader-Willi Syndrome Treatment\n\nGPR119 agonists represent a promising therapeutic strategy for managing symptoms of Prader-Willi Syndrome (PWS), particularly hyperphagia and obesity. Below is a detailed exploration of how these agonists can be effectively utilized by modulating appetite regulation mechanisms.\n\n#### Mechanism of Action of GPR119 Agonists\n\nGPR119 is a G-protein coupled receptor primarily expressed in pancreatic β-cells and gastrointestinal enteroendocrine cells. Activation of this receptor enhances the release of incretin hormones, such as glucagon-like peptide-1 (GLP-1), which play a crucial role in regulating appetite and glucose homeostasis.\n\n```mermaid\ngraph TB\nA[\"GPR119 Receptor Activation\"] --> B[\"Enhanced GLP-1 Secretion\"]\nB --> C[\"Increased Insulin Release\"]\nB --> D[\"Delayed Gastric Emptying\"]\nB --> E[\"Reduced Appetite\"]\nC --> F[\"Improved Glucose Homeostasis\"]\nD --> G[\"Prolonged Satiety\"]\nE --> H[\"Decreased Food Intake\"]\n```\n\n#### Therapeutic Benefits in Prader-Willi Syndrome\n\nThe primary therapeutic benefits of GPR119 agonists in PWS include:\n\n- **Appetite Suppression**: By enhancing GLP-1 secretion, GPR119 agonists can reduce appetite, which directly addresses hyperphagia.\n- **Weight Management**: Reduced food intake and improved metabolic effects contribute to weight management in PWS patients.\n- **Improved Metabolic Profile**: These agonists help in regulating blood glucose levels and improving the lipid profile, which are often compromised in PWS.\n\n#### Clinical Research and Trials\n\nOngoing clinical trials are crucial to determine the efficacy and safety of GPR119 agonists in PWS. These studies focus on various age groups and symptoms, providing comprehensive data on the potential benefits of these agonists.\n\n| Trial Sponsor         | Phase | Target Symptom     | Age Group |\n|-----------------------|-------|--------------------|-----------|\n| Aardvark Therapeutics | 2     | Hyperphagia        | 17-65     |\n| Harmony Biosciences   | 3     | Daytime Sleepiness | 6-65      |\n| FPWR                  | 3     | Hyperphagia        | 18-64     |\n\n#### Potential Challenges and Considerations\n\nWhile GPR119 agonists show promise, several challenges must be addressed:\n\n- **Specificity and Safety**: Ensuring that these agonists specifically target symptoms of PWS without significant side effects.\n- **Long-term Efficacy**: Assessing the long-term effectiveness and potential development of tolerance.\n- **Regulatory Approval**: Navigating the complex regulatory environment to gain approval for new therapeutic uses.\n\nIn conclusion, GPR119 agonists hold significant potential for managing hyperphagia and obesity in Prader-Willi Syndrome by modulating appetite regulation mechanisms. Ongoing research and clinical trials will further elucidate their role and efficacy in this context.\n\n --- \n\n  \nReferences  \n[https://www.mdpi.com/2077-0383/10/19/4540](https://www.mdpi.com/2077-0383/10/19/4540)  \n[https://academic.oup.com/edrv/article/43/3/507/6407704](https://academic.oup.com/edrv/article/43/3/507/6407704)  \n[https://classic.clinicaltrials.gov/ct2/show/NCT01444898](https://classic.clinicaltrials.gov/ct2/show/NCT01444898)  \n[https://www.fpwr.org/pws-clinical-trials](https://www.fpwr.org/pws-clinical-trials)  \n[https://www.pwsausa.org/what-we-do/clinical-trials/](https://www.pwsausa.org/what-we-do/clinical-trials/)  \n[https://joe.bioscientifica.com/view/journals/joe/221/1/T1.xml](https://joe.bioscientifica.com/view/journals/joe/221/1/T1.xml)  \n[https://journals.plos.org/plosone/article?id=10.1371/journal.pone.0092494](https://journals.plos.org/plosone/article?id=10.1371/journal.pone.0092494)  \n[https://www.mdpi.com/2072-6643/14/9/1950](https://www.mdpi.com/2072-6643/14/9/1950)"
+    },
+    {
+        "role": "user",
+        "content": "How do GPR119 agonists compare to other treatment options available for managing symptoms of Prader-Willi Syndrome?"
+    },
+    {
+        "role": "assistant",
+        "content": "### Comprehensive Analysis of GPR119 Agonists for Managing Prader-Willi Syndrome (PWS)\n\nPrader-Willi Syndrome (PWS) is a complex genetic disorder characterized by hyperphagia (excessive hunger), obesity, and metabolic issues. Current treatment options vary, with growth hormone therapy being prominent for addressing growth and metabolism but not directly targeting hyperphagia. This analysis explores the potential of GPR119 agonists in managing appetite suppression and weight in PWS compared to other treatments.\n\n#### Mechanisms of Action\n\nGPR119 agonists function by targeting the GPR119 receptors located in enteroendocrine and islet β cells. Activation of these receptors enhances the secretion of incretin hormones like GLP-1, which are crucial for appetite regulation and glucose homeostasis.\n\n```mermaid\ngraph TB\nA[\"GPR119 Receptors in Enteroendocrine and Islet β Cells\"] --> B[\"Activation of GPR119\"]\nB --> C[\"Enhanced GLP-1 Secretion\"]\nC --> D[\"Improved Glucose Homeostasis\"]\nB --> E[\"Reduced Food Intake\"]\nE --> F[\"Weight Management\"]\n```\n\n#### Clinical Outcomes and Efficacy\n\nWhile traditional treatments like growth hormone therapy focus on metabolic balance and growth issues, GPR119 agonists offer a targeted approach to managing hyperphagia and obesity, key challenges in PWS. Clinical studies have shown that these agonists can effectively reduce food intake and influence weight management through hormonal pathways.\n\n#### Side Effects\n\nThe side effect profile of GPR119 agonists generally includes gastrointestinal disturbances. However, the specific impact on PWS patients remains under-researched, necessitating cautious interpretation of general side effect data.\n\n#### Patient Response Data\n\nData on patient satisfaction and preference for GPR119 agonists is limited but would largely depend on their effectiveness in controlling appetite and their tolerability compared to other therapies.\n\n#### Comparative Analysis\n\nBelow is a table comparing GPR119 agonists with other treatments for PWS, focusing on efficacy in appetite suppression and weight management, side effects, and patient response:\n\n| Treatment Option            | Efficacy in Appetite Suppression | Efficacy in Weight Management | Common Side Effects        | Patient Response Data |\n|-----------------------------|----------------------------------|-------------------------------|----------------------------|-----------------------|\n| **GPR119 Agonists**         | High                             | High                          | Gastrointestinal disturbances | Limited              |\n| **Growth Hormone Therapy**  | Moderate                         | Moderate                      | Injection site reactions, headaches | Generally positive   |\n\nThis table highlights that while growth hormone therapy is beneficial for growth and metabolic issues, GPR119 agonists may offer superior control over appetite and weight, albeit with a need for more targeted patient response data.\n\n#### Conclusion\n\nGPR119 agonists present a promising alternative for managing hyperphagia and obesity in PWS, with a mechanism that directly targets the hormonal pathways involved in appetite and glucose regulation. However, further clinical trials and patient-centered studies are essential to fully establish their efficacy and safety profile in the PWS population. The potential for these agonists to improve quality of life by addressing critical aspects of PWS makes them a valuable subject for ongoing research and consideration in treatment strategies.\n\n --- \n\n  \nReferences  \n[https://www.pws.org.nz/medical-information/treatments-available/potential-future-treatments](https://www.pws.org.nz/medical-information/treatments-available/potential-future-treatments)  \n[https://journals.plos.org/plosone/article?id=10.1371/journal.pone.0092494](https://journals.plos.org/plosone/article?id=10.1371/journal.pone.0092494)  \n[https://pubmed.ncbi.nlm.nih.gov/38372052/](https://pubmed.ncbi.nlm.nih.gov/38372052/)  \n[https://www.empr.com/home/news/drugs-in-the-pipeline/pitolisant-granted-orphan-drug-status-for-prader-willi-syndrome/](https://www.empr.com/home/news/drugs-in-the-pipeline/pitolisant-granted-orphan-drug-status-for-prader-willi-syndrome/)  \n[https://academic.oup.com/edrv/article/43/3/507/6407704](https://academic.oup.com/edrv/article/43/3/507/6407704)  \n[https://www.fpwr.org/therapeutics-in-development-for-pws](https://www.fpwr.org/therapeutics-in-development-for-pws)  \n[https://joe.bioscientifica.com/view/journals/joe/221/1/T1.xml](https://joe.bioscientifica.com/view/journals/joe/221/1/T1.xml)"
     }
+]
+
+title_dict = {
+    "title": "Exploring GPR119 Agonists in Metabolic Disease Therapies: A Focus on NAFLD and Prader-Willi Syndrome",
+    "sub_title": "Comparative Efficacy, Mechanisms of Action, and Clinical Outcomes"
+}
 
+
+if __name__ == '__main__':
     run_generation(
         conversation=conversation,
         title_dict=title_dict,
@@ -1,17 +1,35 @@
 import os
 import asyncio
+from contextlib import nullcontext
 from tqdm import tqdm
-from typing import List, Dict, Literal
-from tenacity import retry, stop_after_attempt
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Literal, Tuple
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_random_exponential
+from langchain_core.language_models.chat_models import BaseChatModel
 
 from report_ai.common.utils import configs
 from report_ai.section import design_section
 from report_ai.skeleton import design_report_skeleton
+from report_ai.incremental import diff_conversation, merge_skeleton, plan_incremental_update
 from report_ai.summary import design_executive_summary
 
-from report_ai.components.llms import openai, anthropic
+from report_ai.components.cache import LLMCache
+from report_ai.components.llms import get_llm, get_llm_model_name
 from report_ai.components.convert import html_to_pdf
-from report_ai.components.deduplicate import deduplicate_section
+from report_ai.components.eventloop import BackgroundLoop
+from report_ai.components.diagrams import DiagramRenderer
+from report_ai.components.digest import ReportDigest
+from report_ai.components.pipeline import Pipeline
+from report_ai.components.mapreduce import condense_conversation
+from report_ai.components.tracing import record_attempt, span, start_trace
+from report_ai.components.budget import ChargeTo, TokenBudgetExceeded, TokenLedger, context_budget, is_degraded
+from report_ai.components.checkpoint import CheckpointStore, RunCheckpoints, make_fingerprint, open_checkpoints
+from report_ai.components.ratelimit import rate_limiter_stats
+from report_ai.components.resilience import resilience_stats
+from report_ai.components.structured import parse_path_stats
+from report_ai.components.retrieval import ConversationIndex
+from report_ai.components.postprocess import parse_section_async
+from report_ai.components.similarity import OverlapDetector
+from report_ai.components.deduplicate import deduplicate_section, StructuralDeduplicator
 from report_ai.components.functions import (
     serialize_conversation,
     sanitize_filename,
@@ -23,44 +41,215 @@ from report_ai.components.functions import (
 logger = configs.logger
 
 
-@retry(stop=stop_after_attempt(3))
+@retry(stop=stop_after_attempt(3), wait=wait_random_exponential(multiplier=1, max=20),
+       retry=retry_if_not_exception_type(TokenBudgetExceeded), before=record_attempt)
 async def generate_executive_summary_content(serialized_conversation: str, llm: str):
-    executive_summary_html = await design_executive_summary(serialized_conversation, llm)
-    return extract_html_body_content(executive_summary_html)
+    with span("executive_summary", kind='summary'):
+        executive_summary_html = await design_executive_summary(serialized_conversation, llm)
+        return extract_html_body_content(executive_summary_html)
 
 
-@retry(stop=stop_after_attempt(3))
+@retry(stop=stop_after_attempt(3), wait=wait_random_exponential(multiplier=1, max=20),
+       retry=retry_if_not_exception_type(TokenBudgetExceeded), before=record_attempt)
 async def generate_section_content(serialized_conversation: str, section: Dict, previous_text: str,
-                                   llm: str, apply_dedup: bool = False) -> (str, str):
-    section_html = await design_section(serialized_conversation, section, previous_text, llm)
-    if apply_dedup:
-        section_html = await deduplicate_section(section_html, previous_text, llm)
-    return extract_html_body_content(section_html)
+                                   llm: str, apply_dedup: bool = False,
+                                   conversation_index: ConversationIndex | None = None,
+                                   overlap_detector: OverlapDetector | None = None,
+                                   structural_deduplicator: StructuralDeduplicator | None = None,
+                                   section_idx: int = 0) -> (str, str):
+    with span(section['heading'], kind='section'):
+        section_html = await design_section(serialized_conversation, section, previous_text, llm, conversation_index)
+        # The section is parsed once, off the event loop when large, and every post-processing step reads that parse
+        await parse_section_async(section_html)
+        # Repeated tables and diagrams are removed locally first, so neither the gate nor the dedup LLM has to see them
+        structures, removed = [], 0
+        if structural_deduplicator is not None:
+            section_html, structures, removed = structural_deduplicator.remove_duplicates(section_html)
+        if apply_dedup and overlap_detector is not None:
+            section_html = await deduplicate_overlapping_content(section_html, section['heading'], overlap_detector,
+                                                                 llm, section_idx)
+        elif apply_dedup:
+            section_html = await deduplicate_section(section_html, previous_text, llm)
+        await parse_section_async(section_html)
+        content = extract_html_body_content(section_html)
+    # Only register the structures once the attempt succeeded, a retry would otherwise find them as duplicates
+    if structural_deduplicator is not None:
+        structural_deduplicator.register(structures, removed)
+    return content
 
 
-async def generate_report(serialized_conversation: str, report_skeleton: List[Dict], references: List[str],
-                          llm: str, apply_section_dedup: bool) -> (str, str):
+def create_overlap_detector(apply_section_dedup: bool) -> OverlapDetector | None:
+    return OverlapDetector(unit_threshold=configs.report.dedup_unit_similarity) if apply_section_dedup else None
+
+
+def check_overlap(section_html: str, heading: str, overlap_detector: OverlapDetector,
+                  section_idx: int) -> Dict | None:
+    """ Compare a section against the report so far, returning the overlap when it is worth a dedup LLM call """
+    overlap = overlap_detector.compare(section_html)
+    needs_dedup = overlap["score"] >= configs.report.dedup_overlap_threshold
+    overlap_detector.record(section_idx, needs_dedup)
+    logger.info(f"Section '{heading}': overlap score {overlap['score']:.2f} ({overlap['overlapping_units']}/"
+                f"{overlap['total_units']} units, max similarity {overlap['max_similarity']:.2f}), "
+                f"{'deduplicating' if needs_dedup else 'skipping dedup'}")
+    return overlap if needs_dedup else None
+
+
+async def deduplicate_overlapping_content(section_html: str, heading: str, overlap_detector: OverlapDetector,
+                                          llm: str, section_idx: int) -> str:
+    overlap = check_overlap(section_html, heading, overlap_detector, section_idx)
+    if overlap is None:
+        return section_html
+    # Only the repeated spans of earlier sections are sent, so the model has far less to read
+    return await deduplicate_section(section_html, '\n'.join(overlap["spans"]), llm)
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_random_exponential(multiplier=1, max=20),
+       retry=retry_if_not_exception_type(TokenBudgetExceeded), before=record_attempt)
+async def deduplicate_section_content(html_section: str, previous_text: str, llm: str) -> (str, str):
+    with span("deduplicate_section_content", kind='dedup'):
+        section_html = await deduplicate_section(html_section, previous_text, llm)
+        return extract_html_body_content(section_html)
+
+
+def create_report_digest(use_digest: bool | None) -> ReportDigest | None:
+    use_digest = configs.digest.enabled if use_digest is None else use_digest
+    return ReportDigest(token_budget=configs.digest.token_budget) if use_digest else None
+
+
+async def generate_sections_sequentially(serialized_conversation: str, report_skeleton: List[Dict], llm: str,
+                                         apply_section_dedup: bool, use_digest: bool | None = None,
+                                         conversation_index: ConversationIndex | None = None,
+                                         checkpoints: RunCheckpoints | None = None) -> (List[str], List[str]):
     # Initialize lists to hold HTML and text sections of the report
     html_sections, text_sections = [], []
+    digest = create_report_digest(use_digest)
+    overlap_detector = create_overlap_detector(apply_section_dedup)
+    structural_deduplicator = StructuralDeduplicator(configs.report.structural_similarity)
 
-    html_executive_summary, _ = await generate_executive_summary_content(
-        serialized_conversation, llm=llm
-    )
-
-    for section in tqdm(report_skeleton, desc="Generating report..."):
-        # Combine all previously generated text sections into one string
-        previous_text = '\n'.join(text_sections)
-        # Generate the content for the current section in both HTML and text formats
-        html_section, text_section = await generate_section_content(
-            serialized_conversation, section, previous_text, llm=llm, apply_dedup=apply_section_dedup
-        )
+    for idx, section in enumerate(tqdm(report_skeleton, desc="Generating report...")):
+        checkpoint = checkpoints.get(f"section:{idx}") if checkpoints else None
+        if checkpoint:
+            html_section, text_section = checkpoint
+            # Register the restored section's tables and diagrams so later sections are still checked against them
+            structural_deduplicator.register(structural_deduplicator.remove_duplicates(html_section)[1])
+        else:
+            # Describe the previously generated sections, either as a compact digest or as their combined text
+            previous_text = (digest.render(context_budget(configs.digest.token_budget)) if digest
+                             else '\n'.join(text_sections))
+            # Generate the content for the current section in both HTML and text formats, without the dedup pass once
+            # the report runs low on its token budget
+            html_section, text_section = await generate_section_content(
+                serialized_conversation, section, previous_text, llm=llm,
+                apply_dedup=apply_section_dedup and not is_degraded('skip_dedup'),
+                conversation_index=conversation_index, overlap_detector=overlap_detector,
+                structural_deduplicator=structural_deduplicator, section_idx=idx
+            )
+            if checkpoints:
+                await checkpoints.save(f"section:{idx}", [html_section, text_section])
 
         # Append the generated HTML and text content to their respective lists
         html_sections.append(html_section)
         text_sections.append(text_section)
+        if digest:
+            digest.update(html_section)
+        if overlap_detector:
+            overlap_detector.add(html_section)
+
+    logger.info(f"Removed {structural_deduplicator.removed} repeated tables and diagrams")
+    if overlap_detector:
+        logger.info(f"Dedup skipped for {overlap_detector.skipped} of {overlap_detector.checked} sections "
+                    f"(skip rate {overlap_detector.skip_rate:.0%})")
+    return html_sections, text_sections
+
+
+async def generate_sections_concurrently(serialized_conversation: str, report_skeleton: List[Dict], llm: str,
+                                         apply_section_dedup: bool, max_concurrency: int,
+                                         conversation_index: ConversationIndex | None = None,
+                                         checkpoints: RunCheckpoints | None = None) -> (List[str], List[str]):
+    semaphore = asyncio.Semaphore(max_concurrency)
+    progress = tqdm(total=len(report_skeleton), desc="Generating report...")
+
+    async def generate(idx: int, section: Dict) -> (str, str):
+        # Checkpoints hold the sections as generated, the local dedup passes below are cheap to repeat
+        content = checkpoints.get(f"section:{idx}") if checkpoints else None
+        if not content:
+            async with semaphore:
+                # Sections are generated independently of each other, overlaps are resolved in the dedup stage below
+                content = await generate_section_content(serialized_conversation, section, '', llm=llm,
+                                                         conversation_index=conversation_index)
+            if checkpoints:
+                await checkpoints.save(f"section:{idx}", list(content))
+        progress.update()
+        return content
+
+    generated_sections = await asyncio.gather(*(generate(idx, section) for idx, section in enumerate(report_skeleton)))
+    progress.close()
+    html_sections, text_sections = map(list, zip(*generated_sections)) if generated_sections else ([], [])
+
+    # Remove tables and diagrams repeating earlier sections, in report order
+    structural_deduplicator = StructuralDeduplicator(configs.report.structural_similarity)
+    for idx, html_section in enumerate(html_sections):
+        html_section, structures, removed = structural_deduplicator.remove_duplicates(html_section)
+        structural_deduplicator.register(structures, removed)
+        if html_section is not html_sections[idx]:
+            html_sections[idx], text_sections[idx] = extract_html_body_content(html_section)
+    logger.info(f"Removed {structural_deduplicator.removed} repeated tables and diagrams")
+
+    if apply_section_dedup:
+        # Only sections repeating content of the sections before them are sent to the LLM for deduplication
+        overlap_detector, overlaps = create_overlap_detector(apply_section_dedup), {}
+        for idx, (section, html_section) in enumerate(zip(report_skeleton, html_sections)):
+            overlap = check_overlap(html_section, section['heading'], overlap_detector, idx)
+            if overlap is not None:
+                overlaps[idx] = overlap
+            overlap_detector.add(html_section)
+        logger.info(f"Deduplicating {len(overlaps)} of {len(text_sections)} sections with overlapping content")
+
+        async def deduplicate(idx: int) -> (str, str):
+            async with semaphore:
+                # Sections still waiting keep their overlaps once the report runs low on its token budget
+                if is_degraded('skip_dedup'):
+                    return html_sections[idx], text_sections[idx]
+                return await deduplicate_section_content(html_sections[idx], '\n'.join(overlaps[idx]["spans"]), llm)
+
+        deduplicated_sections = await asyncio.gather(*(deduplicate(idx) for idx in overlaps))
+        for idx, (html_section, text_section) in zip(overlaps, deduplicated_sections):
+            html_sections[idx], text_sections[idx] = html_section, text_section
+
+    return html_sections, text_sections
+
+
+async def generate_report_sections(serialized_conversation: str, report_skeleton: List[Dict], llm: str,
+                                   apply_section_dedup: bool, parallel_sections: bool = False,
+                                   max_concurrency: int | None = None, use_digest: bool | None = None,
+                                   conversation_index: ConversationIndex | None = None,
+                                   checkpoints: RunCheckpoints | None = None) -> str:
+    if parallel_sections:
+        html_sections, _ = await generate_sections_concurrently(
+            serialized_conversation, report_skeleton, llm, apply_section_dedup,
+            max_concurrency=max_concurrency or configs.report.section_concurrency,
+            conversation_index=conversation_index, checkpoints=checkpoints
+        )
+    else:
+        html_sections, _ = await generate_sections_sequentially(
+            serialized_conversation, report_skeleton, llm, apply_section_dedup, use_digest=use_digest,
+            conversation_index=conversation_index, checkpoints=checkpoints
+        )
 
     # Concatenate all HTML sections into a single HTML document
-    html_report = '\n'.join(html_sections)
+    return '\n'.join(html_sections)
+
+
+async def generate_report(serialized_conversation: str, report_skeleton: List[Dict], references: List[str],
+                          llm: str, apply_section_dedup: bool, parallel_sections: bool = False,
+                          max_concurrency: int | None = None,
+                          conversation_index: ConversationIndex | None = None) -> (str, str):
+    # The executive summary only depends on the conversation, so it is generated alongside the sections
+    (html_executive_summary, _), html_report = await asyncio.gather(
+        generate_executive_summary_content(serialized_conversation, llm=llm),
+        generate_report_sections(serialized_conversation, report_skeleton, llm, apply_section_dedup,
+                                 parallel_sections, max_concurrency, conversation_index=conversation_index)
+    )
 
     # Compile the complete HTML report, incorporating references, and return it
     return await compile_full_html(
@@ -69,67 +258,301 @@ async def generate_report(serialized_conversation: str, report_skeleton: List[Di
     )
 
 
-async def run_generation_async(conversation: List[Dict], title_dict: Dict[str, str], user_name: str, request_id: int,
-                               llm: Literal['gpt', 'claude'] | None, apply_section_dedup: bool):
+def resolve_llm(llm: Literal['gpt', 'claude'] | BaseChatModel | None) -> BaseChatModel:
     # Configure the llm to use
     match llm:
+        case BaseChatModel():
+            # A ready chat model instance, e.g. the offline fake model used by the benchmarks
+            return llm
         case 'claude':
-            llm_instance = anthropic[openai[os.getenv('CLAUDE_MODEL', 'claude-3-opus')]]
+            return get_llm('anthropic')
         case _:
-            llm_instance = openai[os.getenv('GPT_MODEL', 'gpt-4-turbo')]
+            return get_llm('openai')
+
+
+def report_fingerprint(conversation: List[Dict], llm: BaseChatModel, apply_section_dedup: bool,
+                       parallel_sections: bool) -> str:
+    # Checkpoints are only reused for a report generated from the same inputs
+    return make_fingerprint(conversation=conversation, model=get_llm_model_name(llm),
+                            apply_section_dedup=apply_section_dedup, parallel_sections=parallel_sections)
+
+
+async def run_generation_async(conversation: List[Dict], title_dict: Dict[str, str], user_name: str, request_id: int,
+                               llm: Literal['gpt', 'claude'] | BaseChatModel | None, apply_section_dedup: bool,
+                               parallel_sections: bool | None = None, render_pdf: bool = True,
+                               token_budget: int | None = None,
+                               prepare: Callable[[RunCheckpoints | None], Awaitable[None]] | None = None) -> Dict:
+    """
+    Generate the report of a conversation. `prepare` runs first, within the run's trace and token ledger, e.g. to seed
+    the run's checkpoints with the artifacts an incremental update reuses.
+    """
+    llm_instance = resolve_llm(llm)
     logger.info(f"Using LLM: {llm}")
+    parallel_sections = configs.report.parallel_sections if parallel_sections is None else parallel_sections
 
-    # Serialize the input conversation and extract references
-    serialized_conversation, references = await serialize_conversation(conversation)
-
-    logger.info(f"Serialized input conversation. Now generating report skeleton...")
-    # Design the report skeleton based on the serialized conversation
-    report_skeleton = await design_report_skeleton(serialized_conversation, llm=llm_instance)
-    logger.info(f"Report skeleton generated: {report_skeleton}\n\nNow generating report sections with `section_dedup` "
-                f"set to {apply_section_dedup}...")
-
-    # Generate the report sections based on the serialized conversation, report skeleton, and references
-    html_executive_summary, html_report = await generate_report(serialized_conversation, report_skeleton, references,
-                                                                llm_instance, apply_section_dedup)
-    # Save the generated HTML executive summary & report
-    for html_content, filename in zip([html_executive_summary, html_report], ["executive_summary.html", "index.html"]):
-        html_filepath = os.path.join(configs.assets_dir, filename)
-        with open(html_filepath, 'w', encoding='utf-8') as file:
-            file.write(html_content)
-
-    html_executive_summary_filepath = os.path.join(configs.assets_dir, 'executive_summary.html')
-    html_report_filepath = os.path.join(configs.assets_dir, 'index.html')
     sanitized_title = sanitize_filename(title_dict["title"])
-    # Define paths for the HTML title, temporary title for PDF conversion, and the final PDF report
+    # Define paths for the HTML title template and the final PDF report. All intermediate HTML stays in memory so
+    # concurrent reports never collide on disk
     html_title_filepath = os.path.join(configs.assets_dir, 'title.html')
-    html_temp_title_filepath = os.path.join(configs.assets_dir, 'temp_title.html')
-    pdf_filepath = os.path.join(configs.reports_dir, f'{sanitized_title}.pdf')
-
-    # Add title information to the HTML report
-    await add_title_to_html(
-        title_info=title_dict,
-        user_name=user_name,
-        html_title_path=html_title_filepath,
-        output_path=html_temp_title_filepath
-    )
-    logger.info("HTML report successfully generated! Converting HTML to PDF file now!")
-
-    # Convert the combined HTML content into a PDF report
-    await html_to_pdf(
-        html_file_executive_summary=html_executive_summary_filepath,
-        html_file_content=html_report_filepath,
-        html_file_title=html_temp_title_filepath,
-        html_file_disclaimer=os.path.join(configs.assets_dir, 'disclaimer.html'),
-        html_file_end=os.path.join(configs.assets_dir, 'end.html'),
-        output_path=pdf_filepath
+    pdf_filename = f'{sanitized_title}.pdf' if request_id is None else f'{sanitized_title}_{request_id}.pdf'
+    pdf_filepath = os.path.join(configs.reports_dir, sanitize_filename(pdf_filename))
+    # Completed stages are checkpointed under the request id, a rerun with the same inputs resumes after them
+    checkpoints = open_checkpoints(request_id, report_fingerprint(conversation, llm_instance, apply_section_dedup,
+                                                                  parallel_sections))
+
+    async def checkpointed(stage: str, func, *args, **kwargs):
+        return await (checkpoints.run(stage, func, *args, **kwargs) if checkpoints else func(*args, **kwargs))
+
+    async def serialize(conversation: List[Dict]) -> (str, List[str], ConversationIndex):
+        checkpoint = checkpoints.get("serialize") if checkpoints else None
+        if checkpoint:
+            # The index is cheap to rebuild, so only the serialized conversation and its references are checkpointed
+            serialized, references = checkpoint
+            return serialized, references, ConversationIndex.from_serialized_conversation(
+                serialized, configs.retrieval.chunk_tokens
+            )
+        # Serialize the input conversation and extract references
+        serialized = await serialize_conversation(conversation)
+        if checkpoints:
+            # The raw conversation is kept to diff it against a grown one in `run_incremental_generation_async`
+            await checkpoints.save("conversation", conversation)
+            await checkpoints.save("serialize", list(serialized[:2]))
+        logger.info(f"Serialized input conversation. Now generating report skeleton and executive summary...")
+        return serialized
+
+    async def serialized_conversation(serialize: (str, List[str], ConversationIndex)) -> str:
+        return serialize[0]
+
+    async def references(serialize: (str, List[str], ConversationIndex)) -> List[str]:
+        return serialize[1]
+
+    async def conversation_index(serialize: (str, List[str], ConversationIndex)) -> ConversationIndex:
+        return serialize[2]
+
+    async def condensed_conversation(serialized_conversation: str) -> str:
+        # Conversations too large for a single call are map-reduced into a bounded digest, others pass through
+        return await checkpointed("condensed_conversation", condense_conversation, serialized_conversation,
+                                  llm=llm_instance)
+
+    async def skeleton(condensed_conversation: str) -> List[Dict]:
+        # Design the report skeleton based on the (condensed) serialized conversation
+        report_skeleton = await checkpointed("skeleton", design_report_skeleton, condensed_conversation,
+                                             llm=llm_instance)
+        logger.info(f"Report skeleton generated: {report_skeleton}\n\nNow generating report sections with "
+                    f"`section_dedup` set to {apply_section_dedup} and `parallel_sections` set to {parallel_sections}...")
+        return report_skeleton
+
+    async def executive_summary(condensed_conversation: str) -> str:
+        html_executive_summary, _ = await checkpointed("executive_summary", generate_executive_summary_content,
+                                                       condensed_conversation, llm=llm_instance)
+        return html_executive_summary
+
+    async def sections(serialized_conversation: str, skeleton: List[Dict],
+                       conversation_index: ConversationIndex) -> str:
+        # Generate the report sections based on the serialized conversation and report skeleton
+        return await checkpointed("sections", generate_report_sections, serialized_conversation, skeleton,
+                                  llm_instance, apply_section_dedup, parallel_sections,
+                                  conversation_index=conversation_index, checkpoints=checkpoints)
+
+    async def compiled_html(executive_summary: str, sections: str, references: List[str]) -> (str, str):
+        compiled = await checkpointed(
+            "compiled_html", compile_full_html,
+            html_content={"executive_summary": executive_summary, "report": sections},
+            references=references
+        )
+        logger.info("HTML report successfully generated! Converting HTML to PDF file now!")
+        return compiled
+
+    async def title() -> str:
+        # Add title information to the HTML title page
+        return await add_title_to_html(
+            title_info=title_dict,
+            user_name=user_name,
+            html_title_path=html_title_filepath
+        )
+
+    async def pdf(compiled_html: (str, str), title: str) -> str:
+        html_executive_summary, html_report = compiled_html
+        # Convert the combined HTML content into a PDF report
+        await html_to_pdf(
+            html_executive_summary=html_executive_summary,
+            html_content=html_report,
+            html_title=title,
+            output_path=pdf_filepath
+        )
+        return pdf_filepath
+
+    # The executive summary and the title page only depend on the inputs, so they overlap with skeleton and sections
+    pipeline = (
+        Pipeline()
+        .add_stage("serialize", serialize, inputs=["conversation"])
+        .add_stage("serialized_conversation", serialized_conversation, inputs=["serialize"])
+        .add_stage("references", references, inputs=["serialize"])
+        .add_stage("conversation_index", conversation_index, inputs=["serialize"])
+        .add_stage("condensed_conversation", condensed_conversation, inputs=["serialized_conversation"])
+        .add_stage("skeleton", skeleton, inputs=["condensed_conversation"])
+        .add_stage("executive_summary", executive_summary, inputs=["condensed_conversation"])
+        .add_stage("sections", sections, inputs=["serialized_conversation", "skeleton", "conversation_index"])
+        .add_stage("compiled_html", compiled_html, inputs=["executive_summary", "sections", "references"])
     )
+    if render_pdf:
+        pipeline.add_stage("title", title).add_stage("pdf", pdf, inputs=["compiled_html", "title"])
+    # Every stage, section and LLM call of the run is recorded as a span of this trace, unless tracing is disabled
+    run_trace, profile_path = start_trace(request_id), None
+    # Tokens of every LLM call of the run, projected against the report's budget before each call is sent
+    ledger = TokenLedger(configs.budget.max_tokens if token_budget is None else token_budget)
+    try:
+        with ledger, run_trace or nullcontext(), span("report", kind='run', model=get_llm_model_name(llm_instance)):
+            if prepare is not None:
+                await prepare(checkpoints)
+            outputs = await pipeline.run(conversation=conversation)
+    finally:
+        logger.info(f"Token usage: {ledger.totals()}")
+        # Failed runs get a profile too, it shows which stage failed and after how long
+        if run_trace is not None:
+            logger.info(run_trace.summary_line())
+            if configs.tracing.write_profile and render_pdf:
+                # The profile sits next to the PDF, named like it, runs without a PDF only log the summary line
+                profile_path = run_trace.write_profile(f"{os.path.splitext(pdf_filepath)[0]}.profile.json")
+    if checkpoints and not configs.checkpoint.keep_completed:
+        checkpoints.complete()
 
-    # Remove temporary HTML files used in the PDF conversion process
-    for tbd_file in [html_executive_summary_filepath, html_report_filepath, html_temp_title_filepath]:
-        os.remove(tbd_file)
-    logger.info(f"PDF report on {title_dict['title']} generated and saved to {pdf_filepath}")
+    critical_path = pipeline.critical_path()
+    if render_pdf:
+        logger.info(f"PDF report on {title_dict['title']} generated and saved to {outputs['pdf']}")
+        logger.info(f"Diagram renderer: {DiagramRenderer().stats()}")
+    logger.info(f"Stage timeline: {pipeline.timeline}\nCritical path: {' -> '.join(critical_path)}")
+    logger.info(f"LLM cache: {LLMCache().stats()}")
+    logger.info(f"Rate limiters: {rate_limiter_stats()}")
+    logger.info(f"Providers: {resilience_stats()}")
+    logger.info(f"Structured output parse paths: {parse_path_stats()}")
+    return {"request_id": request_id, "pdf_path": outputs.get("pdf"), "timeline": pipeline.timeline,
+            "critical_path": critical_path, "profile_path": profile_path, "tokens": ledger.totals()}
 
 
 def run_generation(conversation: List[Dict], title_dict: Dict[str, str], user_name: str, request_id: int | None = None,
-                   llm: Literal['gpt', 'claude'] = 'gpt', apply_section_dedup: bool = True):
-    asyncio.run(run_generation_async(conversation, title_dict, user_name, request_id, llm, apply_section_dedup))
+                   llm: Literal['gpt', 'claude'] = 'gpt', apply_section_dedup: bool = True,
+                   parallel_sections: bool | None = None, token_budget: int | None = None) -> Dict:
+    """ Synchronous wrapper around `run_generation_async`, the browser and clients are kept for the next report """
+    return BackgroundLoop().run(run_generation_async(conversation, title_dict, user_name, request_id, llm,
+                                                     apply_section_dedup, parallel_sections, token_budget=token_budget))
+
+
+async def run_incremental_generation_async(previous_request_id: int | str, conversation: List[Dict],
+                                           title_dict: Dict[str, str], user_name: str, request_id: int | str,
+                                           llm: Literal['gpt', 'claude'] | BaseChatModel | None,
+                                           apply_section_dedup: bool, parallel_sections: bool | None = None,
+                                           render_pdf: bool = True, token_budget: int | None = None) -> Dict:
+    """
+    Regenerate the report of `previous_request_id` for its grown conversation. The previous skeleton is kept, sections
+    the new messages do not touch are reused and only the affected ones, sections for uncovered new topics and the
+    executive summary are generated. Falls back to a full generation when the previous run cannot be reused.
+    """
+    llm_instance = resolve_llm(llm)
+    parallel_sections = configs.report.parallel_sections if parallel_sections is None else parallel_sections
+    previous = CheckpointStore().load(previous_request_id) if CheckpointStore().enabled else {}
+    new_messages = diff_conversation(previous.get("conversation"), conversation)
+    if new_messages is None or "skeleton" not in previous or request_id is None:
+        logger.info(f"No reusable checkpoints of request {previous_request_id} for this conversation, "
+                    f"generating the full report")
+        return await run_generation_async(conversation, title_dict, user_name, request_id, llm_instance,
+                                          apply_section_dedup, parallel_sections, render_pdf, token_budget)
+
+    reused_headings = []
+
+    async def seed_checkpoints(checkpoints: RunCheckpoints):
+        # Runs within the report's trace and token ledger, so the skeleton of the new messages is profiled, counts
+        # towards the report's tokens and is subject to its budget
+        _, _, conversation_index = await serialize_conversation(conversation)
+        affected, uncovered = plan_incremental_update(previous, conversation_index)
+        report_skeleton, positions = previous["skeleton"], {idx: idx for idx in range(len(previous["skeleton"]))}
+        if uncovered:
+            # Only the new messages are sent, their skeleton contributes the sections the report is missing
+            with span("incremental_skeleton"):
+                serialized_messages, _, _ = await serialize_conversation(new_messages)
+                with ChargeTo("condensed_conversation"):
+                    condensed_messages = await condense_conversation(serialized_messages, llm_instance)
+                with ChargeTo("skeleton"):
+                    new_skeleton = await design_report_skeleton(condensed_messages, llm=llm_instance)
+            report_skeleton, positions = merge_skeleton(report_skeleton, new_skeleton)
+
+        # Seed the new request with the reused artifacts, the regular pipeline then resumes from them
+        await checkpoints.save("skeleton", report_skeleton)
+        reused = [idx for idx in range(len(previous["skeleton"])) if idx not in affected]
+        for idx in reused:
+            await checkpoints.save(f"section:{positions[idx]}", previous[f"section:{idx}"])
+        reused_headings.extend(report_skeleton[positions[idx]]['heading'] for idx in reused)
+        logger.info(f"Reusing {len(reused)} sections, generating {len(report_skeleton) - len(reused)} of "
+                    f"{len(report_skeleton)}")
+
+    result = await run_generation_async(conversation, title_dict, user_name, request_id, llm_instance,
+                                        apply_section_dedup, parallel_sections, render_pdf, token_budget,
+                                        prepare=seed_checkpoints)
+    return result | {"reused_sections": reused_headings}
+
+
+def run_incremental_generation(previous_request_id: int | str, conversation: List[Dict], title_dict: Dict[str, str],
+                               user_name: str, request_id: int | str, llm: Literal['gpt', 'claude'] = 'gpt',
+                               apply_section_dedup: bool = True, parallel_sections: bool | None = None,
+                               token_budget: int | None = None) -> Dict:
+    return BackgroundLoop().run(run_incremental_generation_async(previous_request_id, conversation, title_dict,
+                                                                 user_name, request_id, llm, apply_section_dedup,
+                                                                 parallel_sections, token_budget=token_budget))
+
+
+async def run_generation_many_async(jobs: Iterable[Tuple[List[Dict], Dict[str, str], str, int | None]],
+                                    llm: Literal['gpt', 'claude'] | BaseChatModel = 'gpt',
+                                    apply_section_dedup: bool = True, parallel_sections: bool | None = None,
+                                    max_concurrency: int | None = None, render_pdf: bool = True) -> AsyncIterator[Dict]:
+    """
+    Generate many reports on the current event loop, sharing LLM clients, rate limiters, cache and the PDF renderer.
+    Jobs are (conversation, title_dict, user_name, request_id) tuples, consumed lazily so at most `max_concurrency`
+    run at once. Every job's result or error is yielded as soon as it completes.
+    """
+    max_concurrency = max_concurrency or configs.report.batch_concurrency
+
+    async def run_job(conversation: List[Dict], title_dict: Dict[str, str], user_name: str,
+                      request_id: int | None) -> Dict:
+        try:
+            result = await run_generation_async(conversation, title_dict, user_name, request_id, llm,
+                                                apply_section_dedup, parallel_sections, render_pdf)
+            return {"request_id": request_id, "result": result, "error": None}
+        except Exception as error:
+            logger.exception(f"Report generation failed for request {request_id}")
+            return {"request_id": request_id, "result": None, "error": error}
+
+    jobs, pending = iter(jobs), set()
+    try:
+        while True:
+            # Top up the running jobs from the iterable, then hand out whichever finishes first
+            for job in jobs:
+                pending.add(asyncio.ensure_future(run_job(*job)))
+                if len(pending) >= max_concurrency:
+                    break
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # A consumer that stops early (break, `aclose()` or cancellation) must not leave reports running unawaited
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def run_generation_many(jobs: Iterable[Tuple[List[Dict], Dict[str, str], str, int | None]],
+                        llm: Literal['gpt', 'claude'] = 'gpt', apply_section_dedup: bool = True,
+                        parallel_sections: bool | None = None, max_concurrency: int | None = None,
+                        render_pdf: bool = True) -> Iterator[Dict]:
+    """ Synchronous wrapper around `run_generation_many_async` running every job on the shared background event loop """
+    background_loop = BackgroundLoop()
+    results = run_generation_many_async(jobs, llm, apply_section_dedup, parallel_sections, max_concurrency, render_pdf)
+    try:
+        while True:
+            try:
+                yield background_loop.run(results.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        background_loop.run(results.aclose())
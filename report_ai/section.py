@@ -1,5 +1,9 @@
 from typing import Dict
+from report_ai.common.utils import configs
 from report_ai.components.llms import invoke_llm
+from report_ai.components.budget import context_budget, is_degraded
+from report_ai.components.repair import repair_diagrams
+from report_ai.components.retrieval import ConversationIndex
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.language_models.chat_models import BaseChatModel
 
@@ -37,8 +41,28 @@ additional_guidelines_with_figures = (
 )
 
 
+def section_query(section_dict: Dict) -> str:
+    return ' '.join([section_dict['heading']] + section_dict['sub_headings'])
+
+
+def select_conversation_context(serialized_conversation: str, section_dict: Dict,
+                                conversation_index: ConversationIndex | None) -> str:
+    # Introduction and Conclusion summarize the whole conversation, so only the other sections use retrieval. Reports
+    # running low on their token budget retrieve for them too
+    if conversation_index is None or (section_dict['heading'] in ["Introduction", "Conclusion"] and
+                                      not is_degraded('shrink_context')):
+        return serialized_conversation
+    query = section_query(section_dict)
+    # Fall back to the whole conversation when no chunk matches the section headings
+    return conversation_index.retrieve(query, context_budget(configs.retrieval.token_budget)) or serialized_conversation
+
+
 async def design_section(serialized_conversation: str, section_dict: Dict, serialized_report: str,
-                         llm: BaseChatModel | None = None) -> (str, str):
+                         llm: BaseChatModel | None = None,
+                         conversation_index: ConversationIndex | None = None) -> (str, str):
+    if not configs.retrieval.enabled:
+        conversation_index = None
+
     if section_dict['heading'] in ["Introduction", "Conclusion"]:
         SYSTEM_PROMPT = SECTION_SYSTEM_PROMPT_TEMPLATE.format_map({
             "__SECTION_HEADING__": section_dict['heading'],
@@ -61,9 +85,9 @@ async def design_section(serialized_conversation: str, section_dict: Dict, seria
             content=SYSTEM_PROMPT
         ),
         HumanMessage(
-            content=serialized_conversation
+            content=select_conversation_context(serialized_conversation, section_dict, conversation_index)
         ),
     ]
     response = await invoke_llm(messages, llm=llm)
-    html_content = response.content
-    return html_content.replace('&gt;', '>')  # Fix errors when arrows are generated incorrectly by LLM
+    # Fix broken mermaid diagrams locally, only diagrams that stay broken cost a small repair call
+    return await repair_diagrams(response.content, llm)
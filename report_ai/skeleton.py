@@ -77,6 +77,7 @@ async def design_report_skeleton(serialized_conversation: str, llm: BaseChatMode
     parsed_output = await invoke_parser_llm(
         prompt,
         output_parser,
-        llm=llm
+        llm=llm,
+        schema=ReportSkeleton
     )
     return parsed_output.dict()['skeleton']
@@ -1,5 +1,7 @@
 from report_ai.section import additional_guidelines_with_figures
 from report_ai.components.llms import invoke_llm
+from report_ai.components.budget import ChargeTo
+from report_ai.components.repair import repair_diagrams
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.language_models.chat_models import BaseChatModel
 
@@ -65,7 +67,9 @@ async def generate_conversation_summary(serialized_conversation: str, llm):
             content=serialized_conversation
         ),
     ]
-    response = await invoke_llm(messages, llm=llm)
+    # Accounted and routed separately from the executive summary it is written for
+    with ChargeTo("conversation_summary"):
+        response = await invoke_llm(messages, llm=llm)
     return response.content
 
 
@@ -84,5 +88,5 @@ async def design_executive_summary(serialized_conversation: str, llm: BaseChatMo
         ),
     ]
     response = await invoke_llm(messages, llm=llm)
-    html_content = response.content
-    return html_content.replace('&gt;', '>')  # Fix errors when arrows are generated incorrectly by LLM
+    # Fix broken mermaid diagrams locally, only diagrams that stay broken cost a small repair call
+    return await repair_diagrams(response.content, llm)
@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from report_ai.common.utils import configs
+from report_ai.common.utils.helpers import Singleton
+from report_ai.components.cache import LLMCache
+from report_ai.components.checkpoint import CheckpointStore
+from report_ai.components.ratelimit import rate_limiters
+from report_ai.components.resilience import circuit_breakers, latency_trackers
+from report_ai.components.structured import parse_paths
+
+
+@pytest.fixture(scope='session', autouse=True)
+def isolated_logs(tmp_path_factory):
+    """ Log file handlers write under a temporary directory instead of the package's `logs` directory """
+    log_dir = tmp_path_factory.mktemp("logs")
+    for handler in configs.logger.handlers:
+        if hasattr(handler, 'baseFilename'):
+            handler.close()
+            handler.baseFilename = os.path.join(log_dir, os.path.basename(handler.baseFilename))
+    yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path):
+    """ Fresh SQLite stores under `tmp_path` and empty process-wide registries for every test """
+    for store in (LLMCache, CheckpointStore):
+        Singleton._instances.pop(store, None)
+    LLMCache(path=str(tmp_path / "llm_cache.sqlite"), enabled=False)
+    CheckpointStore(path=str(tmp_path / "checkpoints.sqlite"), enabled=True)
+    for registry in (rate_limiters, circuit_breakers, latency_trackers, parse_paths):
+        registry.clear()
+    yield
+    for store in (LLMCache, CheckpointStore):
+        Singleton._instances.pop(store, None)
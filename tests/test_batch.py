@@ -0,0 +1,50 @@
+import asyncio
+
+from report_ai import report
+
+
+def test_batch_yields_every_job_as_it_completes(monkeypatch):
+    async def fake_generation(conversation, title_dict, user_name, request_id, *args, **kwargs):
+        await asyncio.sleep(0.01 * (3 - request_id))
+        if request_id == 1:
+            raise ValueError("broken conversation")
+        return {"request_id": request_id}
+
+    monkeypatch.setattr(report, 'run_generation_async', fake_generation)
+
+    async def collect():
+        jobs = [([], {}, "user", request_id) for request_id in range(3)]
+        return [outcome async for outcome in report.run_generation_many_async(jobs, llm=None, max_concurrency=3)]
+
+    outcomes = asyncio.run(collect())
+    assert [outcome["request_id"] for outcome in outcomes] == [2, 1, 0]
+    assert isinstance(outcomes[1]["error"], ValueError) and outcomes[1]["result"] is None
+    assert outcomes[2]["result"] == {"request_id": 0}
+
+
+def test_batch_cancels_running_jobs_when_the_consumer_stops(monkeypatch):
+    started, cancelled = [], []
+
+    async def fake_generation(conversation, title_dict, user_name, request_id, *args, **kwargs):
+        started.append(request_id)
+        try:
+            await asyncio.sleep(0 if request_id == 0 else 10)
+        except asyncio.CancelledError:
+            cancelled.append(request_id)
+            raise
+        return {"request_id": request_id}
+
+    monkeypatch.setattr(report, 'run_generation_async', fake_generation)
+
+    async def consume_first():
+        jobs = [([], {}, "user", request_id) for request_id in range(5)]
+        outcomes = report.run_generation_many_async(jobs, llm=None, max_concurrency=3)
+        async for outcome in outcomes:
+            await outcomes.aclose()
+            # Still on the loop, so the jobs were cancelled by the generator and not by `asyncio.run` shutting down
+            return outcome, list(cancelled)
+
+    outcome, cancelled_on_close = asyncio.run(consume_first())
+    assert outcome["request_id"] == 0 and sorted(cancelled_on_close) == [1, 2]
+    # Only the jobs that were running got started, and every one of them was cancelled
+    assert sorted(started) == [0, 1, 2] and sorted(cancelled) == [1, 2]
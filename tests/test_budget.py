@@ -0,0 +1,110 @@
+import json
+import asyncio
+from typing import List
+
+import pytest
+from langchain_core.messages import BaseMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain.output_parsers import PydanticOutputParser
+
+from report_ai.common.utils import configs
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation
+from report_ai.components.budget import (
+    ChargeTo, TokenBudgetExceeded, TokenLedger, cheaper_model, context_budget, is_degraded
+)
+from report_ai.components.llms import invoke_parser_llm
+from report_ai.components.tokens import estimate_messages_tokens
+from report_ai.components.structured import parse_path_stats
+from report_ai.report import run_generation_async
+from report_ai.skeleton import ReportSkeleton
+
+PROMPT = ChatPromptTemplate.from_messages([("system", "Design the structured skeleton for a report."),
+                                           ("user", "Metformin and hepatic glucose production")]).format_prompt()
+
+
+class UnparsableFakeChatModel(FakeChatModel):
+    """ Answers with text that cannot be repaired locally, and with a valid skeleton once asked to fix it """
+
+    def respond(self, messages: List[BaseMessage]) -> str:
+        if 'the Completion did not satisfy the constraints' in messages[0].content:
+            return json.dumps({"skeleton": [{"heading": "Introduction", "sub_headings": ["Aim"]}]})
+        return "The skeleton is not ready yet"
+
+
+def test_usage_is_charged_to_the_current_stage():
+    ledger = TokenLedger()
+    with ledger, ChargeTo("skeleton"):
+        ledger.reserve(100)
+        assert ledger.projected() == 100
+        ledger.settle(100, "fake-model", 80, 40)
+    # Failed calls only release their reservation
+    ledger.reserve(50)
+    ledger.settle(50, "fake-model", None, None)
+    totals = ledger.totals()
+    assert totals["total_tokens"] == 120 and totals["calls"] == 1 and ledger.in_flight == 0
+    assert totals["stages"] == {"skeleton": {"fake-model": {"calls": 1, "prompt_tokens": 80, "completion_tokens": 40}}}
+
+
+def test_report_degrades_in_steps_and_refuses_calls_over_its_budget():
+    ledger = TokenLedger(budget=1000)
+    with ledger:
+        ledger.reserve(500)
+        assert ledger.degradations == [] and context_budget(400) == 400 and cheaper_model("openai") is None
+        # Calls in flight count towards the projection
+        ledger.reserve(250)
+        assert ledger.degradations == ['skip_dedup', 'shrink_context']
+        assert context_budget(400) == int(400 * configs.budget.shrink_factor) and cheaper_model("openai") is None
+        ledger.reserve(150)
+        assert cheaper_model("openai") == configs.budget.cheaper_models.openai
+        with pytest.raises(TokenBudgetExceeded):
+            ledger.reserve(101)
+    assert ledger.in_flight == 900
+    # Outside a report nothing is degraded
+    assert not is_degraded('skip_dedup')
+
+
+def test_unlimited_ledger_never_degrades():
+    ledger = TokenLedger()
+    with ledger:
+        ledger.reserve(10 ** 9)
+    assert ledger.degradations == []
+
+
+def test_report_degrades_within_its_token_budget(monkeypatch):
+    monkeypatch.setattr(configs.tracing, 'write_profile', False)
+    conversation = synthetic_conversation(6, seed="budget")
+
+    def run(token_budget: int | None) -> dict:
+        return asyncio.run(run_generation_async(conversation, {"title": "Budget"}, "Tester", None,
+                                                FakeChatModel(latency=0), apply_section_dedup=False,
+                                                render_pdf=False, token_budget=token_budget))["tokens"]
+
+    unlimited = run(None)
+    assert unlimited["total_tokens"] > 0 and unlimited["degradations"] == []
+    assert {"skeleton", "sections"} <= set(unlimited["stages"])
+    # A tighter budget still completes the report, degraded, and one far too small stops it
+    degraded = run(int(unlimited["total_tokens"] * 1.3))
+    assert degraded["degradations"] and degraded["total_tokens"] <= degraded["budget"]
+    with pytest.raises(TokenBudgetExceeded):
+        run(unlimited["total_tokens"] // 10)
+
+
+def test_output_fixing_is_charged_to_its_stage_and_budget():
+    output_parser = PydanticOutputParser(pydantic_object=ReportSkeleton)
+
+    async def parse(ledger: TokenLedger):
+        with ledger, ChargeTo("skeleton"):
+            return await invoke_parser_llm(PROMPT, output_parser, UnparsableFakeChatModel(latency=0))
+
+    ledger = TokenLedger()
+    assert asyncio.run(parse(ledger)).skeleton[0].heading == "Introduction"
+    assert parse_path_stats()['output_fixing'] == 1
+    assert {stage: models["fake-chat-model"]["calls"] for stage, models in ledger.totals()["stages"].items()} == {
+        "skeleton": 1, "output_fixing": 1}
+
+    # A budget covering the first call only refuses the fixing call before it is sent
+    ledger = TokenLedger(budget=estimate_messages_tokens(PROMPT.to_messages())
+                         + configs.rate_limits.expected_completion_tokens)
+    with pytest.raises(TokenBudgetExceeded):
+        asyncio.run(parse(ledger))
+    assert list(ledger.totals()["stages"]) == ["skeleton"] and ledger.in_flight == 0
@@ -0,0 +1,73 @@
+import time
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from report_ai.common.utils.helpers import Singleton
+from report_ai.benchmarks.fake_llm import FakeChatModel
+from report_ai.components.cache import LLMCache
+from report_ai.components.llms import invoke_llm
+
+MESSAGES = [SystemMessage(content="You are an expert in summarizing research conversations."),
+            HumanMessage(content="Summarize the effect of metformin on hepatic glucose production.")]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """ An enabled cache in place of the disabled one every test gets """
+    Singleton._instances.pop(LLMCache, None)
+    return LLMCache(path=str(tmp_path / "enabled_cache.sqlite"), enabled=True)
+
+
+def test_hit_returns_the_stored_response(cache):
+    key = LLMCache.make_key(FakeChatModel(), MESSAGES)
+    assert cache.get(key) is None
+    cache.set(key, AIMessage(content="Metformin lowers it.", response_metadata={"model_name": "fake-chat-model"}))
+    response = cache.get(key)
+    assert response.content == "Metformin lowers it." and response.response_metadata["model_name"] == "fake-chat-model"
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_other_model_or_prompt_misses(cache):
+    key = LLMCache.make_key(FakeChatModel(), MESSAGES)
+    cache.set(key, AIMessage(content="Metformin lowers it."))
+    assert LLMCache.make_key(FakeChatModel(), MESSAGES) == key
+    other_keys = [LLMCache.make_key(FakeChatModel(model_name="other"), MESSAGES),
+                  LLMCache.make_key(FakeChatModel(temperature=0.9), MESSAGES),
+                  LLMCache.make_key(FakeChatModel(), MESSAGES[:1] + [HumanMessage(content="And on the liver?")])]
+    assert key not in other_keys and all(cache.get(other_key) is None for other_key in other_keys)
+
+
+def test_expired_responses_are_ignored(cache):
+    cache.ttl_seconds = 0.05
+    key = LLMCache.make_key(FakeChatModel(), MESSAGES)
+    cache.set(key, AIMessage(content="Metformin lowers it."))
+    assert cache.get(key) is not None
+    time.sleep(0.1)
+    assert cache.get(key) is None
+
+
+def test_least_recently_used_responses_are_evicted_past_the_size_budget(cache):
+    keys = [LLMCache.make_key(FakeChatModel(), [HumanMessage(content=f"Question {idx}")]) for idx in range(3)]
+    cache.set(keys[0], AIMessage(content="answer"))
+    with cache._connect() as connection:
+        entry_size = connection.execute("SELECT size FROM responses").fetchone()[0]
+    # Room for two entries only
+    cache.max_size_bytes = int(entry_size * 2.5)
+    time.sleep(0.01)
+    cache.set(keys[1], AIMessage(content="answer"))
+    time.sleep(0.01)
+    # Reading the first entry makes the second one the least recently used
+    assert cache.get(keys[0]) is not None
+    time.sleep(0.01)
+    cache.set(keys[2], AIMessage(content="answer"))
+    assert [cache.get(key) is not None for key in keys] == [True, False, True]
+
+
+@pytest.mark.parametrize("enabled, calls", [(True, 1), (False, 2)])
+def test_disabled_cache_is_bypassed(cache, enabled, calls):
+    cache.enabled = enabled
+    llm = FakeChatModel(latency=0)
+    first, second = [asyncio.run(invoke_llm(MESSAGES, llm=llm)) for _ in range(2)]
+    assert first.content == second.content and llm.calls == calls
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from report_ai.common.utils import configs
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation
+from report_ai.components.checkpoint import CheckpointStore, RunCheckpoints, make_fingerprint, open_checkpoints
+from report_ai.report import report_fingerprint, run_generation_async
+
+
+def test_fingerprint_depends_on_every_input_but_not_their_order():
+    conversation = synthetic_conversation(4)
+    fingerprint = make_fingerprint(conversation=conversation, model="gpt-4", apply_section_dedup=True)
+    assert fingerprint == make_fingerprint(apply_section_dedup=True, model="gpt-4", conversation=conversation)
+    assert fingerprint != make_fingerprint(conversation=conversation, model="gpt-4", apply_section_dedup=False)
+    assert fingerprint != make_fingerprint(conversation=conversation[:-1], model="gpt-4", apply_section_dedup=True)
+
+    llm = FakeChatModel()
+    assert report_fingerprint(conversation, llm, True, False) != report_fingerprint(conversation, llm, True, True)
+    assert (report_fingerprint(conversation, llm, True, False)
+            != report_fingerprint(conversation, FakeChatModel(model_name="other"), True, False))
+
+
+def test_completed_stages_are_reused_only_for_the_same_fingerprint():
+    calls = []
+
+    async def stage(value):
+        calls.append(value)
+        return {"value": value}
+
+    async def run(fingerprint: str, value: str):
+        return await open_checkpoints("request", fingerprint).run("stage", stage, value)
+
+    assert asyncio.run(run("inputs-a", "first")) == {"value": "first"}
+    assert asyncio.run(run("inputs-a", "second")) == {"value": "first"}
+    # Other inputs discard every checkpoint of the request
+    assert asyncio.run(run("inputs-b", "third")) == {"value": "third"}
+    assert calls == ["first", "third"]
+    assert open_checkpoints(None, "inputs-b") is None
+
+
+def test_expired_requests_are_deleted():
+    store = CheckpointStore()
+    store.ttl_seconds = 0
+    RunCheckpoints(store, "stale", "inputs")
+    assert store.expire() == 1 and store.request_ids() == []
+
+
+@pytest.mark.parametrize("keep_completed, calls_on_rerun", [(True, 0), (False, None)])
+def test_rerun_resumes_from_completed_checkpoints(monkeypatch, keep_completed, calls_on_rerun):
+    monkeypatch.setattr(configs.checkpoint, 'keep_completed', keep_completed)
+    monkeypatch.setattr(configs.tracing, 'write_profile', False)
+    conversation = synthetic_conversation(6, seed="checkpoint")
+
+    def run() -> int:
+        llm = FakeChatModel(latency=0)
+        asyncio.run(run_generation_async(conversation, {"title": "Checkpoints"}, "Tester", "request", llm,
+                                         apply_section_dedup=False, render_pdf=False))
+        return llm.calls
+
+    first_calls = run()
+    assert first_calls > 0
+    stages = set(CheckpointStore().load("request"))
+    assert ("fingerprint" in stages) == keep_completed
+    assert {"conversation", "serialize", "skeleton", "section:0"} <= stages
+    # Completed reports only keep what incremental runs build on by default, a rerun then generates the report again
+    assert run() == (first_calls if calls_on_rerun is None else calls_on_rerun)
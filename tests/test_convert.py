@@ -0,0 +1,91 @@
+import io
+import re
+import base64
+import asyncio
+from contextlib import asynccontextmanager
+
+from pypdf import PdfReader, PdfWriter
+
+from report_ai.common.utils.helpers import Singleton
+from report_ai.components.convert import html_to_pdf, inline_assets, load_asset_html, prepare_html
+from report_ai.components.diagrams import DiagramRenderer
+
+PARTS = ["title", "disclaimer", "executive_summary", "content", "end"]
+
+
+class StubPage:
+    """ Prints each part to a one page PDF whose width tells the parts apart, the first parts finishing last """
+
+    def __init__(self, renderer: 'StubRenderer'):
+        self.renderer, self.html = renderer, ''
+
+    async def setContent(self, html: str):
+        self.html = html
+
+    async def waitForFunction(self, function: str, options: dict):
+        pass
+
+    async def evaluate(self, function: str, diagram_id: str, source: str) -> str:
+        await asyncio.sleep(0.01)
+        return f'<svg id="{diagram_id}"><text>{source.split()[-1]}</text></svg>'
+
+    async def pdf(self, options: dict) -> bytes:
+        part = re.search(r'id="part-(\w+)"', self.html).group(1)
+        self.renderer.printed[part] = self.html
+        await asyncio.sleep(0.01 * (len(PARTS) - PARTS.index(part)))
+        writer, output = PdfWriter(), io.BytesIO()
+        writer.add_blank_page(width=100 + 10 * PARTS.index(part), height=100)
+        writer.write(output)
+        return output.getvalue()
+
+
+class StubRenderer:
+    def __init__(self):
+        self.printed, self.in_use, self.peak = {}, 0, 0
+
+    @asynccontextmanager
+    async def page(self):
+        self.in_use += 1
+        self.peak = max(self.peak, self.in_use)
+        try:
+            yield StubPage(self)
+        finally:
+            self.in_use -= 1
+
+
+def test_title_background_is_inlined():
+    html = prepare_html(load_asset_html('title.html'), "file:///nowhere/")
+    assert "url('title_bg.jpg')" not in html
+    assert "url('data:image/jpeg;base64," in html
+    assert '<base href="file:///nowhere/">' in html
+
+
+def test_only_existing_relative_assets_are_inlined(tmp_path):
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG")
+    html = inline_assets('<img src="logo.png"><img src=\'missing.png\'><script src="https://cdn.example.org/x.js">'
+                         '</script><div style="background: url(logo.png)"></div>', str(tmp_path))
+    encoded = base64.b64encode(b"\x89PNG").decode('ascii')
+    assert f'<img src="data:image/png;base64,{encoded}">' in html
+    assert f"url(data:image/png;base64,{encoded})" in html
+    assert "<img src='missing.png'>" in html
+    assert 'src="https://cdn.example.org/x.js"' in html
+
+
+def test_parts_render_concurrently_and_merge_in_document_order(monkeypatch, tmp_path):
+    monkeypatch.delitem(Singleton._instances, DiagramRenderer, raising=False)
+    DiagramRenderer(cache_dir=str(tmp_path / "diagrams"))
+    renderer = StubRenderer()
+    html = {part: f'<html><body><p id="part-{part}">{part}</p></body></html>' for part in PARTS}
+    for part in ["executive_summary", "content"]:
+        html[part] = html[part].replace('</p>', f'</p><div class="mermaid">graph TD\nA --> {part}</div>')
+
+    output_path = tmp_path / "report.pdf"
+    asyncio.run(html_to_pdf(html["executive_summary"], html["content"], html["title"], str(output_path),
+                            html_disclaimer=html["disclaimer"], html_end=html["end"], renderer=renderer))
+    Singleton._instances.pop(DiagramRenderer, None)
+
+    widths = [float(page.mediabox.width) for page in PdfReader(str(output_path)).pages]
+    assert widths == [100 + 10 * idx for idx in range(len(PARTS))] and renderer.peak > 1
+    # Each part's diagram was prerendered to SVG before printing
+    for part in ["executive_summary", "content"]:
+        assert f"<text>{part}</text>" in renderer.printed[part] and "A --> " not in renderer.printed[part]
@@ -0,0 +1,36 @@
+from report_ai.components.deduplicate import StructuralDeduplicator
+
+TABLE = "<table><tr><th>Drug</th><th>Effect</th></tr><tr><td>Metformin</td><td>Lowers glucose</td></tr></table>"
+FIRST_SECTION = f"<h2>Mechanism</h2><p>Overview.</p>{TABLE}"
+REPEATING_SECTION = f"<h2>Evidence</h2><p>Trials.</p>{TABLE}"
+
+
+def accepted_deduplicator() -> StructuralDeduplicator:
+    deduplicator = StructuralDeduplicator()
+    html, structures, removed = deduplicator.remove_duplicates(FIRST_SECTION)
+    assert html is FIRST_SECTION and removed == 0
+    deduplicator.register(structures, removed)
+    return deduplicator
+
+
+def test_repeated_table_is_replaced_by_a_cross_reference():
+    html, structures, removed = accepted_deduplicator().remove_duplicates(REPEATING_SECTION)
+    assert "<table>" not in html and "See the table in the \"Mechanism\" section." in html
+    assert structures == [] and removed == 1
+
+
+def test_retried_attempts_are_counted_once():
+    deduplicator = accepted_deduplicator()
+    # Two failed attempts of the section went through the deduplicator before the third one was accepted
+    for _ in range(2):
+        deduplicator.remove_duplicates(REPEATING_SECTION)
+    _, structures, removed = deduplicator.remove_duplicates(REPEATING_SECTION)
+    deduplicator.register(structures, removed)
+    assert deduplicator.removed == 1
+
+
+def test_restored_sections_are_not_counted():
+    deduplicator = accepted_deduplicator()
+    # A section restored from a checkpoint only contributes its structures
+    deduplicator.register(deduplicator.remove_duplicates(REPEATING_SECTION)[1])
+    assert deduplicator.removed == 0
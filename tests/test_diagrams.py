@@ -0,0 +1,31 @@
+import pytest
+
+from report_ai.common.utils import configs
+from report_ai.components import diagrams
+from report_ai.components.diagrams import MermaidNotFound, mermaid_script_html, mermaid_script_url
+
+
+def test_missing_vendored_build_fails_without_cdn(tmp_path, monkeypatch):
+    monkeypatch.setattr(diagrams, 'vendored_mermaid_path', lambda: str(tmp_path / "missing.js"))
+    monkeypatch.setattr(configs.mermaid, 'cdn_url', None)
+    with pytest.raises(MermaidNotFound):
+        mermaid_script_html()
+
+
+def test_vendored_build_is_preferred_over_cdn(tmp_path, monkeypatch):
+    script = tmp_path / "mermaid.min.js"
+    script.write_text("window.mermaid = {};")
+    monkeypatch.setattr(diagrams, 'vendored_mermaid_path', lambda: str(script))
+    monkeypatch.setattr(configs.mermaid, 'cdn_url', "https://cdn.example.org/mermaid.min.js")
+    assert mermaid_script_url() == script.as_uri()
+
+
+def test_cdn_is_an_explicit_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr(diagrams, 'vendored_mermaid_path', lambda: str(tmp_path / "missing.js"))
+    monkeypatch.setattr(configs.mermaid, 'cdn_url', "https://cdn.example.org/mermaid.min.js")
+    assert 'src="https://cdn.example.org/mermaid.min.js"' in mermaid_script_html()
+
+
+def test_default_config_renders_without_a_vendored_build(tmp_path, monkeypatch):
+    monkeypatch.setattr(diagrams, 'vendored_mermaid_path', lambda: str(tmp_path / "missing.js"))
+    assert mermaid_script_url().startswith("https://") and "mermaid@10" in mermaid_script_url()
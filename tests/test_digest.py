@@ -0,0 +1,49 @@
+from report_ai.components.digest import ReportDigest
+from report_ai.components.tokens import estimate_tokens
+
+
+def section_html(heading: str, claims: int) -> str:
+    paragraphs = ''.join(f"<p>{heading} finding {idx} holds in most patients. It was replicated later.</p>"
+                         for idx in range(claims))
+    return (f"<h2>{heading}</h2><h3>Overview</h3>{paragraphs}"
+            f"<table><caption>{heading} outcomes</caption><tr><th>Arm</th></tr><tr><td>Placebo</td></tr></table>"
+            f'<div class="mermaid">graph TD\nA[{heading}] --> B[Outcome]</div>')
+
+
+def digest_of(*headings: str, claims: int = 5) -> ReportDigest:
+    digest = ReportDigest()
+    for heading in headings:
+        digest.update(section_html(heading, claims))
+    return digest
+
+
+def test_empty_report_has_an_empty_digest():
+    assert ReportDigest().render() == '' and ReportDigest(token_budget=100).render() == ''
+
+
+def test_digest_summarizes_every_section():
+    lines = digest_of("Introduction", "Mechanism", claims=1).render().split('\n')
+    assert lines[:6] == ["## Introduction", "### Overview", "- Table: Introduction outcomes",
+                         "- Diagram: Introduction | Outcome", "- Introduction finding 0 holds in most patients.",
+                         "## Mechanism"]
+
+
+def test_digest_stays_within_its_token_budget():
+    digest = digest_of("Introduction", "Mechanism", "Safety", "Dosing", claims=20)
+    full = digest.render()
+    for token_budget in [40, 120, 400]:
+        rendered = digest.render(token_budget)
+        assert estimate_tokens(rendered) <= token_budget < estimate_tokens(full)
+
+
+def test_claims_of_the_newest_sections_are_dropped_first():
+    digest = digest_of("Introduction", "Mechanism", "Safety")
+    full = digest.render()
+    # Room for every heading, table and diagram but only some of the claims
+    structure = [line for line in full.split('\n') if line.startswith(('#', '- Table', '- Diagram'))]
+    rendered = digest.render(sum(estimate_tokens(line) + 1 for line in structure) + 30).split('\n')
+    assert [line for line in rendered if line in structure] == structure
+    claims = [line for line in rendered if line not in structure]
+    assert claims and all(claim.startswith("- Introduction") for claim in claims)
+    # Sections keep their order, the kept claims stay under their heading
+    assert rendered.index(claims[-1]) < rendered.index("## Mechanism")
@@ -0,0 +1,22 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from report_ai import report
+
+
+def test_synchronous_entry_points_share_one_event_loop(monkeypatch):
+    async def fake_generation(conversation, title_dict, user_name, request_id, *args, **kwargs):
+        await asyncio.sleep(0.01)
+        return {"request_id": request_id, "loop": asyncio.get_running_loop()}
+
+    monkeypatch.setattr(report, 'run_generation_async', fake_generation)
+
+    loops = {report.run_generation([], {}, "user", request_id)["loop"] for request_id in range(2)}
+    # Callers on several threads at once are served by the same loop too
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda request_id: report.run_generation([], {}, "user", request_id), range(4)))
+    loops |= {result["loop"] for result in results}
+    loops |= {outcome["result"]["loop"]
+              for outcome in report.run_generation_many([([], {}, "user", idx) for idx in range(3)], llm=None)}
+    assert len(loops) == 1
+    assert [result["request_id"] for result in results] == [0, 1, 2, 3]
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from report_ai.common.utils import configs
+from report_ai.components.budget import TokenBudgetExceeded
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation
+from report_ai.report import run_generation_async, run_incremental_generation_async
+
+
+@pytest.fixture(params=[False, True], ids=["default", "keep_completed"])
+def grown_conversation(request, monkeypatch):
+    # Completed reports keep what incremental runs reuse, with or without `keep_completed`
+    monkeypatch.setattr(configs.checkpoint, 'keep_completed', request.param)
+    monkeypatch.setattr(configs.tracing, 'write_profile', False)
+    conversation = synthetic_conversation(6, seed="incremental")
+    asyncio.run(run_generation_async(conversation, {"title": "Incremental"}, "Tester", "previous",
+                                     FakeChatModel(latency=0), apply_section_dedup=False, render_pdf=False))
+    # New topics no section of the previous skeleton retrieves, so their skeleton has to be generated
+    return conversation + synthetic_conversation(4, seed="incremental-new-topics")
+
+
+def test_skeleton_of_new_messages_counts_towards_the_report(grown_conversation):
+    llm = FakeChatModel(latency=0)
+    result = asyncio.run(run_incremental_generation_async("previous", grown_conversation, {"title": "Incremental"},
+                                                          "Tester", "grown", llm, apply_section_dedup=False,
+                                                          render_pdf=False))
+    # The previous report was reused rather than generated again in full
+    assert "reused_sections" in result
+    # The pipeline resumes its skeleton stage from the checkpoint, so these calls are the new messages' skeleton
+    assert result["tokens"]["stages"]["skeleton"]["fake-chat-model"]["calls"] == 1
+    assert result["tokens"]["calls"] == llm.calls
+
+
+def test_skeleton_of_new_messages_is_subject_to_the_budget(grown_conversation):
+    llm = FakeChatModel(latency=0)
+    with pytest.raises(TokenBudgetExceeded):
+        asyncio.run(run_incremental_generation_async("previous", grown_conversation, {"title": "Incremental"},
+                                                     "Tester", "grown", llm, apply_section_dedup=False,
+                                                     render_pdf=False, token_budget=10))
+    assert llm.calls == 0
@@ -0,0 +1,98 @@
+import sys
+import asyncio
+import subprocess
+
+import pytest
+
+from report_ai.common.utils import configs
+from report_ai.common.utils.helpers import Singleton
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation
+from report_ai.components.budget import ChargeTo
+from report_ai.components.llms import LLMRegistry, ProviderModels, get_llm, select_llm
+from report_ai.report import run_generation_async
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    """ A `fake` provider with two models whose clients are counted as they are built """
+    built = []
+
+    def build(model: str, **settings) -> FakeChatModel:
+        built.append((model, settings))
+        return FakeChatModel(model_name=model, **settings)
+
+    monkeypatch.delitem(Singleton._instances, LLMRegistry, raising=False)
+    monkeypatch.setitem(configs.llms, "fake", {"default_model": "fake-small", "temperature": 0.7,
+                                               "models": {"fake-small": {}, "fake-large": {"temperature": 0.2}}})
+    monkeypatch.setitem(LLMRegistry.builders, "fake", build)
+    yield built
+    Singleton._instances.pop(LLMRegistry, None)
+
+
+def test_importing_the_pipeline_loads_no_provider_sdk():
+    code = ("import sys, report_ai.report; "
+            "print(sorted({name.split('.')[0] for name in sys.modules} & "
+            "{'langchain_openai', 'langchain_anthropic', 'openai', 'anthropic'}))")
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    assert output.strip() == "[]"
+
+
+def test_clients_are_built_on_first_use_and_shared(fake_provider):
+    assert fake_provider == []
+    llm = get_llm("fake")
+    assert get_llm("fake", "fake-small") is llm and llm.temperature == 0.7
+    # Model entries and overrides change the settings, so they get clients of their own
+    assert get_llm("fake", "fake-large").temperature == 0.2
+    assert get_llm("fake", temperature=0) is not llm
+    assert [model for model, _ in fake_provider] == ["fake-small", "fake-large", "fake-small"]
+
+
+def test_unknown_models_are_rejected(fake_provider):
+    with pytest.raises(KeyError, match="fake-huge"):
+        get_llm("fake", "fake-huge")
+    assert fake_provider == []
+
+
+def test_environment_selects_the_default_model(monkeypatch):
+    monkeypatch.setenv("GPT_MODEL", "gpt-4o")
+    assert LLMRegistry.default_model("openai") == "gpt-4o"
+    monkeypatch.delenv("GPT_MODEL")
+    assert LLMRegistry.default_model("openai") == configs.llms.openai.default_model
+
+
+def test_provider_models_view_builds_only_what_is_accessed(fake_provider):
+    models = ProviderModels("fake")
+    assert list(models) == ["fake-small", "fake-large"] and len(models) == 2
+    assert models["fake-large"].model_name == "fake-large"
+    assert [model for model, _ in fake_provider] == ["fake-large"]
+
+
+@pytest.fixture
+def routing(fake_provider, monkeypatch):
+    """ The skeleton and conversation summary of `fake` reports routed to `fake-large` """
+    monkeypatch.setattr(configs.routing, 'stages', {"skeleton": {"fake": "fake-large"},
+                                                    "conversation_summary": {"fake": "fake-large", "openai": "gpt-4"}})
+
+
+def test_routed_stages_use_their_model(routing, monkeypatch):
+    llm = get_llm("fake")
+    with ChargeTo("skeleton"):
+        assert select_llm(llm).model_name == "fake-large"
+    # Unrouted stages keep the caller's model, and so do other models of unrouted providers
+    with ChargeTo("sections"):
+        assert select_llm(llm) is llm
+    assert select_llm(llm, "dedup") is llm
+    other = FakeChatModel(provider="other")
+    assert select_llm(other, "skeleton") is other
+    monkeypatch.setattr(configs.routing, 'enabled', False)
+    assert select_llm(llm, "skeleton") is llm
+
+
+def test_report_charges_routed_stages_to_their_model(routing, monkeypatch):
+    monkeypatch.setattr(configs.tracing, 'write_profile', False)
+    outputs = asyncio.run(run_generation_async(synthetic_conversation(4, seed="routing"), {"title": "Routing"},
+                                               "Tester", None, get_llm("fake"), apply_section_dedup=False,
+                                               render_pdf=False))
+    models = {stage: sorted(usage) for stage, usage in outputs["tokens"]["stages"].items()}
+    assert models == {"skeleton": ["fake-large"], "conversation_summary": ["fake-large"],
+                      "executive_summary": ["fake-small"], "sections": ["fake-small"]}
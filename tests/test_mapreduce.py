@@ -0,0 +1,55 @@
+import re
+import asyncio
+
+import pytest
+
+from report_ai.common.utils import configs
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation
+from report_ai.components.functions import serialize_conversation
+from report_ai.components.tokens import estimate_tokens
+from report_ai.components.mapreduce import condense_conversation, group_notes, split_conversation
+
+
+def serialized(num_messages: int) -> str:
+    return asyncio.run(serialize_conversation(synthetic_conversation(num_messages, seed="mapreduce")))[0]
+
+
+def questions(text: str) -> list:
+    return re.findall(r'^User: .+$', text, re.MULTILINE)
+
+
+@pytest.fixture
+def small_limits(monkeypatch):
+    for key, value in {"threshold_tokens": 2000, "chunk_tokens": 1000, "digest_tokens": 600}.items():
+        monkeypatch.setattr(configs.mapreduce, key, value)
+
+
+def test_chunks_pack_whole_exchanges_without_losing_any():
+    conversation = serialized(20)
+    chunks = split_conversation(conversation, chunk_tokens=1000)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 1000 for chunk in chunks)
+    assert [question for chunk in chunks for question in questions(chunk)] == questions(conversation)
+
+
+def test_every_merge_group_but_the_last_holds_two_notes():
+    groups = group_notes(["note " * 200] * 5, group_tokens=10)
+    assert [len(group) for group in groups] == [2, 2, 1]
+
+
+def test_small_conversations_pass_through(small_limits):
+    llm = FakeChatModel(latency=0)
+    conversation = serialized(2)
+    assert asyncio.run(condense_conversation(conversation, llm)) == conversation and llm.calls == 0
+
+
+def test_large_conversations_are_condensed_in_merge_rounds(small_limits):
+    llm = FakeChatModel(latency=0)
+    conversation = serialized(40)
+    chunks = split_conversation(conversation, configs.mapreduce.chunk_tokens)
+    digest = asyncio.run(condense_conversation(conversation, llm))
+    # The fake notes keep every question, so merging stops once a single note is left rather than at `digest_tokens`
+    assert estimate_tokens(digest) < estimate_tokens(conversation) / 2
+    # Merge rounds ran on top of one extract call per chunk, and the digest keeps the `User:` / `AI:` format
+    assert llm.calls > len(chunks)
+    assert questions(digest) == questions(conversation)
@@ -0,0 +1,55 @@
+import pytest
+
+from report_ai.components.mermaid import check_diagram, canonicalize_diagram, extract_edges
+
+
+@pytest.mark.parametrize("source", [
+    "graph TD\nA --> B",
+    "graph TD\nnode-1 --> node-2",
+    "graph LR\nnode-1[\"Start\"] --> node-2(End) --> node-3{Done?}",
+    "graph TD\nA-->B",
+    "graph TD\nmy-node-a-.->my-node-b",
+    "graph TD\nstep-1==>step-2 & step-3",
+    "graph TD\nA -- uses --> B --- C",
+    "graph TD\nA -. text .-> B",
+    "graph TD\nA -.text.-> B",
+    "graph TD\nA-.maybe.->B-.no.-xC",
+    "graph TD\nA -->|yes| B",
+    "sequenceDiagram\nAlice->>Bob: Hello",
+])
+def test_valid_diagrams_are_left_untouched(source):
+    assert check_diagram(source) == (source, [], [])
+
+
+@pytest.mark.parametrize("source, expected, fix", [
+    ("graph TD\nA->B", "graph TD\nA --> B", "replaced arrow '->'"),
+    ("graph TD\nnode-1 -> node-2", "graph TD\nnode-1 --> node-2", "replaced arrow '->'"),
+    ("graph TD\nA[Insulin (fasting)] --> B", 'graph TD\nA["Insulin (fasting)"] --> B',
+     "quoted label 'Insulin (fasting)'"),
+    ("A --> B", "graph TD\nA --> B", "added missing 'graph TD' header"),
+    ("graph TD\nend --> B", "graph TD\nend_ --> B", "renamed node id 'end'"),
+    ("graph TD\nA --&gt; B", "graph TD\nA --> B", "unescaped HTML entities"),
+])
+def test_broken_diagrams_are_fixed(source, expected, fix):
+    fixed, fixes, errors = check_diagram(source)
+    assert fixed == expected and fix in fixes and errors == []
+
+
+@pytest.mark.parametrize("source", [
+    "graph TD\nnode-1 - node-2",
+    "graph TD\nA --> B[unclosed",
+    "graph TD\n--> B",
+])
+def test_unparseable_statements_are_reported(source):
+    _, _, errors = check_diagram(source)
+    assert len(errors) == 1 and errors[0].startswith("cannot parse statement")
+
+
+def test_hyphenated_ids_keep_their_edges():
+    source = "graph TD\nnode-1[\"Start\"] --> node-2[\"End\"]\nnode-2-->node-3"
+    assert extract_edges(source) == [("Start", "End"), ("End", "node-3")]
+    assert canonicalize_diagram(source) == canonicalize_diagram("graph LR\na[Start] --> b[End]\nb --> node-3")
+
+
+def test_labeled_dotted_links_keep_their_edges():
+    assert extract_edges("graph TD\nA[Start] -.text.-> B -. other .-> C") == [("Start", "B"), ("B", "C")]
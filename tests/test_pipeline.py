@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from report_ai.components.pipeline import Pipeline
+
+
+def sleeper(seconds: float, value):
+    async def stage(**inputs):
+        await asyncio.sleep(seconds)
+        return value(**inputs) if callable(value) else value
+    return stage
+
+
+def test_independent_stages_overlap_and_outputs_flow_to_dependents():
+    pipeline = (
+        Pipeline()
+        .add_stage("summary", sleeper(0.1, lambda text: text.upper()), inputs=["text"])
+        .add_stage("skeleton", sleeper(0.05, lambda text: text.split()), inputs=["text"])
+        .add_stage("sections", sleeper(0.1, lambda skeleton: [word * 2 for word in skeleton]), inputs=["skeleton"])
+        .add_stage("report", sleeper(0, lambda summary, sections: f"{summary}: {' '.join(sections)}"),
+                   inputs=["summary", "sections"])
+    )
+    outputs = asyncio.run(pipeline.run(text="a b"))
+    assert outputs["report"] == "A B: aa bb"
+
+    timings = {entry["stage"]: entry for entry in pipeline.timeline}
+    # The summary runs next to skeleton and sections instead of before them
+    assert timings["summary"]["start"] < timings["skeleton"]["end"]
+    assert timings["report"]["end"] < 0.25 + 0.1
+    assert pipeline.critical_path() == ["skeleton", "sections", "report"]
+
+
+def test_failing_stage_cancels_the_rest():
+    cancelled = []
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("stage failed")
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    pipeline = Pipeline().add_stage("fail", fail).add_stage("slow", slow).add_stage("after", sleeper(0, 1), ["fail"])
+    with pytest.raises(RuntimeError, match="stage failed"):
+        asyncio.run(pipeline.run())
+    assert cancelled == ["slow"]
+
+
+@pytest.mark.parametrize("build, message", [
+    (lambda: Pipeline().add_stage("a", sleeper(0, 1), ["b"]).add_stage("b", sleeper(0, 1), ["a"]), "cycle"),
+    (lambda: Pipeline().add_stage("a", sleeper(0, 1), ["missing"]), "Unknown pipeline input"),
+])
+def test_invalid_graphs_are_rejected(build, message):
+    with pytest.raises(ValueError, match=message):
+        asyncio.run(build().run())
+
+
+def test_stage_names_are_unique():
+    with pytest.raises(ValueError, match="already defined"):
+        Pipeline().add_stage("a", sleeper(0, 1)).add_stage("a", sleeper(0, 1))
@@ -0,0 +1,64 @@
+import sys
+import asyncio
+
+import pytest
+
+from report_ai.common.utils import configs
+from report_ai.common.utils.helpers import Singleton
+from report_ai.components.diagrams import DiagramRenderer
+from report_ai.components.postprocess import BACKENDS, ParsedSection, get_backend
+
+SECTION = """<body><h2>Hepatic glucose production</h2><!-- generated -->
+<h3>Mechanism</h3><p>Metformin lowers <b>hepatic</b> glucose output.</p>
+<ul><li>AMPK activation</li><li>Reduced gluconeogenesis &amp; glycogenolysis</li></ul>
+<table><caption>Effects</caption><tr><th>Organ</th><th>Effect</th></tr><tr><td>Liver</td><td>Lower output</td></tr>
+</table><div class="mermaid">graph TD
+A[Metformin] --> B[AMPK]</div><script>var ignored = 1;</script><p>Tail text</p></body>"""
+
+# Python package each backend needs
+BACKEND_MODULES = {"selectolax": "selectolax.lexbor", "lxml": "lxml.html", "bs4": "bs4"}
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request):
+    pytest.importorskip(BACKEND_MODULES[request.param])
+    return get_backend(request.param)
+
+
+@pytest.fixture
+def fresh_backends():
+    get_backend.cache_clear()
+    yield
+    get_backend.cache_clear()
+
+
+def test_backends_extract_the_same_section(backend):
+    parsed, expected = ParsedSection(SECTION, backend), ParsedSection(SECTION, get_backend('bs4'))
+    for attribute in ['text', 'heading', 'sub_headings', 'diagrams', 'tables', 'claims', 'prose']:
+        assert getattr(parsed, attribute) == getattr(expected, attribute), attribute
+    assert parsed.heading == "Hepatic glucose production" and parsed.claims[-1] == "Tail text"
+    assert "ignored" not in parsed.text and "Metformin] -->" not in parsed.prose
+
+
+def test_backends_prerender_the_same_diagrams(backend, fresh_backends, monkeypatch, tmp_path):
+    monkeypatch.setattr(configs.postprocess, 'parser', backend.name)
+    monkeypatch.delitem(Singleton._instances, DiagramRenderer, raising=False)
+    renderer = DiagramRenderer(cache_dir=str(tmp_path))
+    source = ParsedSection(SECTION, backend).diagrams[0]
+    renderer.set(renderer.make_key(source), '<svg viewBox="0 0 10 10"><g><text>Metformin</text></g></svg>')
+
+    html, unrendered = asyncio.run(renderer.prerender(f"<!DOCTYPE html><html><head></head>{SECTION}</html>"))
+    assert unrendered == 0 and renderer.stats()["hits"] == 1
+    rendered = ParsedSection(html, backend)
+    assert "A[Metformin]" not in html and "<text>Metformin</text>" in html
+    assert rendered.claims == ParsedSection(SECTION, backend).claims and 'data-processed="true"' in html
+    Singleton._instances.pop(DiagramRenderer, None)
+
+
+def test_missing_backends_fall_back_to_bs4(fresh_backends, monkeypatch):
+    # A None entry makes importing the module fail like an uninstalled package
+    monkeypatch.setitem(sys.modules, "selectolax.lexbor", None)
+    monkeypatch.setitem(sys.modules, "lxml.html", None)
+    assert get_backend('auto').name == 'bs4'
+    with pytest.raises(ImportError):
+        get_backend('lxml')
@@ -0,0 +1,61 @@
+import time
+import asyncio
+
+import pytest
+
+from report_ai.components.ratelimit import RateLimiter, TokenBucket, get_rate_limiter
+
+
+def test_bucket_refills_continuously_up_to_its_capacity():
+    bucket = TokenBucket(capacity=600)
+    bucket.consume(600)
+    bucket.refill(bucket.updated + 3)
+    assert bucket.available == pytest.approx(30)
+    assert bucket.wait_time(40) == pytest.approx(1)
+    bucket.refill(bucket.updated + 3600)
+    assert bucket.available == 600
+    # Larger than the bucket only waits for a full one, and no capacity means no limit
+    assert bucket.wait_time(10000) == 0
+    assert TokenBucket(capacity=0).wait_time(10 ** 6) == 0
+
+
+def test_callers_wait_for_tokens_in_arrival_order():
+    # 1000 tokens per second, starting empty
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=60000)
+    limiter.tokens.available = 0
+    finished = []
+
+    async def call(idx: int):
+        await limiter.acquire(100)
+        finished.append((idx, time.monotonic()))
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(call(idx) for idx in range(3)))
+        return start
+
+    start = asyncio.run(run())
+    assert [idx for idx, _ in finished] == [0, 1, 2]
+    assert finished[-1][1] - start == pytest.approx(0.3, abs=0.1)
+    assert limiter.calls == 3 and limiter.queue_depth == 0 and limiter.max_wait >= 0.25
+
+
+def test_settled_usage_above_the_estimate_delays_later_calls():
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=60000)
+    limiter.tokens.available = 100
+
+    async def run():
+        assert await limiter.acquire(100) < 0.05
+        # The call actually used 300 tokens, the next one pays for the difference
+        limiter.settle(100, 300)
+        return await limiter.acquire(100)
+
+    assert asyncio.run(run()) == pytest.approx(0.3, abs=0.1)
+
+
+def test_limiter_is_shared_per_provider_and_model(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_FAKE_RPM", "7")
+    limiter = get_rate_limiter("fake", "fake-chat-model")
+    assert get_rate_limiter("fake", "fake-chat-model") is limiter
+    assert get_rate_limiter("fake", "other-model") is not limiter
+    assert limiter.requests.capacity == 7
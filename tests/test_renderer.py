@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from report_ai.common.utils.helpers import Singleton
+from report_ai.components import renderer as renderer_module
+from report_ai.components.renderer import PdfRenderer
+
+
+class StubProcess:
+    def __init__(self):
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.returncode = -15
+
+
+class StubPage:
+    def __init__(self):
+        self.closed, self.healthy = False, True
+
+    def isClosed(self) -> bool:
+        return self.closed
+
+    async def evaluate(self, function: str):
+        if not self.healthy:
+            raise ConnectionError("page crashed")
+        return True
+
+    async def close(self):
+        self.closed = True
+
+
+class StubBrowser:
+    """ Stands in for a launched Chromium, counting the pages it opened """
+
+    def __init__(self):
+        self.process, self.pages, self.closed = StubProcess(), [], False
+
+    async def newPage(self) -> StubPage:
+        self.pages.append(StubPage())
+        return self.pages[-1]
+
+    async def close(self):
+        self.closed = True
+        self.process.returncode = 0
+
+
+@pytest.fixture
+def browsers(monkeypatch):
+    """ Every browser the renderer launches, in launch order """
+    launched = []
+
+    async def launch(**options):
+        launched.append(StubBrowser())
+        return launched[-1]
+
+    monkeypatch.setattr(renderer_module, 'launch', launch)
+    monkeypatch.delitem(Singleton._instances, PdfRenderer, raising=False)
+    yield launched
+    Singleton._instances.pop(PdfRenderer, None)
+
+
+async def render(renderer: PdfRenderer, seconds: float = 0) -> StubPage:
+    async with renderer.page() as page:
+        await asyncio.sleep(seconds)
+        return page
+
+
+def test_pages_are_reused_by_later_renders(browsers):
+    async def run():
+        renderer = PdfRenderer(pool_size=2, max_renders=100)
+        return [await render(renderer) for _ in range(3)]
+
+    pages = asyncio.run(run())
+    assert len(browsers) == 1 and len(browsers[0].pages) == 1 and len(set(map(id, pages))) == 1
+
+
+def test_pool_bounds_concurrent_pages(browsers):
+    async def run():
+        renderer = PdfRenderer(pool_size=2, max_renders=100)
+        in_use, peak = 0, 0
+
+        async def tracked_render():
+            nonlocal in_use, peak
+            async with renderer.page():
+                in_use += 1
+                peak = max(peak, in_use)
+                await asyncio.sleep(0.01)
+                in_use -= 1
+
+        await asyncio.gather(*(tracked_render() for _ in range(6)))
+        return peak
+
+    assert asyncio.run(run()) == 2 and len(browsers[0].pages) == 2
+
+
+def test_unhealthy_pages_and_crashed_browsers_are_replaced(browsers):
+    async def run():
+        renderer = PdfRenderer(pool_size=1, max_renders=100, health_check_timeout=1)
+        first = await render(renderer)
+        # A page failing its health check is closed and replaced by a new one
+        first.healthy = False
+        second = await render(renderer)
+        assert second is not first and first.closed
+        # A browser whose process died is relaunched on the next borrow
+        browsers[0].process.returncode = 1
+        return await render(renderer)
+
+    third = asyncio.run(run())
+    assert len(browsers) == 2 and browsers[1].pages == [third]
+
+
+def test_browser_is_recycled_after_max_renders_once_drained(browsers):
+    async def run():
+        renderer = PdfRenderer(pool_size=3, max_renders=2)
+        # The second render to finish starts the drain, the slow third one still finishes on the old browser
+        first_batch = asyncio.gather(render(renderer, 0), render(renderer, 0.01), render(renderer, 0.05))
+        await asyncio.sleep(0.02)
+        assert renderer._draining and len(browsers) == 1
+        # Renders started while draining wait for the relaunched browser
+        later = await render(renderer)
+        await first_batch
+        return later
+
+    later = asyncio.run(run())
+    assert len(browsers) == 2 and browsers[0].closed and browsers[1].pages == [later]
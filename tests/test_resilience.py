@@ -0,0 +1,146 @@
+import time
+import asyncio
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain.output_parsers import PydanticOutputParser
+
+from report_ai.common.utils import configs
+from report_ai.common.utils.helpers import Singleton
+from report_ai.benchmarks.fake_llm import FakeChatModel, FakeProviderError
+from report_ai.skeleton import ReportSkeleton
+from report_ai.components.llms import LLMRegistry, fix_output, get_llm, invoke_llm
+from report_ai.components.resilience import (
+    CircuitBreaker, CircuitOpenError, LatencyTracker, get_circuit_breaker, get_latency_tracker, hedged
+)
+
+MESSAGES = [SystemMessage(content="You are an expert in summarizing research conversations."),
+            HumanMessage(content="Summarize the effect of metformin on hepatic glucose production.")]
+# Skeleton the fake model can fix, the output parser alone cannot parse it
+SINGLE_QUOTED_SKELETON = "{'skeleton': [{'heading': 'Introduction', 'sub_headings': ['Aim']}]}"
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    """ `primary` failing every call and `backup` answering them, failing over to each other """
+    monkeypatch.delitem(Singleton._instances, LLMRegistry, raising=False)
+    for provider, error_rate in [("primary", 1.0), ("backup", 0.0)]:
+        monkeypatch.setitem(configs.llms, provider, {"default_model": f"{provider}-model",
+                                                     "models": {f"{provider}-model": {}}})
+        monkeypatch.setitem(LLMRegistry.builders, provider, lambda model, provider=provider, error_rate=error_rate,
+                            **settings: FakeChatModel(model_name=model, provider=provider, latency=0,
+                                                      error_rate=error_rate, **settings))
+    monkeypatch.setattr(configs.resilience, 'failover', {"primary": "backup", "backup": "primary"})
+    monkeypatch.setattr(configs.resilience.circuit_breaker, 'failure_threshold', 3)
+    yield
+    Singleton._instances.pop(LLMRegistry, None)
+
+
+def test_breaker_opens_after_consecutive_failures_and_closes_after_a_trial():
+    breaker = CircuitBreaker("fake", failure_threshold=2, cooldown=0.05)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == 'closed' and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    time.sleep(0.06)
+    # A single trial call is let through once the cooldown elapsed
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.times_opened == 1
+
+
+def test_hedge_wins_over_a_stalled_call():
+    tracker = LatencyTracker(window=10)
+
+    async def call(seconds: float, result: str):
+        await asyncio.sleep(seconds)
+        return result
+
+    start = time.perf_counter()
+    assert asyncio.run(hedged(lambda: call(5, "primary"), lambda: call(0.01, "hedge"), 0.05, tracker)) == "hedge"
+    assert time.perf_counter() - start < 1
+    assert tracker.hedges == 1 and tracker.hedge_wins == 1
+    # Fast calls finish before the delay and are never duplicated
+    assert asyncio.run(hedged(lambda: call(0, "primary"), lambda: call(0, "hedge"), 0.05, tracker)) == "primary"
+    assert tracker.hedges == 1
+
+
+def test_hedged_call_fails_only_when_both_do():
+    async def fail(seconds: float, message: str):
+        await asyncio.sleep(seconds)
+        raise FakeProviderError(message)
+
+    # The first failure is raised once the other call failed too
+    with pytest.raises(FakeProviderError, match="primary"):
+        asyncio.run(hedged(lambda: fail(0.01, "primary"), lambda: fail(0.05, "hedge"), 0, LatencyTracker(window=10)))
+
+
+def test_open_circuit_fails_over_to_the_backup_provider(providers):
+    async def call():
+        return await invoke_llm(MESSAGES, llm=get_llm("primary"), use_cache=False)
+
+    for _ in range(3):
+        with pytest.raises(FakeProviderError):
+            asyncio.run(call())
+    assert get_circuit_breaker("primary").state == 'open'
+    # With the circuit open the calls never reach the primary provider
+    assert asyncio.run(call()).response_metadata["model_name"] == "backup-model"
+    assert get_llm("primary").errors == 3 and get_llm("backup").calls == 1
+
+
+def test_open_circuit_without_failover_raises(providers, monkeypatch):
+    monkeypatch.setattr(configs.resilience, 'failover', {})
+    for _ in range(3):
+        with pytest.raises(FakeProviderError):
+            asyncio.run(invoke_llm(MESSAGES, llm=get_llm("primary"), use_cache=False))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(invoke_llm(MESSAGES, llm=get_llm("primary"), use_cache=False))
+
+
+def test_stalled_call_is_hedged_to_the_configured_model(monkeypatch):
+    monkeypatch.delitem(Singleton._instances, LLMRegistry, raising=False)
+    monkeypatch.setitem(configs.llms, "fake", {"default_model": "fake-stalling",
+                                               "models": {"fake-stalling": {}, "fake-fast": {}}})
+    monkeypatch.setitem(LLMRegistry.builders, "fake", lambda model, **settings: FakeChatModel(
+        model_name=model, latency=0.01, stall_rate=1.0 if model == "fake-stalling" else 0.0, stall_latency=5
+    ))
+    monkeypatch.setattr(configs.resilience.hedging, 'enabled', True)
+    monkeypatch.setattr(configs.resilience.hedging, 'models', {"fake": "fake-fast"})
+    # A warm model whose calls usually take 10ms
+    tracker = get_latency_tracker("fake", "fake-stalling")
+    for _ in range(configs.resilience.hedging.min_samples):
+        tracker.record(0.01)
+
+    start = time.perf_counter()
+    response = asyncio.run(invoke_llm(MESSAGES, llm=get_llm("fake"), use_cache=False))
+    assert time.perf_counter() - start < 1
+    assert response.response_metadata["model_name"] == "fake-fast"
+    assert tracker.hedges == 1 and tracker.hedge_wins == 1
+    Singleton._instances.pop(LLMRegistry, None)
+
+
+def test_output_fixing_fails_over_like_every_other_call(providers):
+    for _ in range(3):
+        with pytest.raises(FakeProviderError):
+            asyncio.run(invoke_llm(MESSAGES, llm=get_llm("primary"), use_cache=False))
+    output_parser = PydanticOutputParser(pydantic_object=ReportSkeleton)
+    fixed = asyncio.run(fix_output(output_parser, SINGLE_QUOTED_SKELETON, get_llm("primary")))
+    assert fixed.skeleton[0].heading == "Introduction"
+    assert get_llm("primary").errors == 3 and get_llm("backup").calls == 1
+
+
+def test_hung_output_fixing_call_is_abandoned(monkeypatch):
+    monkeypatch.setattr(configs.resilience, 'timeout', 0.05)
+    output_parser = PydanticOutputParser(pydantic_object=ReportSkeleton)
+    llm = FakeChatModel(latency=0, stall_rate=1.0, stall_latency=5)
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        asyncio.run(fix_output(output_parser, SINGLE_QUOTED_SKELETON, llm))
+    assert time.perf_counter() - start < 1 and get_circuit_breaker("fake").failures == 1
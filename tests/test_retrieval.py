@@ -0,0 +1,49 @@
+import asyncio
+
+from report_ai.components.functions import serialize_conversation
+from report_ai.components.retrieval import ConversationIndex, split_into_chunks
+
+EXCHANGES = [
+    ("How does metformin lower glucose?", ["Metformin reduces hepatic glucose production.",
+                                           "It also improves insulin sensitivity in muscle."]),
+    ("What about GLP-1 agonists?", ["GLP-1 agonists slow gastric emptying and reduce appetite.",
+                                    "Semaglutide is a long acting GLP-1 agonist."]),
+    ("Which side effects matter?", ["Nausea is the most common side effect of GLP-1 agonists.",
+                                    "Lactic acidosis is a rare risk of metformin."]),
+]
+
+
+def serialized_conversation() -> str:
+    conversation = []
+    for question, answer in EXCHANGES:
+        conversation += [{"role": "user", "content": question}, {"role": "assistant", "content": '\n\n'.join(answer)}]
+    return asyncio.run(serialize_conversation(conversation))[0]
+
+
+def test_chunks_stay_within_their_exchange_and_keep_the_question():
+    chunks = split_into_chunks(serialized_conversation(), chunk_tokens=20)
+    assert len(chunks) == 6
+    assert all(chunk.startswith("User: ") and "\nAI: " in chunk for chunk in chunks)
+    assert chunks[2].startswith("User: What about GLP-1 agonists?") and "gastric emptying" in chunks[2]
+    # Large budgets keep every exchange in one chunk
+    assert len(split_into_chunks(serialized_conversation(), chunk_tokens=1000)) == len(EXCHANGES)
+
+
+def test_search_ranks_the_matching_chunks_first():
+    index = ConversationIndex.from_serialized_conversation(serialized_conversation(), chunk_tokens=20)
+    ranked = [idx for idx, _ in index.search("semaglutide GLP-1")]
+    assert ranked[0] == 3
+    assert set(ranked) == {2, 3, 4}
+    assert index.search("insulin pump calibration")[0][0] == 1
+    assert index.search("unrelated zebra") == []
+
+
+def test_select_respects_the_token_budget_and_conversation_order():
+    index = ConversationIndex.from_serialized_conversation(serialized_conversation(), chunk_tokens=20)
+    budget = index.chunk_tokens[3] + index.chunk_tokens[2]
+    selected = index.select("semaglutide GLP-1 agonists nausea", budget)
+    assert selected == sorted(selected)
+    assert 3 in selected and sum(index.chunk_tokens[idx] for idx in selected) <= budget
+    retrieved = index.retrieve("metformin", token_budget=1000)
+    assert "hepatic glucose" in retrieved and "Lactic acidosis" in retrieved and "Semaglutide" not in retrieved
+    assert index.retrieve("metformin", token_budget=0) == ''
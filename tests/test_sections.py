@@ -0,0 +1,47 @@
+import re
+import time
+import asyncio
+
+import pytest
+
+from report_ai.common.utils import configs
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation
+from report_ai.components.functions import serialize_conversation
+from report_ai.report import generate_report_sections
+
+SKELETON = [{"heading": heading, "sub_headings": ["Overview", "Details"]}
+            for heading in ["Introduction", "Incretin Signaling", "Hepatic Clearance", "Weight Loss", "Conclusion"]]
+
+
+def generate(llm: FakeChatModel, parallel_sections: bool, apply_section_dedup: bool = False) -> (str, float):
+    async def run():
+        serialized_conversation, _, conversation_index = await serialize_conversation(
+            synthetic_conversation(8, seed="sections")
+        )
+        start = time.perf_counter()
+        html = await generate_report_sections(serialized_conversation, SKELETON, llm, apply_section_dedup,
+                                              parallel_sections=parallel_sections, max_concurrency=len(SKELETON),
+                                              conversation_index=conversation_index)
+        return html, time.perf_counter() - start
+    return asyncio.run(run())
+
+
+def headings(html: str) -> list:
+    return re.findall(r'<h2[^>]*>(.*?)</h2>', html)
+
+
+def test_concurrent_sections_keep_the_skeleton_order():
+    sequential_html, sequential_time = generate(FakeChatModel(latency=0.2), parallel_sections=False)
+    concurrent_html, concurrent_time = generate(FakeChatModel(latency=0.2), parallel_sections=True)
+    assert headings(concurrent_html) == headings(sequential_html) == [section["heading"] for section in SKELETON]
+    # Five sections of 0.2s each take about 1s one after another and about 0.2s at once
+    assert sequential_time >= 1.0 and concurrent_time < 0.6
+
+
+@pytest.mark.parametrize("threshold, dedup_calls", [(1.01, 0), (0.0, len(SKELETON))])
+def test_posthoc_dedup_only_sends_overlapping_sections(monkeypatch, threshold, dedup_calls):
+    monkeypatch.setattr(configs.report, 'dedup_overlap_threshold', threshold)
+    llm = FakeChatModel(latency=0)
+    html, _ = generate(llm, parallel_sections=True, apply_section_dedup=True)
+    assert llm.calls == len(SKELETON) + dedup_calls
+    assert headings(html) == [section["heading"] for section in SKELETON]
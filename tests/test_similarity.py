@@ -0,0 +1,64 @@
+import random
+
+from report_ai.components.similarity import MinHasher, OverlapDetector, estimate_similarity, shingle_unit
+
+
+def random_set_pair(rng: random.Random) -> (set, set):
+    vocabulary = [f"word{idx}" for idx in range(400)]
+    shared = set(rng.sample(vocabulary, rng.randint(0, 40)))
+    first, second = (set(rng.sample(vocabulary, rng.randint(1, 30))) for _ in range(2))
+    return shared | first, shared | second
+
+
+def test_hash_functions_are_distinct():
+    hasher = MinHasher()
+    assert len(set(hasher.permutations)) == len(hasher.permutations)
+    # Every LSH band needs its own rows, identical bands would collapse the candidate search to a single band
+    signature = hasher.signature({"alpha beta gamma", "delta epsilon zeta"})
+    bands = [signature[band * 4:(band + 1) * 4] for band in range(16)]
+    assert len(set(bands)) == 16
+
+
+def test_estimate_tracks_exact_jaccard():
+    hasher, rng = MinHasher(), random.Random(7)
+    errors, high_similarity_misses = [], 0
+    for _ in range(500):
+        first, second = random_set_pair(rng)
+        exact = len(first & second) / len(first | second)
+        estimate = estimate_similarity(hasher.signature(first), hasher.signature(second))
+        errors.append(abs(estimate - exact))
+        high_similarity_misses += exact >= 0.7 and estimate < 0.5
+    assert sum(errors) / len(errors) < 0.06
+    assert sorted(errors)[int(len(errors) * 0.95)] < 0.15
+    assert high_similarity_misses == 0
+
+
+def test_identical_and_disjoint_units():
+    hasher = MinHasher()
+    shingles = shingle_unit("GLP-1 receptor agonists lower fasting glucose in obese adults")
+    other = shingle_unit("Hepatic fibrosis progressed slowly across the placebo cohort")
+    assert estimate_similarity(hasher.signature(shingles), hasher.signature(shingles)) == 1.0
+    assert estimate_similarity(hasher.signature(shingles), hasher.signature(other)) < 0.2
+
+
+def test_overlap_detector_flags_repeated_section_only():
+    detector = OverlapDetector(unit_threshold=0.5)
+    detector.add("<h2>Mechanism</h2><p>Incretin hormones increase insulin secretion after a meal. "
+                 "Receptor agonists slow gastric emptying and reduce appetite in most patients.</p>")
+    repeated = detector.compare("<h2>Effects</h2><p>Incretin hormones increase insulin secretion after a meal. "
+                                "Weight loss was sustained over the whole trial period in the cohort.</p>")
+    unrelated = detector.compare("<h2>Safety</h2><p>Nausea was the most frequent adverse event during titration. "
+                                 "Pancreatitis remained rare and resolved without intervention.</p>")
+    assert repeated["overlapping_units"] == 1 and repeated["score"] == 0.5
+    assert repeated["spans"] == ["Incretin hormones increase insulin secretion after a meal."]
+    assert unrelated["overlapping_units"] == 0 and unrelated["spans"] == []
+
+
+def test_retried_sections_count_once_towards_the_skip_rate():
+    detector = OverlapDetector()
+    detector.record(0, False)
+    # A retried section is checked again, its last decision is the one that counts
+    detector.record(1, True)
+    detector.record(1, False)
+    detector.record(2, True)
+    assert (detector.checked, detector.skipped) == (3, 2) and detector.skip_rate == 2 / 3
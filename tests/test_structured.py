@@ -0,0 +1,56 @@
+import json
+import asyncio
+
+import pytest
+from langchain.output_parsers import PydanticOutputParser
+
+from report_ai.common.utils import configs
+from report_ai.skeleton import ReportSkeleton, design_report_skeleton
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation
+from report_ai.components.functions import serialize_conversation
+from report_ai.components.structured import parse_locally, parse_path_stats, repair_json
+
+SKELETON = {"skeleton": [{"heading": "Introduction", "sub_headings": ["Aim", "Scope"]}]}
+
+
+@pytest.mark.parametrize("text", [
+    '```json\n{"skeleton": [{"heading": "Introduction", "sub_headings": ["Aim", "Scope"]}]}\n```',
+    'Here is the skeleton: {"skeleton": [{"heading": "Introduction", "sub_headings": ["Aim", "Scope"]}]} Hope it helps!',
+    "{'skeleton': [{'heading': 'Introduction', 'sub_headings': ['Aim', 'Scope'],},],}",
+    '{"skeleton": [{"heading": "Introduction", "sub_headings": ["Aim", "Scope"',
+])
+def test_common_defects_are_repaired(text):
+    assert json.loads(repair_json(text)) == SKELETON
+
+
+def test_repair_keeps_quotes_and_literals_inside_strings():
+    repaired = json.loads(repair_json("{'title': 'The \"None\" arm', 'done': True, 'note': None}"))
+    assert repaired == {"title": 'The "None" arm', "done": True, "note": None}
+
+
+@pytest.mark.parametrize("text", ["no JSON here", '{"skeleton": [}'])
+def test_unrepairable_outputs_are_left_to_the_llm(text):
+    assert repair_json(text) is None
+
+
+def test_local_repair_can_be_disabled(monkeypatch):
+    output_parser = PydanticOutputParser(pydantic_object=ReportSkeleton)
+    single_quoted = json.dumps(SKELETON).replace('"', "'")
+    assert parse_locally(output_parser, json.dumps(SKELETON))[1] == 'json'
+    assert parse_locally(output_parser, single_quoted)[1] == 'repaired'
+    monkeypatch.setattr(configs.structured_output, 'local_repair', False)
+    assert parse_locally(output_parser, single_quoted) is None
+
+
+@pytest.mark.parametrize("native, paths", [(True, {'native'}), (False, {'json', 'repaired'})])
+def test_skeleton_takes_a_single_call(monkeypatch, native, paths):
+    monkeypatch.setattr(configs.structured_output, 'native', native)
+    monkeypatch.setattr(configs.structured_output, 'providers', ["fake"])
+    # Every prompt-instructed answer has a JSON defect, only native structured output is immune to them
+    llm = FakeChatModel(latency=0, json_defect_rate=1.0)
+    serialized_conversation = asyncio.run(serialize_conversation(synthetic_conversation(6)))[0]
+    skeleton = asyncio.run(design_report_skeleton(serialized_conversation, llm))
+    assert skeleton[0]["heading"] == "Introduction" and skeleton[-1]["heading"] == "Conclusion"
+    # A code fence is handled by the parser itself, any other defect is repaired locally without a second call
+    assert llm.calls == 1
+    assert {path for path, count in parse_path_stats().items() if count} <= paths
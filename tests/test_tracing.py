@@ -0,0 +1,84 @@
+import json
+import asyncio
+
+import pytest
+
+from report_ai.common.utils import configs
+from report_ai.benchmarks.fake_llm import FakeChatModel, synthetic_conversation
+from report_ai.components.tracing import (
+    NOOP_SPAN, Trace, add_span_hook, current_span, record_attempt, remove_span_hook, span, start_trace
+)
+from report_ai.report import run_generation_async
+
+
+def traced_run() -> Trace:
+    with Trace("request") as trace, span("report", kind='run'):
+        with span("skeleton"):
+            with span("invoke_llm", kind='llm', model="fake-chat-model") as llm_span:
+                llm_span.set(cache="miss", prompt_tokens=30, completion_tokens=12)
+        with pytest.raises(ValueError), span("sections"):
+            raise ValueError("no sections")
+    return trace
+
+
+def test_spans_nest_under_the_span_they_started_in():
+    trace = traced_run()
+    spans = {span.name: span for span in trace.spans}
+    assert spans["report"].parent_id is None
+    assert spans["skeleton"].parent_id == spans["sections"].parent_id == spans["report"].span_id
+    assert spans["invoke_llm"].parent_id == spans["skeleton"].span_id
+    assert spans["sections"].error == "ValueError: no sections"
+    summary = trace.summary()
+    assert set(summary["stages"]) == {"skeleton", "sections"} and summary["errors"] == 1
+    assert (summary["llm_calls"], summary["llm_cache"], summary["prompt_tokens"]) == (1, {"miss": 1}, 30)
+
+
+def test_retried_operations_record_their_attempt():
+    class RetryState:
+        attempt_number = 2
+
+    with Trace("request") as trace:
+        record_attempt(RetryState())
+        with span("invoke_llm", kind='llm'):
+            pass
+        with span("invoke_llm", kind='llm'):
+            pass
+    assert [span.attributes.get("attempt") for span in trace.spans] == [2, None]
+    assert trace.summary()["retries"] == 1
+
+
+def test_nothing_is_recorded_without_a_trace_or_hook(monkeypatch):
+    assert span("skeleton") is NOOP_SPAN and current_span() is NOOP_SPAN
+    with span("skeleton") as noop:
+        noop.set(ignored=True)
+    monkeypatch.setattr(configs.tracing, 'enabled', False)
+    assert start_trace("request") is None
+
+    finished = []
+    add_span_hook(finished.append)
+    try:
+        with span("skeleton"):
+            pass
+    finally:
+        remove_span_hook(finished.append)
+    assert [span.name for span in finished] == ["skeleton"]
+
+
+def test_profile_lists_every_span_in_start_order(tmp_path):
+    path = traced_run().write_profile(str(tmp_path / "report.profile.json"))
+    with open(path, encoding='utf-8') as file:
+        profile = json.load(file)
+    assert set(profile) == {"request_id", "started_at", "summary", "spans"} and profile["request_id"] == "request"
+    assert [span["name"] for span in profile["spans"]] == ["report", "skeleton", "invoke_llm", "sections"]
+    assert set(profile["spans"][0]) == {"id", "parent_id", "name", "kind", "start", "end", "duration", "attributes",
+                                        "error"}
+    assert all(span["start"] <= span["end"] for span in profile["spans"])
+
+
+def test_runs_without_a_pdf_write_no_profile(monkeypatch, tmp_path):
+    monkeypatch.setattr(configs, 'reports_dir', str(tmp_path / "reports"))
+    monkeypatch.setattr(configs.tracing, 'write_profile', True)
+    outputs = asyncio.run(run_generation_async(synthetic_conversation(4, seed="tracing"), {"title": "Tracing"},
+                                               "Tester", None, FakeChatModel(latency=0), apply_section_dedup=False,
+                                               render_pdf=False))
+    assert outputs["profile_path"] is None and not (tmp_path / "reports").exists()